@@ -1,21 +1,57 @@
-# algoritma/dynamic_programing.py (Backtracking-like Scheduler)
+# algoritma/backtrack.py (Depth-first Backtracking Scheduler)
 
 import utils
 import time # Import time for execution tracking
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from algoritma.problem import as_problem
+from algoritma.occupancy import OccupancyGrid, span_mask, run_starts
+from algoritma.instrumentation import Instrumentation
 
 class BacktrackingScheduler:
-    def __init__(self, data):
-        self.matakuliah = data["matakuliah"]
-        self.dosen = data["dosen"]
-        self.slot_waktu = data["slot_waktu"]
-        self.ruangan = data["ruangan"]
+    """
+    Pencarian depth-first atas sesi dengan heuristik most-constrained-first (MRV),
+    forward checking pada domain ruangan, dosen, dan hari, serta undo murah lewat trail.
+
+    Setiap node memilih sesi yang domainnya paling kecil, lalu mencoba semua penempatan
+    (hari, jam mulai, ruangan) yang masih valid, dan terakhir cabang "tidak dijadwalkan".
+    Cabang dipangkas jika batas atas jumlah sesi yang masih bisa ditempatkan tidak melebihi
+    jadwal terbaik yang sudah ditemukan. Jika anggaran node atau waktu habis, jadwal parsial
+    terbaik yang ditemukan sejauh ini dikembalikan.
+    """
+
+    def __init__(self, data, node_limit=None, time_limit=10.0, workers=1, split_depth=1):
+        # `data` boleh berupa dataset mentah atau ProblemInstance yang sudah dikompilasi
+        self.problem = as_problem(data)
+        self.matakuliah = self.problem.matakuliah
+        self.dosen = self.problem.dosen
+        self.slot_waktu = self.problem.slot_waktu
+        self.ruangan = self.problem.ruangan
         self.jadwal = []
 
-        self.used_rooms = {} # Tracks occupied room slots: {hari: {ruangan_id: [(mulai_menit, selesai_menit)]}}
-        self.used_dosen = {} # Tracks occupied lecturer slots: {hari: {dosen_id: [(mulai_menit, selesai_menit)]}}
+        # Search budget: maximum number of assignments tried and wall-clock seconds (None = unlimited)
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+
+        # Parallel search: number of worker processes and how many top levels of the tree
+        # are split into work units (node_limit then applies per work unit). With split_depth=None
+        # the tree is split deep enough to give every worker several units (see _split_for_workers).
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        self.split_depth = split_depth
+
+        # Bitset occupancy per (hari, ruangan) and per (hari, dosen) over 15-minute ticks
+        self.used_rooms = OccupancyGrid(len(self.problem.days), len(self.problem.room_ids))
+        self.used_dosen = OccupancyGrid(len(self.problem.days), len(self.problem.lecturer_ids))
         self.failed_sessions = [] # Stores details of sessions that could not be scheduled
         self.total_attempted_sessions_count = 0 # To be calculated in solve()
 
+        self.nodes_expanded = 0
+        self.bound_prunes = 0 # Nodes cut off by the upper bound
+        self.search_complete = False
+        self.work_units = 0 # Work units of the parallel search (0 when searching serially)
+        self.instr = Instrumentation()
+
     def calculate_stats(self):
         # This method aggregates statistics from the scheduler's state
         conflicts = len(self.failed_sessions)
@@ -23,139 +59,484 @@ class BacktrackingScheduler:
             "total_slots_attempted": self.total_attempted_sessions_count,
             "scheduled_slots": len(self.jadwal),
             "conflicts": conflicts,
-            "failed_details": self.failed_sessions
+            "failed_details": self.failed_sessions,
+            "nodes_expanded": self.nodes_expanded,
+            "search_complete": self.search_complete # True if the search proved the schedule optimal
         }
 
-    def is_conflict(self, hari, jam_mulai_menit, jam_selesai_sesi_menit, ruangan_id, dosen_id):
-        # We need to return the specific reason for conflict
-        # Check for room conflicts
-        if hari in self.used_rooms and ruangan_id in self.used_rooms[hari]:
-            for mulai, selesai in self.used_rooms[hari][ruangan_id]:
-                if not (jam_selesai_sesi_menit <= mulai or jam_mulai_menit >= selesai):
-                    return "Konflik Ruangan"
+    def mark_used(self, hari, jam_mulai_menit, jam_selesai_sesi_menit, ruangan_id, dosen_id):
+        mask = self.problem.tick_mask(jam_mulai_menit, jam_selesai_sesi_menit)
+        self.used_rooms.mark(hari, ruangan_id, mask)
+        self.used_dosen.mark(hari, dosen_id, mask)
+
+    # ------------------------------------------------------------------
+    # Domain bookkeeping
+    # ------------------------------------------------------------------
+    def _setup_search(self, session_order):
+        """Menyiapkan domain awal setiap sesi dan indeks sesi per ruangan/dosen untuk forward checking."""
+        problem = self.problem
+        n_sessions = len(problem.sessions)
+        n_days = len(problem.days)
 
-        # Check for lecturer conflicts
-        if hari in self.used_dosen and dosen_id in self.used_dosen[hari]:
-            for mulai, selesai in self.used_dosen[hari][dosen_id]:
-                if not (jam_selesai_sesi_menit <= mulai or jam_mulai_menit >= selesai):
-                    return "Konflik Dosen"
+        # Tie-breaker for MRV: the old static ordering (SKS ascending, then students ascending)
+        self.priority = [0] * n_sessions
+        for rank, session_idx in enumerate(session_order):
+            self.priority[session_idx] = rank
 
-        return None # No conflict
+        self.s_ticks = [max(session.n_ticks, 1) for session in problem.sessions]
+        self.s_rooms = [[r for r in problem.rooms_by_closeness(session.peserta) if problem.room_caps[r] >= session.peserta]
+                        for session in problem.sessions]
+        # Position of each room inside s_rooms[s], used to address dom[s][hari][pos]
+        self.s_room_pos = [{r: pos for pos, r in enumerate(rooms)} for rooms in self.s_rooms]
 
-    def mark_used(self, hari, jam_mulai_menit, jam_selesai_sesi_menit, ruangan_id, dosen_id):
-        self.used_rooms.setdefault(hari, {}).setdefault(ruangan_id, []).append((jam_mulai_menit, jam_selesai_sesi_menit))
-        self.used_dosen.setdefault(hari, {}).setdefault(dosen_id, []).append((jam_mulai_menit, jam_selesai_sesi_menit))
+        self.sessions_by_room = [[] for _ in problem.room_ids]
+        self.sessions_by_lecturer = [[] for _ in problem.lecturer_ids]
+        for session in problem.sessions:
+            for r in self.s_rooms[session.idx]:
+                self.sessions_by_room[r].append(session.idx)
+            self.sessions_by_lecturer[session.lecturer].append(session.idx)
+
+        # dom[s][hari][pos] = number of valid start ticks for session s in room s_rooms[s][pos] on that day
+        self.dom = []
+        self.total = [0] * n_sessions
+        for s in range(n_sessions):
+            per_day = []
+            for hari in range(n_days):
+                counts = [self._valid_starts(s, hari, r).bit_count() for r in self.s_rooms[s]]
+                per_day.append(counts)
+                self.total[s] += sum(counts)
+            self.dom.append(per_day)
+
+        # Capacity classes: distinct room capacities, largest first. A session of class j can
+        # only use rooms of classes 0..j, which gives nested room-time constraints for the bound.
+        self.class_caps = sorted(set(problem.room_caps), reverse=True)
+        class_of_cap = {cap: j for j, cap in enumerate(self.class_caps)}
+        self.room_class = [class_of_cap[cap] for cap in problem.room_caps]
+        self.s_class = [max((self.room_class[r] for r in rooms), default=None) for rooms in self.s_rooms]
+        self.tick_sizes = sorted(set(self.s_ticks))
+        self.s_size = [self.tick_sizes.index(n_ticks) for n_ticks in self.s_ticks]
+
+        # Free ticks inside slot windows, per room class and per lecturer (fragmentation ignored)
+        window_ticks = sum(problem.start_tick_mask(hari, 1).bit_count() for hari in range(n_days))
+        self.class_free = [0] * len(self.class_caps)
+        for r in range(len(problem.room_ids)):
+            self.class_free[self.room_class[r]] += window_ticks
+        self.lecturer_free = [window_ticks] * len(problem.lecturer_ids)
+
+        # Alive (undecided, non-empty domain) session counts grouped for the bound
+        self.alive = 0
+        self.alive_by_class = [[0] * len(self.tick_sizes) for _ in self.class_caps]
+        self.alive_by_lecturer = [[0] * len(self.tick_sizes) for _ in problem.lecturer_ids]
+        self.decided = [False] * n_sessions
+        for s in range(n_sessions):
+            if self.total[s] > 0:
+                self._alive_change(s, 1)
+        self.trail = []
+        self.assignment = []
+
+    def _alive_change(self, s, delta):
+        """Menambah/mengurangi sesi `s` dari himpunan sesi hidup beserta hitungan per kelompoknya."""
+        self.alive += delta
+        self.alive_by_class[self.s_class[s]][self.s_size[s]] += delta
+        self.alive_by_lecturer[self.problem.sessions[s].lecturer][self.s_size[s]] += delta
+
+    def _upper_bound(self):
+        """
+        Batas atas jumlah sesi hidup yang masih bisa ditempatkan: minimum dari jumlah sesi hidup,
+        relaksasi waktu ruangan bertingkat per kelas kapasitas (Moore-Hodgson atas hitungan), dan
+        relaksasi waktu per dosen.
+        """
+        sizes = self.tick_sizes
+        pool = [0] * len(sizes)
+        capacity = 0
+        for j, counts in enumerate(self.alive_by_class):
+            capacity += self.class_free[j]
+            demand = 0
+            for i, count in enumerate(counts):
+                pool[i] += count
+                demand += pool[i] * sizes[i]
+            # Drop the longest sessions first until the prefix fits in the free room ticks
+            i = len(sizes) - 1
+            while demand > capacity and i >= 0:
+                if pool[i]:
+                    removed = min(pool[i], -((capacity - demand) // sizes[i]))
+                    pool[i] -= removed
+                    demand -= removed * sizes[i]
+                i -= 1
+        room_bound = sum(pool)
+
+        lecturer_bound = 0
+        for lecturer, counts in enumerate(self.alive_by_lecturer):
+            free = self.lecturer_free[lecturer]
+            for i, count in enumerate(counts):
+                if not count:
+                    continue
+                fit = min(count, free // sizes[i])
+                lecturer_bound += fit
+                free -= fit * sizes[i]
+                if fit < count:
+                    break
+
+        return min(self.alive, room_bound, lecturer_bound)
+
+    def _valid_starts(self, s, hari, ruang):
+        """Bitmask tick mulai yang masih valid untuk sesi `s` di (hari, ruangan) pada state saat ini."""
+        session = self.problem.sessions[s]
+        n_ticks = self.s_ticks[s]
+        busy = self.used_rooms.busy(hari, ruang) | self.used_dosen.busy(hari, session.lecturer)
+        free = span_mask(0, self.problem.n_ticks) & ~busy
+        return self.problem.start_tick_mask(hari, n_ticks) & run_starts(free, n_ticks)
+
+    def _set_dom(self, s, hari, pos, value):
+        """Mengubah satu entri domain sambil mencatat nilai lama di trail untuk undo."""
+        old = self.dom[s][hari][pos]
+        if old == value:
+            return
+        self.trail.append((s, hari, pos, old))
+        self.dom[s][hari][pos] = value
+        before = self.total[s]
+        self.total[s] = before + value - old
+        if before > 0 and self.total[s] == 0:
+            self._alive_change(s, -1)
+        elif before == 0 and self.total[s] > 0:
+            self._alive_change(s, 1)
+
+    def _undo_to(self, mark):
+        """Mengembalikan domain ke kondisi saat trail sepanjang `mark`."""
+        trail = self.trail
+        while len(trail) > mark:
+            s, hari, pos, old = trail.pop()
+            value = self.dom[s][hari][pos]
+            self.dom[s][hari][pos] = old
+            before = self.total[s]
+            self.total[s] = before + old - value
+            if before > 0 and self.total[s] == 0:
+                self._alive_change(s, -1)
+            elif before == 0 and self.total[s] > 0:
+                self._alive_change(s, 1)
+
+    def _assign(self, s, hari, tick, ruang):
+        """Menempatkan sesi `s` lalu melakukan forward checking pada sesi yang belum diputuskan."""
+        session = self.problem.sessions[s]
+        mask = span_mask(tick, tick + self.s_ticks[s])
+        self.used_rooms.mark(hari, ruang, mask)
+        self.used_dosen.mark(hari, session.lecturer, mask)
+        self.assignment.append((s, hari, tick, ruang))
+        self.class_free[self.room_class[ruang]] -= self.s_ticks[s]
+        self.lecturer_free[session.lecturer] -= self.s_ticks[s]
+
+        # Room domain: every undecided session that could use this room on this day
+        for other in self.sessions_by_room[ruang]:
+            if not self.decided[other]:
+                pos = self.s_room_pos[other][ruang]
+                if self.dom[other][hari][pos]:
+                    self._set_dom(other, hari, pos, self._valid_starts(other, hari, ruang).bit_count())
+
+        # Lecturer domain: every undecided session of the same lecturer, all rooms on this day
+        for other in self.sessions_by_lecturer[session.lecturer]:
+            if not self.decided[other]:
+                for pos, r in enumerate(self.s_rooms[other]):
+                    if self.dom[other][hari][pos]:
+                        self._set_dom(other, hari, pos, self._valid_starts(other, hari, r).bit_count())
+
+    def _unassign(self, mark):
+        s, hari, tick, ruang = self.assignment.pop()
+        session = self.problem.sessions[s]
+        mask = span_mask(tick, tick + self.s_ticks[s])
+        self.used_rooms.unmark(hari, ruang, mask)
+        self.used_dosen.unmark(hari, session.lecturer, mask)
+        self.class_free[self.room_class[ruang]] += self.s_ticks[s]
+        self.lecturer_free[session.lecturer] += self.s_ticks[s]
+        self._undo_to(mark)
+
+    def _values(self, s):
+        """
+        Menghasilkan penempatan (hari, tick, ruangan) yang valid untuk sesi `s`: hari lalu
+        jam mulai paling awal, dan pada jam yang sama ruangan dengan kapasitas paling dekat.
+        """
+        for hari in range(len(self.problem.days)):
+            day_dom = self.dom[s][hari]
+            valid = [(r, self._valid_starts(s, hari, r)) for pos, r in enumerate(self.s_rooms[s]) if day_dom[pos]]
+            union = 0
+            for _, starts in valid:
+                union |= starts
+            while union:
+                low = union & -union
+                tick = low.bit_length() - 1
+                union ^= low
+                for r, starts in valid:
+                    if starts & low:
+                        yield hari, tick, r
+
+    def _select(self):
+        """Sesi belum diputuskan dengan domain terkecil (MRV); None jika tidak ada yang tersisa."""
+        best_s, best_key = None, None
+        for s in range(len(self.total)):
+            if not self.decided[s] and self.total[s] > 0:
+                key = (self.total[s], self.priority[s])
+                if best_key is None or key < best_key:
+                    best_s, best_key = s, key
+        return best_s
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def _initial_incumbent(self, session_order):
+        """
+        Satu penurunan tanpa backtrack mengikuti urutan statis (penempatan pertama yang valid),
+        sebagai incumbent awal agar pemangkasan efektif sejak node pertama.
+        """
+        mark = len(self.trail)
+        placed = []
+        for s in session_order:
+            if self.total[s] > 0:
+                placement = next(self._values(s), None)
+                if placement is not None:
+                    placed.append(len(self.trail))
+                    self._assign(s, *placement)
+        self.best_assignment = list(self.assignment)
+        # Roll everything back to the root state
+        for trail_mark in reversed(placed):
+            self._unassign(trail_mark)
+        self._undo_to(mark)
+
+    def _search(self, deadline, shared_best=None):
+        """
+        DFS iteratif dari state saat ini; menyimpan jadwal terbaik di self.best_assignment.
+
+        `shared_best` (opsional) adalah multiprocessing.Value berisi jumlah sesi incumbent
+        global, sehingga worker paralel ikut memangkas subtree yang tidak bisa mengalahkannya.
+        Mengembalikan True jika subtree selesai ditelusuri, False jika anggaran habis. Dalam
+        kedua kasus state (okupansi, domain) dikembalikan seperti saat fungsi dipanggil.
+        """
+        best_count = len(self.best_assignment)
+
+        def open_node():
+            """Memilih sesi berikutnya; None jika daun atau cabang dapat dipangkas."""
+            nonlocal best_count
+            placed = len(self.assignment)
+            if placed > best_count:
+                self.best_assignment = list(self.assignment)
+                best_count = placed
+                if shared_best is not None:
+                    with shared_best.get_lock():
+                        if placed > shared_best.value:
+                            shared_best.value = placed
+            incumbent = best_count if shared_best is None else max(best_count, shared_best.value)
+            # Prune when even the optimistic bound cannot beat the incumbent
+            if placed + self._upper_bound() <= incumbent:
+                self.bound_prunes += 1
+                return None
+            s = self._select()
+            if s is None:
+                return None
+            self.decided[s] = True
+            self._alive_change(s, -1)
+            # Frame: [session, value iterator, trail mark, assigned?, skip branch done?]
+            return [s, self._values(s), len(self.trail), False, False]
+
+        stack = []
+        root = open_node()
+        if root is not None:
+            stack.append(root)
+
+        node_end = self.nodes_expanded + self.node_limit if self.node_limit is not None else None
+        complete = True
+        while stack:
+            if node_end is not None and self.nodes_expanded >= node_end:
+                complete = False
+                break
+            if deadline is not None and (self.nodes_expanded & 255) == 0 and time.time() >= deadline:
+                complete = False
+                break
+
+            frame = stack[-1]
+            s, values, mark, assigned, skipped = frame
+            if assigned:
+                self._unassign(mark)
+                frame[3] = False
+
+            placement = None
+            if not skipped:
+                placement = next(values, None)
+
+            if placement is not None:
+                hari, tick, ruang = placement
+                self._assign(s, hari, tick, ruang)
+                frame[3] = True
+                self.nodes_expanded += 1
+                child = open_node()
+                if child is not None:
+                    stack.append(child)
+            elif not skipped:
+                # Last branch: leave this session unscheduled
+                frame[4] = True
+                child = open_node()
+                if child is not None:
+                    stack.append(child)
+            else:
+                stack.pop()
+                self._release(s)
+
+        # Budget ran out mid-tree: unwind the open frames back to the starting state
+        while stack:
+            s, _, mark, assigned, _ = stack.pop()
+            if assigned:
+                self._unassign(mark)
+            self._release(s)
+
+        return complete
+
+    def _decide(self, s, placement):
+        """Menerapkan satu keputusan (penempatan atau None = tidak dijadwalkan) untuk sesi `s`."""
+        self.decided[s] = True
+        self._alive_change(s, -1)
+        if placement is not None:
+            self._assign(s, *placement)
+
+    def _release(self, s):
+        """Mengembalikan sesi `s` ke himpunan sesi yang belum diputuskan."""
+        self.decided[s] = False
+        if self.total[s] > 0:
+            self._alive_change(s, 1)
+
+    def _split_units(self, depth):
+        """
+        Memecah `depth` level teratas pohon pencarian menjadi unit kerja. Setiap unit adalah
+        prefix keputusan [(sesi, penempatan atau None), ...] yang dapat di-replay oleh worker.
+        """
+        units = []
+        prefix = []
+        best_count = len(self.best_assignment)
+
+        def expand(level):
+            if placed_bound() <= best_count:
+                return
+            s = self._select() if level < depth else None
+            if s is None:
+                units.append(list(prefix))
+                return
+            self.decided[s] = True
+            self._alive_change(s, -1)
+            for placement in list(self._values(s)):
+                mark = len(self.trail)
+                self._assign(s, *placement)
+                prefix.append((s, placement))
+                expand(level + 1)
+                prefix.pop()
+                self._unassign(mark)
+            prefix.append((s, None))
+            expand(level + 1)
+            prefix.pop()
+            self._release(s)
+
+        def placed_bound():
+            return len(self.assignment) + self._upper_bound()
+
+        expand(0)
+        return units
+
+    def _search_unit(self, prefix, deadline, shared_best):
+        """Me-replay `prefix`, menelusuri subtree-nya, lalu mengembalikan state ke root."""
+        marks = []
+        for s, placement in prefix:
+            marks.append(len(self.trail))
+            self._decide(s, placement)
+
+        nodes_before, prunes_before = self.nodes_expanded, self.bound_prunes
+        self.best_assignment = []
+        complete = self._search(deadline, shared_best)
+        result = (list(self.best_assignment), self.nodes_expanded - nodes_before, complete,
+                  self.bound_prunes - prunes_before)
+
+        for (s, placement), mark in zip(reversed(prefix), reversed(marks)):
+            if placement is not None:
+                self._unassign(mark)
+            self._release(s)
+        return result
+
+    def _split_for_workers(self, units_per_worker=4, max_depth=8):
+        """
+        Menambah kedalaman split sampai unit kerja paling sedikit `units_per_worker` kali jumlah worker
+        (sesi MRV teratas sering hanya punya 2-4 penempatan, jadi satu level jarang cukup), atau sampai
+        jumlah unit tidak bertambah lagi. Mengembalikan (unit kerja, kedalaman yang dipakai).
+        """
+        depth = 1
+        units = self._split_units(depth)
+        while len(units) < units_per_worker * self.workers and depth < max_depth:
+            deeper = self._split_units(depth + 1)
+            if len(deeper) <= len(units):
+                break
+            units, depth = deeper, depth + 1
+        return units, depth
+
+    def _parallel_search(self, session_order, deadline):
+        """Menjalankan unit kerja pada process pool dengan incumbent global yang dibagi bersama."""
+        if self.split_depth is None:
+            units, _ = self._split_for_workers()
+        else:
+            units = self._split_units(self.split_depth)
+        self.work_units = len(units)
+        shared_best = multiprocessing.Value('i', len(self.best_assignment))
+        complete = True
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.problem, session_order, self.node_limit, deadline, shared_best)) as executor:
+            for assignment, nodes, unit_complete, prunes in executor.map(_solve_unit, units):
+                self.nodes_expanded += nodes
+                self.bound_prunes += prunes
+                complete = complete and unit_complete
+                if len(assignment) > len(self.best_assignment):
+                    self.best_assignment = assignment
+        return complete
 
     def solve(self):
         start_time = time.time()
-        
+        problem = self.problem
+
         urutan_hari = {"Senin": 1, "Selasa": 2, "Rabu": 3, "Kamis": 4, "Jumat": 5, "Sabtu": 6, "Minggu": 7}
 
-        # Calculate total attempted sessions upfront
-        self.total_attempted_sessions_count = 0
-        for mk in self.matakuliah:
-            kapasitas_max = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-            jumlah_sesi_mk = (mk["jumlah_mahasiswa"] + kapasitas_max - 1) // kapasitas_max
-            self.total_attempted_sessions_count += jumlah_sesi_mk
-
-        # Pre-process all possible granular time slots
-        all_time_slots = []
-        for slot in self.slot_waktu:
-            hari_name = slot["hari"]
-            start_minutes_slot = utils.time_to_minutes(slot["jam_mulai"])
-            end_minutes_slot = utils.time_to_minutes(slot["jam_selesai"])
-            # Iterate every 15 minutes as a potential start time
-            for start_interval in range(start_minutes_slot, end_minutes_slot, 15):
-                all_time_slots.append({
-                    "hari": hari_name,
-                    "jam_mulai_menit": start_interval,
-                    "jam_selesai_slot_menit": end_minutes_slot # End boundary of the original slot
-                })
-        
-        # Sort these granular slots by day, then by start time
-        sorted_all_time_slots = sorted(
-            all_time_slots,
-            key=lambda x: (urutan_hari.get(x["hari"], 99), x["jam_mulai_menit"])
-        )
+        # Sessions (count, duration, students per session) are precomputed by the ProblemInstance
+        self.total_attempted_sessions_count = len(problem.sessions)
+
+        # Static ordering used as MRV tie-breaker: SKS ascending, then number of students ascending
+        sorted_courses = sorted(range(len(problem.matakuliah)), key=lambda c: (problem.matakuliah[c]["sks"], problem.matakuliah[c]["jumlah_mahasiswa"]))
+        session_order = [s for c in sorted_courses for s in problem.sessions_by_course[c]]
+
+        with self.instr.phase("setup"):
+            self._setup_search(session_order)
+        with self.instr.phase("initial_incumbent"):
+            self._initial_incumbent(session_order)
+        deadline = start_time + self.time_limit if self.time_limit is not None else None
+        with self.instr.phase("search"):
+            if self.workers > 1:
+                self.search_complete = self._parallel_search(session_order, deadline)
+            else:
+                self.search_complete = self._search(deadline)
+
+        # Rebuild the best schedule found (the search state itself may be mid-tree if the budget ran out)
+        with self.instr.phase("rebuild"):
+            self.used_rooms = OccupancyGrid(len(problem.days), len(problem.room_ids))
+            self.used_dosen = OccupancyGrid(len(problem.days), len(problem.lecturer_ids))
+            placed = set()
+            for s, hari, tick, ruang in self.best_assignment:
+                session = problem.sessions[s]
+                mulai = problem.tick_minute(tick)
+                self.mark_used(hari, mulai, mulai + session.durasi, ruang, session.lecturer)
+                self.jadwal.append(problem.schedule_entry(session, hari, mulai, ruang))
+                placed.add(s)
 
-        # Sort courses: SKS ascending, then number of students ascending (Greedy heuristic)
-        sorted_matakuliah = sorted(self.matakuliah, key=lambda x: (x["sks"], x["jumlah_mahasiswa"]))
-
-        for mk in sorted_matakuliah:
-            durasi_menit = utils.sks_to_minutes(mk["sks"])
-            total_peserta = mk["jumlah_mahasiswa"]
-            
-            kapasitas_max_ruangan = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-            jumlah_sesi_needed = (total_peserta + kapasitas_max_ruangan - 1) // kapasitas_max_ruangan if total_peserta > 0 else 0
-            
-            peserta_per_sesi = (total_peserta + jumlah_sesi_needed - 1) // jumlah_sesi_needed if jumlah_sesi_needed > 0 else total_peserta
-
-            for sesi_ke in range(1, jumlah_sesi_needed + 1):
-                assigned_this_session = False
-                current_session_failed_reason = "Tidak ada slot/ruangan yang cocok ditemukan." # Default reason
-
-                # Sort rooms by capacity (smallest first, might help fit more courses)
-                sorted_ruangan = sorted(self.ruangan, key=lambda r: r["kapasitas"])
-
-                for slot_info in sorted_all_time_slots:
-                    current_hari = slot_info["hari"]
-                    current_jam_mulai_menit = slot_info["jam_mulai_menit"]
-                    current_slot_end_menit = slot_info["jam_selesai_slot_menit"]
-
-                    jam_selesai_sesi_menit = current_jam_mulai_menit + durasi_menit
-
-                    # Check if the course duration fits within the remaining time of the current slot interval
-                    if jam_selesai_sesi_menit > current_slot_end_menit:
-                        current_session_failed_reason = "Durasi mata kuliah melebihi slot waktu yang tersedia."
-                        continue 
-
-                    for ruang in sorted_ruangan:
-                        # Check if room capacity is sufficient
-                        if ruang["kapasitas"] < peserta_per_sesi:
-                            current_session_failed_reason = f"Kapasitas ruangan '{ruang['nama']}' ({ruang['kapasitas']}) tidak cukup untuk {peserta_per_sesi} mahasiswa."
-                            continue # Try next room
-
-                        # Check for conflicts
-                        conflict_type = self.is_conflict(
-                            current_hari,
-                            current_jam_mulai_menit,
-                            jam_selesai_sesi_menit,
-                            ruang["id"],
-                            mk["dosen_id"]
-                        )
-                        
-                        if conflict_type is None: # No conflict
-                            # Schedule the session
-                            self.mark_used(current_hari, current_jam_mulai_menit, jam_selesai_sesi_menit, ruang["id"], mk["dosen_id"])
-                            self.jadwal.append({
-                                "matakuliah": mk["nama"],
-                                "dosen": utils.get_dosen_name(mk["dosen_id"], self.dosen),
-                                "ruangan": ruang["nama"],
-                                "hari": current_hari,
-                                "jam_mulai": utils.minutes_to_time(current_jam_mulai_menit),
-                                "jam_selesai": utils.minutes_to_time(jam_selesai_sesi_menit),
-                                "jumlah_mahasiswa": peserta_per_sesi,
-                                "sesi": sesi_ke
-                            })
-                            assigned_this_session = True
-                            break # Session assigned, move to the next session for this course
-                        else:
-                            # Conflict detected, update specific reason
-                            current_session_failed_reason = f"{conflict_type} pada {current_hari} {utils.minutes_to_time(current_jam_mulai_menit)}-{utils.minutes_to_time(jam_selesai_sesi_menit)} di {ruang['nama']} atau dengan dosen {utils.get_dosen_name(mk['dosen_id'], self.dosen)}."
-                    
-                    if assigned_this_session:
-                        break # Session assigned, move to the next session for this course
-
-                if not assigned_this_session:
-                    # If after checking all slots and rooms, the session still isn't assigned
-                    self.failed_sessions.append({
-                        "matakuliah": mk["nama"],
-                        "dosen": utils.get_dosen_name(mk["dosen_id"], self.dosen),
-                        "sesi": sesi_ke,
-                        "jumlah_mahasiswa": peserta_per_sesi,
-                        "reason": current_session_failed_reason # The most recent failure reason
-                    })
-        
+        with self.instr.phase("diagnostics"):
+            for s in session_order:
+                if s in placed:
+                    continue
+                # Only integer reason codes per probe; the report renders the text
+                session = problem.sessions[s]
+                reason_codes = problem.failure_reasons(session, self.used_rooms, self.used_dosen)
+                self.failed_sessions.append(problem.failed_entry(session, reason_codes=reason_codes))
+
+        self.instr.count("nodes_expanded", self.nodes_expanded)
+        self.instr.count("bound_prunes", self.bound_prunes)
+        self.instr.count("work_units", self.work_units)
         end_time = time.time()
 
         # Sort the final schedule for consistent reporting
@@ -163,13 +544,28 @@ class BacktrackingScheduler:
             self.jadwal,
             key=lambda x: (urutan_hari.get(x["hari"], 99), utils.time_to_minutes(x["jam_mulai"]), x["matakuliah"])
         )
-        
+
         # Calculate statistics and add execution time
         stats_data = self.calculate_stats()
         stats_data['execution_time'] = end_time - start_time
+        self.instr.merge_into(stats_data)
 
         # Return a dictionary containing both 'schedule' and 'stats'
         return {
             'schedule': sorted_final_schedule,
             'stats': stats_data
-        }
\ No newline at end of file
+        }
+
+
+# Per-process state for the parallel search workers
+_worker_state = {}
+
+def _init_worker(problem, session_order, node_limit, deadline, shared_best):
+    scheduler = BacktrackingScheduler(problem, node_limit=node_limit, time_limit=None)
+    scheduler._setup_search(session_order)
+    _worker_state["scheduler"] = scheduler
+    _worker_state["deadline"] = deadline
+    _worker_state["shared_best"] = shared_best
+
+def _solve_unit(prefix):
+    return _worker_state["scheduler"]._search_unit(prefix, _worker_state["deadline"], _worker_state["shared_best"])
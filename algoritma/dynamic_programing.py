@@ -1,40 +1,68 @@
 import utils
+import heapq
 import time
+import tracemalloc
+from algoritma.occupancy import OccupancyGrid
+from algoritma.problem import as_problem
+from algoritma.instrumentation import Instrumentation
 
 class DPScheduler:
-    def __init__(self, data):
-        self.matakuliah = data["matakuliah"]
-        self.dosen = data["dosen"]
-        self.slot_waktu = data["slot_waktu"]
-        self.ruangan = data["ruangan"]
+    """
+    Penjadwalan per layer (satu layer per sesi) atas state bitmask sumber daya yang terpakai.
+
+    Mode eksak (`beam_width=None`) menyimpan semua state yang tidak didominasi; jumlahnya tumbuh
+    eksponensial sehingga hanya praktis untuk dataset kecil (fixture uji). Dataset nyata seperti
+    data/dataset.json memerlukan mode beam, mis. `beam_width=50, max_states=200000` seperti di main.py.
+    """
+
+    def __init__(self, data, dominance_limit=2000, beam_width=None, max_states=None, memory_limit_mb=None):
+        # `data` boleh berupa dataset mentah atau ProblemInstance yang sudah dikompilasi
+        self.problem = as_problem(data)
+        self.matakuliah = self.problem.matakuliah
+        self.dosen = self.problem.dosen
+        self.slot_waktu = self.problem.slot_waktu
+        self.ruangan = self.problem.ruangan
         self.jadwal = []
         self.failed_sessions = [] # This will hold original failed session objects
         self.total_attempted_sessions_count = 0
+        # Pruning dominansi membandingkan state berpasangan (kuadratik), jadi hanya dijalankan
+        # pada layer yang ukurannya tidak melebihi batas ini
+        self.dominance_limit = dominance_limit
+
+        # Mode beam (opsional): simpan paling banyak `beam_width` state per layer. `max_states` adalah
+        # batas keras ukuran layer (state terlemah dibuang menurut peringkat beam); `memory_limit_mb`
+        # (diukur dengan tracemalloc) menghentikan ekspansi layer yang sedang dibangun setelah induk
+        # terbaiknya diekspansi, lalu mempersempit beam (menjadi 1 jika tidak dalam mode beam).
+        self.beam_width = beam_width
+        self.max_states = max_states
+        self.memory_limit_mb = memory_limit_mb
         self.urutan_hari = {"Senin": 1, "Selasa": 2, "Rabu": 3, "Kamis": 4, "Jumat": 5, "Sabtu": 6}
+        self.instr = Instrumentation()
 
         self.all_time_slots = self._get_all_discrete_time_slots()
         self.resource_to_idx = {}
         self.idx_to_resource = {}
         self._setup_resource_indices()
 
+        # Bit semua sumber daya ruangan, untuk heuristik slack beam
+        self.room_bits = 0
+        for (_, _, _, jenis), idx in self.resource_to_idx.items():
+            if jenis == "ruangan":
+                self.room_bits |= 1 << idx
+        self.room_ticks_total = self.room_bits.bit_count()
+        self._placements_cache = {}
+
     def _get_all_discrete_time_slots(self):
         """
-        Mengambil semua slot waktu diskrit (per 15 menit) dari data slot_waktu.
+        Mengambil semua slot waktu diskrit (per tick ProblemInstance, biasanya 15 menit).
         """
-        discrete_slots = set()
-        for slot in self.slot_waktu:
-            hari = slot["hari"]
-            start_minutes = utils.time_to_minutes(slot["jam_mulai"])
-            end_minutes = utils.time_to_minutes(slot["jam_selesai"])
-            # Iterasi per 15 menit untuk pelacakan sumber daya
-            for t in range(start_minutes, end_minutes, 15):
-                discrete_slots.add((hari, t))
-        return sorted(list(discrete_slots), key=lambda x: (self.urutan_hari.get(x[0], 99), x[1]))
+        problem = self.problem
+        return [(problem.days[d], t) for d in range(len(problem.days)) for t in problem.day_tick_minutes[d]]
 
     def _setup_resource_indices(self):
         """
-        Memetakan setiap kombinasi unik (hari, interval 15 menit, id_sumber_daya, jenis_sumber_daya)
-        ke indeks integer unik. Ini penting untuk representasi state DP.
+        Memetakan setiap kombinasi unik (hari, tick, id_sumber_daya, jenis_sumber_daya)
+        ke indeks integer unik. Indeks ini adalah posisi bit pada state DP (bitmask integer).
         """
         current_idx = 0
         for hari, jam_menit in self.all_time_slots:
@@ -43,51 +71,117 @@ class DPScheduler:
                 self.resource_to_idx[key] = current_idx
                 self.idx_to_resource[current_idx] = key
                 current_idx += 1
-            for dosen in self.dosen:
-                key = (hari, jam_menit, dosen["id"], "dosen")
+            # Termasuk dosen yang hanya dirujuk oleh mata kuliah (tidak ada di daftar dosen)
+            for dosen_id in self.problem.lecturer_ids:
+                key = (hari, jam_menit, dosen_id, "dosen")
                 self.resource_to_idx[key] = current_idx
                 self.idx_to_resource[current_idx] = key
                 current_idx += 1
 
+    def _placements(self, sesi):
+        """
+        Semua penempatan valid secara statis untuk `sesi` sebagai (bitmask sumber daya, hari, mulai, ruang).
+        Bitmask berisi bit ruangan dan dosen untuk setiap tick selama durasi sesi,
+        sehingga cek konflik terhadap state cukup satu operasi AND.
+        """
+        key = (sesi["durasi"], sesi["jumlah_mahasiswa"], sesi["dosen_id"])
+        if key in self._placements_cache:
+            return self._placements_cache[key]
+
+        durasi = sesi["durasi"]
+        placements = []
+        for slot in self.get_all_slots():
+            mulai = slot["start"]
+            selesai = mulai + durasi
+
+            # Periksa apakah durasi sesi sesuai dalam slot waktu yang dipilih
+            if selesai > slot["end"]:
+                continue
+
+            for ruang in self.ruangan:
+                # Periksa apakah kapasitas ruangan cukup untuk mahasiswa sesi
+                if ruang["kapasitas"] < sesi["jumlah_mahasiswa"]:
+                    continue
+
+                mask = 0
+                for t in range(mulai, selesai, self.problem.tick_menit):
+                    r_idx = self.resource_to_idx.get((slot["hari"], t, ruang["id"], "ruangan"))
+                    d_idx = self.resource_to_idx.get((slot["hari"], t, sesi["dosen_id"], "dosen"))
+                    # Sumber daya tidak dikenal berarti penempatan tidak valid
+                    if r_idx is None or d_idx is None:
+                        mask = None
+                        break
+                    mask |= (1 << r_idx) | (1 << d_idx)
+
+                if mask is not None:
+                    placements.append((mask, slot["hari"], mulai, ruang))
+        self._placements_cache[key] = placements
+        return placements
+
+    def _slack(self, state):
+        """Heuristik slack untuk peringkat beam: jumlah tick ruangan yang masih kosong pada `state`."""
+        return self.room_ticks_total - (state & self.room_bits).bit_count()
+
+    def _best_states(self, layer, k):
+        """K state terbaik dari `layer` (sesi terbanyak, lalu sisa tick ruangan terbanyak), terurut."""
+        return dict(heapq.nlargest(k, layer.items(), key=lambda item: (item[1][0], self._slack(item[0]))))
+
+    def _over_memory(self):
+        """True jika memori yang dilacak tracemalloc melewati `memory_limit_mb`."""
+        if self.memory_limit_mb is not None:
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.memory_limit_mb * 1024 * 1024:
+                self.memory_limit_hit = True
+                return True
+        return False
+
+    @staticmethod
+    def _prune_dominated(layer):
+        """
+        Membuang state yang didominasi: state B mendominasi A jika B menjadwalkan sesi paling tidak
+        sebanyak A dan sumber daya yang ditempati B adalah subset dari A (B tidak pernah lebih buruk
+        untuk sesi-sesi berikutnya). Mengembalikan (layer baru, jumlah state yang dibuang).
+        """
+        # Calon pendominasi (jumlah sesi lebih banyak, bit lebih sedikit) selalu diproses lebih dulu
+        ordered = sorted(layer.items(), key=lambda item: (-item[1][0], item[0].bit_count()))
+        kept = {}
+        # State yang dipertahankan dikelompokkan per (jumlah sesi, jumlah bit). Kelompok dengan jumlah
+        # sesi sama dan bit tidak lebih sedikit hanya bisa berisi subset yang identik, jadi dilewati.
+        kept_groups = {}
+        for state, entry in ordered:
+            count, bits = entry[0], state.bit_count()
+            dominated = False
+            for (other_count, other_bits), group in kept_groups.items():
+                if other_count == count and other_bits >= bits:
+                    continue
+                if any(not (other & ~state) for other in group):
+                    dominated = True
+                    break
+            if dominated:
+                continue
+            kept[state] = entry
+            kept_groups.setdefault((count, bits), []).append(state)
+        return kept, len(layer) - len(kept)
+
     def generate_sessions(self):
         """
-        Menghasilkan daftar semua sesi individual yang diperlukan berdasarkan data matakuliah.
-        Setiap matakuliah mungkin dibagi menjadi beberapa sesi berdasarkan jumlah mahasiswa dan kapasitas ruangan.
+        Menghasilkan daftar semua sesi individual yang diperlukan berdasarkan sesi
+        yang sudah dihitung oleh ProblemInstance (jumlah sesi, durasi, peserta per sesi).
         """
+        problem = self.problem
         sessions = []
-        session_counter = 0 # Unique counter for all sessions
-        for mk in self.matakuliah:
-            durasi = utils.sks_to_minutes(mk["sks"])
-            total_mahasiswa_mk = mk["jumlah_mahasiswa"]
-            
-            # Menentukan kapasitas ruangan maksimum yang masuk akal untuk menghitung sesi yang dibutuhkan
-            # Default to 1 if no rooms to avoid division by zero, but ensure it's at least 1 for calculation
-            max_room_capacity = max([r["kapasitas"] for r in self.ruangan]) if self.ruangan else 1 
-            
-            # Menghitung jumlah sesi yang dibutuhkan berdasarkan total mahasiswa dan kapasitas ruangan maksimum
-            # Jika 0 mahasiswa, maka 0 sesi dibutuhkan.
-            if total_mahasiswa_mk > 0:
-                jumlah_sesi = (total_mahasiswa_mk + max_room_capacity - 1) // max_room_capacity
-            else:
-                jumlah_sesi = 0 # No students, no sessions needed
-            
-            # Menghitung mahasiswa per sesi
-            if jumlah_sesi > 0:
-                peserta_per_sesi = (total_mahasiswa_mk + jumlah_sesi - 1) // jumlah_sesi
-            else:
-                peserta_per_sesi = 0 # If no sessions, then 0 students per session
-
-            for i in range(jumlah_sesi):
-                session_counter += 1
-                sessions.append({
-                    "session_id": f"{mk['id']}-{i+1}", # Unique ID for each session
-                    "matakuliah": mk["nama"],
-                    "dosen_id": mk["dosen_id"],
-                    "jumlah_mahasiswa": peserta_per_sesi,
-                    "durasi": durasi,
-                    "sesi": i + 1, # Nomor sesi untuk matakuliah spesifik ini
-                    "original_matakuliah_id": mk["id"] # Melacak id matakuliah asli
-                })
+        for session in problem.sessions:
+            mk = problem.matakuliah[session.course]
+            sessions.append({
+                "idx": session.idx, # Indeks sesi pada ProblemInstance
+                "session_id": f"{mk['id']}-{session.sesi}", # Unique ID for each session
+                "matakuliah": mk["nama"],
+                "dosen_id": mk["dosen_id"],
+                "jumlah_mahasiswa": session.peserta,
+                "durasi": session.durasi,
+                "sesi": session.sesi, # Nomor sesi untuk matakuliah spesifik ini
+                "original_matakuliah_id": mk["id"] # Melacak id matakuliah asli
+            })
         return sessions
 
     def get_all_slots(self):
@@ -95,15 +189,9 @@ class DPScheduler:
         Menghasilkan daftar semua kemungkinan slot waktu mulai untuk sesi,
         mempertimbangkan slot_waktu yang ditentukan dan interval 15 menit.
         """
-        slots = []
-        for slot in self.slot_waktu:
-            start = utils.time_to_minutes(slot["jam_mulai"])
-            end = utils.time_to_minutes(slot["jam_selesai"])
-            # Menghasilkan semua kemungkinan interval mulai 15 menit dalam slot_waktu
-            for s in range(start, end, 15):
-                slots.append({"hari": slot["hari"], "start": s, "end": end})
-        # Urutkan untuk pemrosesan yang konsisten, penting untuk DP jika urutan berpengaruh pada transisi state
-        return sorted(slots, key=lambda x: (self.urutan_hari.get(x["hari"], 99), x["start"]))
+        problem = self.problem
+        # Sudah terurut berdasarkan hari lalu jam mulai, penting untuk DP jika urutan berpengaruh pada transisi state
+        return [{"hari": problem.days[d], "start": s, "end": end} for d, s, end in problem.starts]
 
     def solve(self):
         """
@@ -112,95 +200,128 @@ class DPScheduler:
         ketersediaan sumber daya (ruangan dan dosen).
         """
         start_time = time.time()
-        sessions = self.generate_sessions()
+        instr = self.instr
+        with instr.phase("generate_sessions"):
+            sessions = self.generate_sessions()
         self.total_attempted_sessions_count = len(sessions)
-        possible_start_slots = self.get_all_slots()
 
-        # dp_table[i] akan menyimpan dictionary di mana kunci adalah frozenset dari indeks sumber daya yang ditempati
-        # dan nilai adalah jadwal (daftar detail sesi) yang mengarah ke state tersebut.
-        # dp_table[i][state] = schedule_list
-        # Tujuannya adalah menemukan jadwal terpanjang untuk state tertentu.
-        dp_table = [{} for _ in range(len(sessions) + 1)]
-        dp_table[0][frozenset()] = [] # Kasus dasar: 0 sesi terjadwal, state kosong, jadwal kosong
+        # Setiap layer DP adalah dictionary: kunci = bitmask integer sumber daya yang ditempati,
+        # nilai = (jumlah sesi terjadwal, id node jadwal). Jadwal disimpan sebagai parent pointer:
+        # node_parent[n] = node sebelumnya, node_detail[n] = penempatan sesi pada node n.
+        # Node hanya dibuat untuk state yang lolos pruning.
+        node_parent = [-1]
+        node_detail = [None]
+        layer = {0: (0, 0)} # Kasus dasar: 0 sesi terjadwal, state kosong, node akar
+        self.max_layer_size = 1
+        self.dominated_pruned = 0
+        self.beam_pruned = 0
+        self.layer_sizes = []
+        self.capped_layers = 0
+        self.memory_limit_hit = False
+
+        # Batas memori diukur dengan tracemalloc (dinyalakan di sini jika belum aktif)
+        started_tracing = False
+        if self.memory_limit_mb is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        beam_width = self.beam_width
+        max_states = self.max_states
+        transitions = 0 # Pasangan (state, penempatan) yang diperiksa
+        states_generated = 0 # Ukuran layer sebelum pruning, dijumlahkan
 
         # Iterasi melalui setiap sesi yang akan dijadwalkan
-        for i in range(len(sessions)):
-            sesi = sessions[i] # Sesi saat ini yang sedang dicoba dijadwalkan
-            durasi = sesi["durasi"]
-            next_dp = {} # Menyimpan state untuk (i+1) sesi
-
-            # Iterasi melalui semua state yang ada dari langkah sebelumnya (i sesi terjadwal)
-            for state, schedule_so_far in dp_table[i].items():
-                # Coba tempatkan 'sesi' saat ini ke slot yang tersedia
-                for slot in possible_start_slots:
-                    mulai = slot["start"]
-                    selesai = mulai + durasi
-                    
-                    # Periksa apakah durasi sesi sesuai dalam slot waktu yang dipilih
-                    if selesai > slot["end"]:
-                        continue
-
-                    for ruang in self.ruangan:
-                        # Periksa apakah kapasitas ruangan cukup untuk mahasiswa sesi
-                        if ruang["kapasitas"] < sesi["jumlah_mahasiswa"]:
+        with instr.phase("layers"):
+            for i, sesi in enumerate(sessions):
+                placements = self._placements(sesi)
+                next_layer = {} # state -> (jumlah sesi, node induk, penempatan atau None untuk "lewati")
+                capped = False
+
+                # Dengan batas memori, layer terurut dari state terbaik (lihat di bawah), jadi jika batas
+                # memori tercapai di tengah ekspansi, yang tidak sempat diekspansi adalah state terlemah.
+                # Induk pertama selalu diekspansi (termasuk transisi "lewati") agar layer tidak pernah kosong.
+                for state, (count, node) in layer.items():
+                    if next_layer and self._over_memory():
+                        capped = True
+                        # Memori penuh: persempit beam untuk layer-layer berikutnya
+                        beam_width = 1 if beam_width is None else max(1, beam_width // 2)
+                        break
+
+                    # Transisi "lewati": sesi ini tidak dijadwalkan, state tetap
+                    best = next_layer.get(state)
+                    if best is None or count > best[0]:
+                        next_layer[state] = (count, node, None)
+
+                    transitions += len(placements)
+                    # Coba tempatkan sesi saat ini pada setiap penempatan yang tidak bentrok dengan state
+                    for mask, hari, mulai, ruang in placements:
+                        if state & mask:
                             continue
-                        
-                        # Kumpulkan semua indeks sumber daya yang akan ditempati oleh penempatan potensial ini
-                        indices_to_occupy = set()
-                        conflict_found = False
-                        
-                        # Periksa setiap interval 15 menit dalam durasi sesi
-                        for t in range(mulai, selesai, 15):
-                            # Kunci untuk sumber daya ruangan dan dosen pada interval waktu spesifik ini
-                            r_key = (slot["hari"], t, ruang["id"], "ruangan")
-                            d_key = (slot["hari"], t, sesi["dosen_id"], "dosen")
-                            
-                            # Dapatkan indeks yang sesuai
-                            r_idx = self.resource_to_idx.get(r_key)
-                            d_idx = self.resource_to_idx.get(d_key)
-                            
-                            # Jika indeks sumber daya tidak ditemukan (seharusnya tidak terjadi jika setup benar)
-                            # atau jika sumber daya sudah ditempati dalam 'state' saat ini
-                            if r_idx is None or d_idx is None or r_idx in state or d_idx in state:
-                                conflict_found = True
-                                break # Konflik ditemukan, penempatan ini tidak valid
-                            
-                            indices_to_occupy.add(r_idx)
-                            indices_to_occupy.add(d_idx)
-                        
-                        if conflict_found:
-                            continue # Coba ruangan atau slot berikutnya
-                        
-                        # Jika tidak ada konflik, buat state baru dengan menambahkan indeks yang ditempati
-                        new_state = frozenset(state.union(indices_to_occupy))
-                        
-                        # Siapkan entri jadwal terperinci untuk sesi ini
-                        detail = {
-                            "session_id": sesi["session_id"], # Include the unique session ID
-                            "matakuliah": sesi["matakuliah"],
-                            "dosen": utils.get_dosen_name(sesi["dosen_id"], self.dosen),
-                            "dosen_id": sesi["dosen_id"],
-                            "ruangan": ruang["nama"],
-                            "ruangan_id": ruang["id"],
-                            "hari": slot["hari"],
-                            "jam_mulai": utils.minutes_to_time(mulai),
-                            "jam_selesai": utils.minutes_to_time(selesai),
-                            "jumlah_mahasiswa": sesi["jumlah_mahasiswa"],
-                            "sesi": sesi["sesi"],
-                            "original_matakuliah_id": sesi["original_matakuliah_id"]
-                        }
-                        
-                        # Perbarui next_dp: pertahankan jadwal yang menghasilkan urutan terpanjang
-                        # untuk new_state tertentu. Ini memastikan kita memaksimalkan sesi yang dijadwalkan.
-                        if new_state not in next_dp or len(schedule_so_far) + 1 > len(next_dp[new_state]):
-                            next_dp[new_state] = schedule_so_far + [detail]
-            
-            dp_table[i + 1] = next_dp # Pindah ke langkah berikutnya dalam DP
-
-        # Temukan state di entri tabel DP terakhir yang memiliki jadwal terpanjang
-        # Ini mewakili jumlah maksimum sesi yang dapat dijadwalkan.
-        final_state_entry = max(dp_table[-1].items(), key=lambda x: len(x[1]), default=(None, []))
-        self.jadwal = final_state_entry[1] # Sesi yang berhasil dijadwalkan
+                        new_state = state | mask
+
+                        # Pertahankan jadwal dengan sesi terbanyak untuk new_state tertentu
+                        best = next_layer.get(new_state)
+                        if best is None or count + 1 > best[0]:
+                            next_layer[new_state] = (count + 1, node, (i, hari, mulai, ruang))
+
+                    # Batas state: semua induk tetap diekspansi, tetapi layer yang sedang dibangun
+                    # dipangkas menurut peringkat begitu mencapai dua kali batas, agar memori terbatas
+                    if max_states is not None and len(next_layer) >= 2 * max_states:
+                        states_generated += len(next_layer) - max_states
+                        next_layer = self._best_states(next_layer, max_states)
+                        capped = True
+
+                states_generated += len(next_layer)
+                if len(next_layer) <= self.dominance_limit:
+                    with instr.phase("dominance"):
+                        next_layer, pruned = self._prune_dominated(next_layer)
+                    self.dominated_pruned += pruned
+
+                # Mode beam: simpan hanya K state terbaik (sesi terbanyak, lalu sisa tick ruangan terbanyak)
+                if beam_width is not None and len(next_layer) > beam_width:
+                    self.beam_pruned += len(next_layer) - beam_width
+                    next_layer = self._best_states(next_layer, beam_width)
+
+                # Batas keras: layer yang disimpan tidak pernah melebihi max_states
+                if max_states is not None and len(next_layer) > max_states:
+                    next_layer = self._best_states(next_layer, max_states)
+                    capped = True
+                if capped:
+                    self.capped_layers += 1
+                if self.memory_limit_mb is not None:
+                    # Urutkan dari state terbaik agar pemotongan karena memori selalu membuang state terlemah
+                    next_layer = self._best_states(next_layer, len(next_layer))
+
+                # Materialisasi node untuk state yang bertahan
+                layer = {}
+                for state, (count, node, detail) in next_layer.items():
+                    if detail is not None:
+                        node_parent.append(node)
+                        node_detail.append(detail)
+                        node = len(node_parent) - 1
+                    layer[state] = (count, node)
+                next_layer = None
+
+                self.layer_sizes.append(len(layer))
+                self.max_layer_size = max(self.max_layer_size, len(layer))
+
+        if started_tracing:
+            tracemalloc.stop()
+
+        instr.count("transitions", transitions)
+        instr.count("states_generated", states_generated)
+        instr.count("states_kept", sum(self.layer_sizes))
+        instr.count("dominated_pruned", self.dominated_pruned)
+        instr.count("beam_pruned", self.beam_pruned)
+
+        # Temukan state di layer terakhir dengan jumlah sesi terbanyak lalu telusuri parent pointer-nya
+        with instr.phase("reconstruct"):
+            _, best_node = max(layer.values(), key=lambda entry: entry[0], default=(0, 0))
+            self.jadwal = []
+            node = best_node
+            while node > 0:
+                self.jadwal.append(self._schedule_detail(sessions, *node_detail[node]))
+                node = node_parent[node]
+            self.jadwal.reverse()
 
         # Identifikasi sesi yang tidak dijadwalkan menggunakan session_id
         scheduled_session_ids = {item["session_id"] for item in self.jadwal}
@@ -211,11 +332,38 @@ class DPScheduler:
             self.urutan_hari.get(x["hari"], 99), utils.time_to_minutes(x["jam_mulai"]), x["matakuliah"]))
 
         # Hitung dan kembalikan statistik
-        stats = self.calculate_stats()
+        with instr.phase("diagnostics"):
+            stats = self.calculate_stats()
         stats["execution_time"] = time.time() - start_time
+        stats["max_layer_size"] = self.max_layer_size
+        stats["dominated_pruned"] = self.dominated_pruned
+        stats["beam_width"] = self.beam_width
+        stats["beam_pruned"] = self.beam_pruned
+        stats["layer_sizes"] = self.layer_sizes
+        stats["capped_layers"] = self.capped_layers
+        stats["memory_limit_hit"] = self.memory_limit_hit
+        instr.merge_into(stats)
 
         return {"schedule": sorted_schedule, "stats": stats}
 
+    def _schedule_detail(self, sessions, i, hari, mulai, ruang):
+        """Membentuk entri jadwal terperinci untuk sesi ke-i yang ditempatkan pada (hari, mulai, ruang)."""
+        sesi = sessions[i]
+        return {
+            "session_id": sesi["session_id"], # Include the unique session ID
+            "matakuliah": sesi["matakuliah"],
+            "dosen": self.problem.lecturer_names[self.problem.lecturer_idx[sesi["dosen_id"]]],
+            "dosen_id": sesi["dosen_id"],
+            "ruangan": ruang["nama"],
+            "ruangan_id": ruang["id"],
+            "hari": hari,
+            "jam_mulai": utils.minutes_to_time(mulai),
+            "jam_selesai": utils.minutes_to_time(mulai + sesi["durasi"]),
+            "jumlah_mahasiswa": sesi["jumlah_mahasiswa"],
+            "sesi": sesi["sesi"],
+            "original_matakuliah_id": sesi["original_matakuliah_id"]
+        }
+
     def calculate_stats(self):
         """
         Menghitung statistik untuk proses penjadwalan, termasuk
@@ -227,75 +375,26 @@ class DPScheduler:
         internal_conflicts = utils.check_conflicts(self.jadwal)
         if internal_conflicts:
             # Ini menunjukkan kesalahan logika dalam DP jika konflik ditemukan di sini
-            print("PERINGATAN: Konflik internal ditemukan dalam jadwal DP:", internal_conflicts)
+            print("PERINGATAN: Konflik internal ditemukan dalam jadwal DP:", utils.format_conflicts(internal_conflicts))
             # Untuk saat ini, kita mengasumsikan DP menghasilkan jadwal bebas konflik secara internal,
             # jadi konflik ini tidak ditambahkan ke 'failed_details' yang ditujukan untuk item yang tidak terjadwal.
 
-        # Untuk sesi yang tidak dijadwalkan, coba tentukan alasannya
+        # Indeks okupansi jadwal akhir: setiap kandidat penempatan cukup dicek dengan satu lookup bitmask
+        problem = self.problem
+        used_rooms = OccupancyGrid(len(problem.days), len(problem.room_ids))
+        used_dosen = OccupancyGrid(len(problem.days), len(problem.lecturer_ids))
+        for item in self.jadwal:
+            mask = problem.tick_mask(utils.time_to_minutes(item["jam_mulai"]), utils.time_to_minutes(item["jam_selesai"]))
+            hari = problem.day_idx[item["hari"]]
+            used_rooms.mark(hari, problem.room_idx[item["ruangan_id"]], mask)
+            used_dosen.mark(hari, problem.lecturer_idx[item["dosen_id"]], mask)
+
+        # Untuk sesi yang tidak dijadwalkan, catat kode alasan per kandidat penempatan (teks dibentuk oleh laporan)
         for failed_sesi in self.failed_sessions:
-            # Default reason
-            reason = "Tidak dapat dijadwalkan: Tidak ada slot waktu atau ruangan yang tersedia yang memenuhi semua kriteria."
-            
-            potential_reasons = set()
-            found_theoretically_possible_slot = False
-
-            # Iterasi melalui semua kemungkinan slot waktu dan ruangan untuk menemukan alasan kegagalan
-            for slot_waktu_option in self.slot_waktu:
-                mulai_opt = utils.time_to_minutes(slot_waktu_option["jam_mulai"])
-                selesai_opt = utils.time_to_minutes(slot_waktu_option["jam_selesai"])
-                durasi = failed_sesi["durasi"]
-
-                # Periksa apakah durasi sesi sesuai dalam slot waktu yang dipilih
-                if mulai_opt + durasi > selesai_opt:
-                    continue 
-
-                for ruang_option in self.ruangan:
-                    # Periksa apakah kapasitas ruangan cukup
-                    if ruang_option["kapasitas"] < failed_sesi["jumlah_mahasiswa"]:
-                        potential_reasons.add(f"Ruangan '{ruang_option['nama']}' terlalu kecil ({ruang_option['kapasitas']} < {failed_sesi['jumlah_mahasiswa']} mahasiswa).")
-                        continue 
-
-                    # Simulasikan menambahkan sesi yang gagal ini ke jadwal *yang berhasil* saat ini
-                    # dan periksa konflik menggunakan pemeriksa konflik umum.
-                    temp_schedule_item = {
-                        "hari": slot_waktu_option["hari"],
-                        "jam_mulai": utils.minutes_to_time(mulai_opt),
-                        "jam_selesai": utils.minutes_to_time(mulai_opt + durasi),
-                        "ruangan": ruang_option["nama"],
-                        "dosen": utils.get_dosen_name(failed_sesi["dosen_id"], self.dosen),
-                        "matakuliah": failed_sesi["matakuliah"]
-                    }
-                    
-                    # Tambahkan sementara ke jadwal *yang berhasil* untuk memeriksa konflik
-                    temp_full_schedule = self.jadwal + [temp_schedule_item]
-                    temp_conflicts = utils.check_conflicts(temp_full_schedule)
-
-                    if not temp_conflicts:
-                        # Jika tidak ada konflik yang ditemukan saat mencoba menempatkan sesi ini dengan jadwal *yang ada*,
-                        # itu berarti sesi ini *bisa* ditempatkan jika DP memilihnya.
-                        # Alasan sebenarnya adalah karena optimasi global DP (misalnya, sesi lain diprioritaskan).
-                        reason = "Tidak dapat dijadwalkan: Tidak optimal secara global dengan sesi lain yang lebih prioritas."
-                        found_theoretically_possible_slot = True
-                        potential_reasons.clear() # Hapus alasan konflik spesifik jika slot yang valid ditemukan
-                        break # Berhenti mencari slot untuk sesi yang gagal ini
-                    else:
-                        # Konflik ditemukan, tentukan alasan spesifiknya
-                        for conflict_msg in temp_conflicts:
-                            if f"[KONFLIK RUANGAN] {ruang_option['nama']}" in conflict_msg:
-                                potential_reasons.add(f"Ruangan '{ruang_option['nama']}' bentrok pada {slot_waktu_option['hari']} {utils.minutes_to_time(mulai_opt)}-{utils.minutes_to_time(mulai_opt + durasi)}.")
-                            if f"[KONFLIK DOSEN] {utils.get_dosen_name(failed_sesi['dosen_id'], self.dosen)}" in conflict_msg:
-                                potential_reasons.add(f"Dosen '{utils.get_dosen_name(failed_sesi['dosen_id'], self.dosen)}' bentrok pada {slot_waktu_option['hari']} {utils.minutes_to_time(mulai_opt)}-{utils.minutes_to_time(mulai_opt + durasi)}.")
-                
-                if found_theoretically_possible_slot:
-                    break # Berhenti mencari slot untuk sesi yang gagal ini
-
-            if potential_reasons:
-                reason = "Tidak dapat dijadwalkan: " + "; ".join(sorted(list(potential_reasons)))
-            elif not found_theoretically_possible_slot:
-                reason = "Tidak dapat dijadwalkan: Tidak ada slot waktu atau ruangan yang tersedia yang memenuhi semua kriteria."
-            
+            session = problem.sessions[failed_sesi["idx"]]
             failed_sesi_copy = failed_sesi.copy()
-            failed_sesi_copy["reason"] = reason
+            failed_sesi_copy["dosen"] = problem.lecturer_names[session.lecturer]
+            failed_sesi_copy["reason_codes"] = problem.failure_reasons(session, used_rooms, used_dosen)
             detailed_failed_sessions.append(failed_sesi_copy)
 
         return {
@@ -1,21 +1,46 @@
 # algoritma/greedy.py
 
 import utils
+import math
+import os
+import random
 import time # Import time for execution tracking
+from concurrent.futures import ProcessPoolExecutor
+from algoritma.problem import as_problem
+from algoritma.occupancy import OccupancyGrid, FreeIntervalIndex
+from algoritma.instrumentation import Instrumentation
+
+# Urutan mata kuliah yang didukung GreedyScheduler
+ORDERINGS = ("students", "sks", "lecturer_load", "domain", "grasp")
 
 class GreedyScheduler:
-    def __init__(self, data):
-        self.matakuliah = data["matakuliah"]
-        self.dosen = data["dosen"]
-        self.slot_waktu = data["slot_waktu"]
-        self.ruangan = data["ruangan"]
+    def __init__(self, data, ordering="students", seed=None, grasp_alpha=0.3):
+        # `data` boleh berupa dataset mentah atau ProblemInstance yang sudah dikompilasi
+        self.problem = as_problem(data)
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering '{ordering}', expected one of {ORDERINGS}")
+        # Urutan mata kuliah; "grasp" mengacak pilihan di antara `grasp_alpha` bagian teratas
+        # urutan "students" dengan `seed` agar hasilnya bisa direproduksi
+        self.ordering = ordering
+        self.seed = seed
+        self.grasp_alpha = grasp_alpha
+        self.matakuliah = self.problem.matakuliah
+        self.dosen = self.problem.dosen
+        self.slot_waktu = self.problem.slot_waktu
+        self.ruangan = self.problem.ruangan
         self.jadwal = []
 
-        self.used_rooms = {}
-        self.used_dosen = {}
+        # Bitset occupancy per (hari, ruangan) and per (hari, dosen) over 15-minute ticks
+        self.used_rooms = OccupancyGrid(len(self.problem.days), len(self.problem.room_ids))
+        self.used_dosen = OccupancyGrid(len(self.problem.days), len(self.problem.lecturer_ids))
+        # Sorted free gaps per (ruangan, hari) for earliest-fit placement
+        self.free_rooms = FreeIntervalIndex(self.problem)
 
         self.failed_sessions = []
         self.total_attempted_sessions_count = 0 # To be calculated in solve()
+        # Phase timers and counters (placements probed = earliest-fit queries per (hari, ruangan))
+        self.instr = Instrumentation()
+        self.placements_probed = 0
 
     def calculate_stats(self):
         # This method aggregates statistics from the scheduler's state
@@ -24,138 +49,117 @@ class GreedyScheduler:
             "total_slots_attempted": self.total_attempted_sessions_count,
             "scheduled_slots": len(self.jadwal),
             "conflicts": conflicts,
-            "failed_details": self.failed_sessions
+            "failed_details": self.failed_sessions,
+            "ordering": self.ordering
         }
 
-    def is_conflict(self, hari, jam_mulai_menit, jam_selesai_sesi_menit, ruangan_id, dosen_id):
-        # Check for room conflicts
-        if hari in self.used_rooms and ruangan_id in self.used_rooms[hari]:
-            for mulai, selesai in self.used_rooms[hari][ruangan_id]:
-                if not (jam_selesai_sesi_menit <= mulai or jam_mulai_menit >= selesai):
-                    return "Konflik Ruangan"
+    def course_order(self):
+        """Indeks mata kuliah sesuai `self.ordering`; seri selalu dipecah dengan mahasiswa terbanyak."""
+        problem = self.problem
+        courses = range(len(problem.matakuliah))
+        students = lambda c: problem.matakuliah[c]["jumlah_mahasiswa"]
+
+        if self.ordering == "sks":
+            return sorted(courses, key=lambda c: (problem.matakuliah[c]["sks"], students(c)), reverse=True)
+
+        if self.ordering == "lecturer_load":
+            # Total menit mengajar per dosen: dosen paling sibuk dijadwalkan lebih dulu
+            load = {}
+            for c in courses:
+                lecturer = problem.course_lecturer[c]
+                load[lecturer] = load.get(lecturer, 0) + problem.course_durasi[c] * problem.course_jumlah_sesi[c]
+            return sorted(courses, key=lambda c: (load[problem.course_lecturer[c]], students(c)), reverse=True)
 
-        # Check for lecturer conflicts
-        if hari in self.used_dosen and dosen_id in self.used_dosen[hari]:
-            for mulai, selesai in self.used_dosen[hari][dosen_id]:
-                if not (jam_selesai_sesi_menit <= mulai or jam_mulai_menit >= selesai):
-                    return "Konflik Dosen"
+        if self.ordering == "domain":
+            # Most-constrained-first: jumlah kandidat statis (hari, mulai, ruangan) paling sedikit
+            def domain(c):
+                sessions = problem.sessions_by_course[c]
+                return len(problem.candidates(problem.sessions[sessions[0]])) if sessions else 0
+            return sorted(courses, key=lambda c: (domain(c), -students(c)))
 
-        return None # No conflict detected
+        order = sorted(courses, key=students, reverse=True)
+        if self.ordering == "grasp":
+            # Restricted candidate list: pilih acak dari bagian teratas sisa urutan
+            rng = random.Random(self.seed)
+            remaining, order = order, []
+            while remaining:
+                k = max(1, math.ceil(self.grasp_alpha * len(remaining)))
+                order.append(remaining.pop(rng.randrange(k)))
+        return order
 
     def mark_used(self, hari, jam_mulai_menit, jam_selesai_sesi_menit, ruangan_id, dosen_id):
-        self.used_rooms.setdefault(hari, {}).setdefault(ruangan_id, []).append((jam_mulai_menit, jam_selesai_sesi_menit))
-        self.used_dosen.setdefault(hari, {}).setdefault(dosen_id, []).append((jam_mulai_menit, jam_selesai_sesi_menit))
+        t0, t1 = self.problem.tick_range(jam_mulai_menit, jam_selesai_sesi_menit)
+        mask = self.problem.tick_mask(jam_mulai_menit, jam_selesai_sesi_menit)
+        self.used_rooms.mark(hari, ruangan_id, mask)
+        self.used_dosen.mark(hari, dosen_id, mask)
+        self.free_rooms.occupy(ruangan_id, hari, t0, t1)
+
+    def find_earliest_placement(self, session, sorted_ruangan):
+        """
+        Mencari penempatan (hari, mulai_menit, ruangan) paling awal untuk `session`.
+
+        Hasilnya sama dengan menelusuri setiap waktu mulai pada `problem.starts` (per 15 menit dari
+        awal slot, juga untuk slot di luar grid) secara berurutan lalu mencoba ruangan sesuai urutan
+        `sorted_ruangan`, tetapi per (ruangan, hari) cukup satu query
+        ke indeks celah kosong yang sekaligus memperhitungkan okupansi dosen.
+        """
+        problem = self.problem
+        n_ticks = max(session.n_ticks, 1)
+        for hari in range(len(problem.days)):
+            dosen_busy = self.used_dosen.busy(hari, session.lecturer)
+            best_tick, best_ruang = None, None
+            self.placements_probed += len(sorted_ruangan)
+            for ruang in sorted_ruangan:
+                tick = self.free_rooms.earliest_fit(ruang, hari, n_ticks, dosen_busy)
+                # Strict comparison keeps the earlier room in sorted_ruangan on ties
+                if tick is not None and (best_tick is None or tick < best_tick):
+                    best_tick, best_ruang = tick, ruang
+            if best_tick is not None:
+                return hari, problem.tick_minute(best_tick), best_ruang
+        return None
 
     def solve(self): # Renamed `run` to `solve` for consistency
         start_time = time.time()
+        problem = self.problem
         
         urutan_hari = {"Senin": 1, "Selasa": 2, "Rabu": 3, "Kamis": 4, "Jumat": 5, "Sabtu": 6, "Minggu": 7}
 
-        # Calculate total attempted sessions upfront
-        self.total_attempted_sessions_count = 0
-        for mk in self.matakuliah:
-            kapasitas_max = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-            jumlah_sesi_mk = (mk["jumlah_mahasiswa"] + kapasitas_max - 1) // kapasitas_max
-            self.total_attempted_sessions_count += jumlah_sesi_mk
-
-        # Sort courses by the most students first (a common greedy heuristic)
-        sorted_matakuliah = sorted(self.matakuliah, key=lambda x: x["jumlah_mahasiswa"], reverse=True)
-
-        # Pre-process all granular 15-minute time intervals from original slots
-        all_time_intervals = []
-        for slot in self.slot_waktu:
-            hari_name = slot["hari"]
-            start_minutes_slot = utils.time_to_minutes(slot["jam_mulai"])
-            end_minutes_slot = utils.time_to_minutes(slot["jam_selesai"])
-            # Iterate in 15-minute steps to find possible start times
-            for start_interval_menit in range(start_minutes_slot, end_minutes_slot, 15):
-                all_time_intervals.append({
-                    "hari": hari_name,
-                    "jam_mulai_menit": start_interval_menit,
-                    "jam_selesai_slot_menit": end_minutes_slot # End boundary of the original slot
-                })
-        
-        # Sort all time intervals by day, then by start time
-        sorted_all_time_intervals = sorted(
-            all_time_intervals,
-            key=lambda x: (urutan_hari.get(x["hari"], 99), x["jam_mulai_menit"])
-        )
+        # Sessions (count, duration, students per session) are precomputed by the ProblemInstance
+        self.total_attempted_sessions_count = len(problem.sessions)
 
-        for mk in sorted_matakuliah:
-            durasi_menit = utils.sks_to_minutes(mk["sks"])
-            total_peserta = mk["jumlah_mahasiswa"]
-            
-            kapasitas_max_ruangan = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-            jumlah_sesi = (total_peserta + kapasitas_max_ruangan - 1) // kapasitas_max_ruangan if total_peserta > 0 else 0
-            
-            peserta_per_sesi = (total_peserta + jumlah_sesi - 1) // jumlah_sesi if jumlah_sesi > 0 else total_peserta
-
-            for sesi_ke in range(1, jumlah_sesi + 1):
-                assigned_this_session = False
-                current_session_failed_reason = "Tidak ada slot waktu atau ruangan yang cocok ditemukan." # Default reason
-
-                # Sort rooms by capacity closest to required students (Greedy choice)
-                sorted_ruangan = sorted(self.ruangan, key=lambda r: abs(r["kapasitas"] - peserta_per_sesi))
-
-                for interval_info in sorted_all_time_intervals:
-                    current_hari = interval_info["hari"]
-                    current_jam_mulai_menit = interval_info["jam_mulai_menit"]
-                    current_slot_end_menit = interval_info["jam_selesai_slot_menit"]
-
-                    jam_selesai_sesi_menit = current_jam_mulai_menit + durasi_menit
-
-                    # Check if the session duration exceeds the remaining time in the slot
-                    if jam_selesai_sesi_menit > current_slot_end_menit:
-                        current_session_failed_reason = "Durasi mata kuliah melebihi slot waktu yang tersedia."
-                        continue # Try the next time interval
-
-                    for ruang in sorted_ruangan:
-                        # Check if room capacity is sufficient
-                        if ruang["kapasitas"] < peserta_per_sesi:
-                            current_session_failed_reason = f"Kapasitas ruangan '{ruang['nama']}' ({ruang['kapasitas']}) tidak cukup untuk {peserta_per_sesi} mahasiswa."
-                            continue # Try next room
-
-                        # Check for conflicts
-                        conflict_type = self.is_conflict(
-                            current_hari,
-                            current_jam_mulai_menit,
-                            jam_selesai_sesi_menit,
-                            ruang["id"],
-                            mk["dosen_id"]
-                        )
-                        
-                        if conflict_type is None: # No conflict
-                            # Schedule the session
-                            self.mark_used(current_hari, current_jam_mulai_menit, jam_selesai_sesi_menit, ruang["id"], mk["dosen_id"])
-                            self.jadwal.append({
-                                "matakuliah": mk["nama"],
-                                "dosen": utils.get_dosen_name(mk["dosen_id"], self.dosen),
-                                "ruangan": ruang["nama"],
-                                "hari": current_hari,
-                                "jam_mulai": utils.minutes_to_time(current_jam_mulai_menit),
-                                "jam_selesai": utils.minutes_to_time(jam_selesai_sesi_menit),
-                                "jumlah_mahasiswa": peserta_per_sesi,
-                                "sesi": sesi_ke
-                            })
-                            assigned_this_session = True
-                            break # Session assigned, move to the next session for this course
-                        else:
-                            # Conflict detected, update specific reason
-                            current_session_failed_reason = f"{conflict_type} pada {current_hari} {utils.minutes_to_time(current_jam_mulai_menit)}-{utils.minutes_to_time(jam_selesai_sesi_menit)} di {ruang['nama']} atau dengan dosen {utils.get_dosen_name(mk['dosen_id'], self.dosen)}."
-                    
-                    if assigned_this_session:
-                        break # Session assigned, move to the next session for this course
-
-                if not assigned_this_session:
-                    # If after checking all slots and rooms, the session still isn't assigned
-                    self.failed_sessions.append({
-                        "matakuliah": mk["nama"],
-                        "dosen": utils.get_dosen_name(mk["dosen_id"], self.dosen),
-                        "jumlah_mahasiswa": peserta_per_sesi,
-                        "sesi": sesi_ke,
-                        "reason": current_session_failed_reason # The most specific failure reason found
-                    })
-        
+        # Default: most students first (a common greedy heuristic); see course_order()
+        with self.instr.phase("ordering"):
+            sorted_courses = self.course_order()
+
+        diagnostic_probes = 0
+        for c in sorted_courses:
+            for session_idx in problem.sessions_by_course[c]:
+                session = problem.sessions[session_idx]
+                peserta_per_sesi = session.peserta
+
+                # Rooms sorted by capacity closest to required students (Greedy choice),
+                # keeping only rooms that are big enough
+                sorted_ruangan = [r for r in problem.rooms_by_closeness(peserta_per_sesi) if problem.room_caps[r] >= peserta_per_sesi]
+
+                with self.instr.phase("placement"):
+                    placement = self.find_earliest_placement(session, sorted_ruangan) if sorted_ruangan else None
+
+                if placement is not None:
+                    # Schedule the session
+                    current_hari, current_jam_mulai_menit, ruang = placement
+                    self.mark_used(current_hari, current_jam_mulai_menit, current_jam_mulai_menit + session.durasi, ruang, session.lecturer)
+                    self.jadwal.append(problem.schedule_entry(session, current_hari, current_jam_mulai_menit, ruang))
+                    continue
+
+                # Session could not be placed anywhere: count the failing probes per reason code
+                # against the occupancy at this point; the report renders the text
+                with self.instr.phase("diagnostics"):
+                    reason_codes = problem.failure_reasons(session, self.used_rooms, self.used_dosen)
+                diagnostic_probes += sum(reason_codes.values())
+                self.failed_sessions.append(problem.failed_entry(session, reason_codes=reason_codes))
+
+        self.instr.count("placements_probed", self.placements_probed)
+        self.instr.count("diagnostic_probes", diagnostic_probes)
         end_time = time.time()
 
         # Sort the final schedule for consistent reporting
@@ -167,9 +171,96 @@ class GreedyScheduler:
         # Calculate statistics and add execution time
         stats_data = self.calculate_stats()
         stats_data['execution_time'] = end_time - start_time
+        self.instr.merge_into(stats_data)
 
         # Return a dictionary containing both 'schedule' and 'stats'
         return {
             'schedule': sorted_final_schedule,
             'stats': stats_data
-        }
\ No newline at end of file
+        }
+
+class PortfolioGreedyScheduler:
+    """
+    Menjalankan GreedyScheduler dengan beberapa urutan mata kuliah (ORDERINGS, termasuk beberapa
+    varian GRASP dengan seed berbeda) pada process pool, lalu mengembalikan jadwal dengan sesi
+    terjadwal terbanyak. Seri dipecah dengan utilisasi ruangan tertinggi.
+    """
+
+    def __init__(self, data, orderings=("students", "sks", "lecturer_load", "domain"), grasp_runs=4,
+                 seed=0, grasp_alpha=0.3, workers=None):
+        # `data` boleh berupa dataset mentah atau ProblemInstance yang sudah dikompilasi
+        self.problem = as_problem(data)
+        self.configs = [(ordering, None) for ordering in orderings]
+        self.configs += [("grasp", seed + i) for i in range(grasp_runs)]
+        self.grasp_alpha = grasp_alpha
+        # Jumlah proses; None = semua core, 1 = berurutan di proses ini
+        self.workers = workers if workers else (os.cpu_count() or 1)
+
+    def solve(self):
+        start_time = time.time()
+        instr = Instrumentation()
+
+        jobs = [(ordering, seed, self.grasp_alpha) for ordering, seed in self.configs]
+        with instr.phase("runs"):
+            if self.workers > 1 and len(jobs) > 1:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)), initializer=_init_worker,
+                                         initargs=(self.problem,)) as executor:
+                    results = list(executor.map(_solve_ordering, jobs))
+            else:
+                _init_worker(self.problem)
+                results = [_solve_ordering(job) for job in jobs]
+
+        instr.set("portfolio_runs", len(results))
+        # Counters summed over all runs, not only the winning one
+        for result in results:
+            for name, value in result['stats']['counters'].items():
+                instr.count(name, value)
+
+        runs = []
+        best, best_key, best_run = None, None, None
+        for (ordering, seed), result in zip(self.configs, results):
+            utilization = room_utilization(self.problem, result['schedule'])
+            runs.append({
+                "ordering": ordering,
+                "seed": seed,
+                "scheduled_slots": result['stats']['scheduled_slots'],
+                "room_utilization": utilization,
+                "execution_time": result['stats']['execution_time']
+            })
+            key = (result['stats']['scheduled_slots'], utilization)
+            # Strict comparison keeps the earlier configuration on full ties
+            if best_key is None or key > best_key:
+                best, best_key, best_run = result, key, runs[-1]
+
+        end_time = time.time()
+
+        stats_data = dict(best['stats'])
+        stats_data['grasp_seed'] = best_run['seed']
+        stats_data['portfolio_runs'] = runs
+        stats_data['execution_time'] = end_time - start_time
+        instr.merge_into(stats_data)
+
+        return {
+            'schedule': best['schedule'],
+            'stats': stats_data
+        }
+
+
+def room_utilization(problem, schedule):
+    """Rasio total mahasiswa terhadap total kapasitas ruangan yang dipakai jadwal (0.0 jika kosong)."""
+    caps = dict(zip(problem.room_names, problem.room_caps))
+    capacity = sum(caps.get(entry["ruangan"], 0) for entry in schedule)
+    if capacity == 0:
+        return 0.0
+    return sum(entry["jumlah_mahasiswa"] for entry in schedule) / capacity
+
+
+# Per-process state for the portfolio workers
+_worker_state = {}
+
+def _init_worker(problem):
+    _worker_state["problem"] = problem
+
+def _solve_ordering(job):
+    ordering, seed, grasp_alpha = job
+    return GreedyScheduler(_worker_state["problem"], ordering=ordering, seed=seed, grasp_alpha=grasp_alpha).solve()
@@ -1,66 +1,91 @@
 # algoritma/ilp.py
 
 import utils
-from pulp import LpProblem, LpVariable, LpMaximize, lpSum, LpStatus
+import pulp
+from pulp import LpProblem, LpVariable, LpMaximize, lpSum, LpStatus, LpSolution, value
+from pulp import LpSolutionOptimal, LpSolutionIntegerFeasible, LpStatusNotSolved, PulpSolverError
+import inspect
+import math
+import os
+import re
+import tempfile
 import time # Import time for execution tracking
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from algoritma.occupancy import OccupancyGrid
+from algoritma.problem import as_problem
+from algoritma.instrumentation import Instrumentation
+
+# Mode model ILP yang didukung
+MODE_FULL = "full"            # satu biner per (mk, dosen, ruangan, hari, mulai)
+MODE_TWO_STAGE = "two_stage"  # tahap 1: waktu per (mk, hari, mulai), tahap 2: pencocokan ruangan
 
 class ILPScheduler:
-    def __init__(self, data):
-        self.matakuliah = data["matakuliah"]
-        self.dosen = data["dosen"]
-        self.slot_waktu = data["slot_waktu"]
-        self.ruangan = data["ruangan"]
+    def __init__(self, data, mode=MODE_FULL, warm_start=None, time_limit=None, gap_rel=None,
+                 threads=None, solver="PULP_CBC_CMD", msg=True, decompose=False, workers=None,
+                 lazy=False, lazy_seed=0.05, max_lazy_rounds=50, max_room_rounds=20):
+        # `data` boleh berupa dataset mentah atau ProblemInstance yang sudah dikompilasi
+        self.problem = as_problem(data)
+        if mode not in (MODE_FULL, MODE_TWO_STAGE):
+            raise ValueError(f"Mode ILP tidak dikenal: {mode}")
+        self.mode = mode
+
+        # Jadwal awal (mis. hasil Greedy) untuk MIP start; lihat set_warm_start. Jumlah sesi per mata
+        # kuliah dibatasi <= target, jadi jadwal parsial pun merupakan start yang layak.
+        # warm_start_accepted: apakah solver memakai start tersebut (None jika tidak diketahui/tanpa start)
+        self.warm_start = None
+        self.warm_start_accepted = None
+        self.set_warm_start(warm_start)
+
+        # Anggaran solver: batas waktu (detik), gap MIP relatif, jumlah thread, dan backend PuLP.
+        # Jika batas tercapai, incumbent terbaik tetap dipakai beserta gap-nya.
+        self.time_limit = time_limit
+        self.gap_rel = gap_rel
+        self.threads = threads
+        self.solver = solver
+        self.msg = msg
+
+        # Dekomposisi: komponen terhubung (mk-dosen-ruangan) diselesaikan terpisah di process pool
+        self.decompose = decompose
+        self.workers = workers if workers else (os.cpu_count() or 1)
 
-        # Helper dictionaries for quick lookups
-        self.mk_dict = {mk["id"]: mk for mk in self.matakuliah}
-        self.dosen_dict = {d["id"]: d for d in self.dosen}
-        self.ruangan_dict = {r["id"]: r for r in self.ruangan}
+        # Mode lazy (cutting-plane): hanya sebagian kecil kendala konflik (fraksi `lazy_seed`, bucket
+        # terbesar) dipasang di awal; sisanya ditambahkan hanya jika dilanggar solusi, lalu re-solve.
+        self.lazy = lazy
+        self.lazy_seed = lazy_seed
+        self.max_lazy_rounds = max_lazy_rounds
+        self._lazy_rows = []
+
+        # Mode dua tahap: jika tahap 2 gagal memberi ruangan pada suatu hari, kombinasi waktu hari itu
+        # dilarang (no-good cut) lalu tahap 1 diselesaikan ulang, paling banyak `max_room_rounds` kali
+        self.max_room_rounds = max_room_rounds
+        self.matakuliah = self.problem.matakuliah
+        self.dosen = self.problem.dosen
+        self.slot_waktu = self.problem.slot_waktu
+        self.ruangan = self.problem.ruangan
 
         self.urutan_hari = {"Senin": 1, "Selasa": 2, "Rabu": 3, "Kamis": 4, "Jumat": 5, "Sabtu": 6, "Minggu": 7}
 
-        # Pre-process all possible 15-minute time intervals for sessions
-        self.all_possible_time_slots = self._generate_possible_time_slots()
+        # All possible 15-minute start times (day index, start minute, slot end) come precomputed
+        self.all_possible_time_slots = self.problem.starts
         
         # Initialize lists to store results
         self.jadwal = []
         self.failed_sessions = []
         self.total_attempted_sessions_count = 0 # Will be calculated during variable creation
+        self.instr = Instrumentation()
 
-    def _generate_possible_time_slots(self):
-        """Generates all valid 15-minute start times within provided slots."""
-        possible_slots = []
-        for slot in self.slot_waktu:
-            hari_name = slot["hari"]
-            start_minutes_slot = utils.time_to_minutes(slot["jam_mulai"])
-            end_minutes_slot = utils.time_to_minutes(slot["jam_selesai"])
-
-            # Iterate every 15 minutes as a potential start time
-            for start_time_candidate in range(start_minutes_slot, end_minutes_slot, 15):
-                possible_slots.append({
-                    "hari": hari_name,
-                    "jam_mulai_menit": start_time_candidate,
-                    "jam_selesai_slot_menit": end_minutes_slot # Store original slot end for duration check
-                })
-        return possible_slots
-
-    def solve(self):
-        start_time = time.time()
-        
-        prob = LpProblem("Penjadwalan_Kuliah", LpMaximize)
-
+    def _create_variable_keys(self):
+        """Membuat kunci variabel (course, lecturer, room, day, start) yang valid secara statis."""
+        problem = self.problem
+        self.total_attempted_sessions_count = 0
         self.x_keys = []
-        for mk_id in self.mk_dict:
-            mk = self.mk_dict[mk_id]
-            dosen_mk_id = mk["dosen_id"]
+        for c in range(len(problem.matakuliah)):
+            dosen_mk = problem.course_lecturer[c]
+            durasi_mk = problem.course_durasi[c]
 
-            durasi_mk = utils.sks_to_minutes(mk["sks"])
-            total_peserta_mk = mk["jumlah_mahasiswa"]
-            
-            # Use max capacity from self.ruangan, defaulting to 1 if no rooms to avoid error
-            kapasitas_max_ruangan = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-            
-            # Calculate total sessions needed for this course. Ensure no division by zero.
-            jumlah_sesi_mk = (total_peserta_mk + kapasitas_max_ruangan - 1) // kapasitas_max_ruangan if total_peserta_mk > 0 else 0
+            # Calculate total sessions needed for this course (precomputed)
+            jumlah_sesi_mk = problem.course_jumlah_sesi[c]
             
             # Accumulate total attempted sessions count
             self.total_attempted_sessions_count += jumlah_sesi_mk
@@ -69,26 +94,44 @@ class ILPScheduler:
             if jumlah_sesi_mk == 0 or durasi_mk == 0:
                 continue
 
-            # Calculate peserta_per_sesi for consistent reporting
-            peserta_per_sesi_mk = (total_peserta_mk + jumlah_sesi_mk - 1) // jumlah_sesi_mk if jumlah_sesi_mk > 0 else total_peserta_mk
-
-            for r_id in self.ruangan_dict:
-                ruang = self.ruangan_dict[r_id]
-                
-                # Only consider rooms with adequate capacity
-                if ruang["kapasitas"] < peserta_per_sesi_mk:
-                    continue
-
-                for hari_data in self.all_possible_time_slots:
-                    hari = hari_data["hari"]
-                    start_min = hari_data["jam_mulai_menit"]
-                    jam_selesai_slot_menit = hari_data["jam_selesai_slot_menit"]
-                    
+            # Only consider rooms with adequate capacity for peserta_per_sesi
+            for r in problem.rooms_fitting(problem.course_peserta[c]):
+                for hari, start_min, jam_selesai_slot_menit in self.all_possible_time_slots:
                     # Ensure the session fits within the available slot duration
                     if start_min + durasi_mk > jam_selesai_slot_menit:
                         continue
                     
-                    self.x_keys.append((mk_id, dosen_mk_id, r_id, hari, start_min))
+                    self.x_keys.append((c, dosen_mk, r, hari, start_min))
+
+        # Slot yang saling tumpang tindih bisa menghasilkan waktu mulai yang sama dua kali
+        self.x_keys = list(dict.fromkeys(self.x_keys))
+
+    def _build_conflict_buckets(self):
+        """
+        Mengelompokkan variabel sekali jalan: per (ruangan, hari, tick) dan per (dosen, hari, tick)
+        berisi variabel yang intervalnya menutupi tick tersebut, serta variabel per mata kuliah.
+        """
+        problem = self.problem
+        self.room_buckets = defaultdict(list)
+        self.dosen_buckets = defaultdict(list)
+        self.course_vars = defaultdict(list)
+        for key in self.x_keys:
+            mk_id, d_id, r_id, hari, start_min = key
+            var = self.x[key]
+            tick_start, tick_end = problem.tick_range(start_min, start_min + problem.course_durasi[mk_id])
+            for tick in range(tick_start, tick_end):
+                self.room_buckets[(r_id, hari, tick)].append(var)
+                self.dosen_buckets[(d_id, hari, tick)].append(var)
+            self.course_vars[mk_id].append(var)
+
+    def build_model(self):
+        """Membangun LpProblem: variabel, fungsi objektif, dan semua kendala."""
+        problem = self.problem
+        prob = LpProblem("Penjadwalan_Kuliah", LpMaximize)
+        self._lazy_rows = []
+
+        # 1. Keys use the dense indices of the ProblemInstance: (course, lecturer, room, day, start)
+        self._create_variable_keys()
 
         # 2. Define Decision Variables using the filtered keys
         # Only create variables for keys that were valid and added to self.x_keys
@@ -101,68 +144,33 @@ class ILPScheduler:
         
         # Constraint 1 & 2: Room Capacity & Lecturer for Course
         # Handled by filtering self.x_keys initially (only valid combinations are considered).
+
+        # Bucket every variable by the ticks it covers, once
+        self._build_conflict_buckets()
         
         # Constraint 3: No Room Conflicts
-        # A room can only be used by one session at the same 15-minute interval
-        for r_id in self.ruangan_dict:
-            for hari_data in self.all_possible_time_slots: # Iterate through each 15-min interval
-                current_hari = hari_data["hari"]
-                current_start_min = hari_data["jam_mulai_menit"]
-                
-                # Collect all variables that represent a session potentially overlapping with this 15-min slot
-                overlapping_sessions = []
-                for key in self.x_keys:
-                    mk_id, _, assigned_r_id, hari, session_start_min = key
-                    
-                    if assigned_r_id == r_id and hari == current_hari: # Same room and day
-                        durasi_session = utils.sks_to_minutes(self.mk_dict[mk_id]["sks"])
-                        session_end_min = session_start_min + durasi_session
-                        
-                        # Check if session_start_min and session_end_min overlap with (current_start_min, current_start_min + 15)
-                        if not (current_start_min + 15 <= session_start_min or current_start_min >= session_end_min):
-                            overlapping_sessions.append(self.x[key])
-                
-                # If there are any potential overlaps, ensure only one is chosen
-                if overlapping_sessions:
-                    prob += lpSum(overlapping_sessions) <= 1, \
-                            f"KonflikRuangan_{r_id}_{current_hari}_{current_start_min}"
+        # A room can only be used by one session at the same 15-minute interval.
+        # A bucket with a single binary variable can never be violated, so it is skipped.
+        for (r_id, hari, tick), overlapping_sessions in self.room_buckets.items():
+            if len(overlapping_sessions) > 1:
+                self._add_conflict_row(prob, f"KonflikRuangan_{r_id}_{hari}_{problem.tick_minute(tick)}",
+                                       overlapping_sessions, 1)
 
         # Constraint 4: No Lecturer Conflicts
         # A lecturer can only teach one session at the same 15-minute interval
-        for d_id in self.dosen_dict:
-            for hari_data in self.all_possible_time_slots: # Iterate through each 15-min interval
-                current_hari = hari_data["hari"]
-                current_start_min = hari_data["jam_mulai_menit"]
-
-                overlapping_sessions_dosen = []
-                for key in self.x_keys:
-                    mk_id, assigned_d_id, _, hari, session_start_min = key
-                    
-                    if assigned_d_id == d_id and hari == current_hari: # Same lecturer and day
-                        durasi_session = utils.sks_to_minutes(self.mk_dict[mk_id]["sks"])
-                        session_end_min = session_start_min + durasi_session
-                        
-                        # Check if session_start_min and session_end_min overlap with (current_start_min, current_start_min + 15)
-                        if not (current_start_min + 15 <= session_start_min or current_start_min >= session_end_min):
-                            overlapping_sessions_dosen.append(self.x[key])
-                
-                # If there are any potential overlaps, ensure only one is chosen
-                if overlapping_sessions_dosen:
-                    prob += lpSum(overlapping_sessions_dosen) <= 1, \
-                            f"KonflikDosen_{d_id}_{current_hari}_{current_start_min}"
+        for (d_id, hari, tick), overlapping_sessions_dosen in self.dosen_buckets.items():
+            if len(overlapping_sessions_dosen) > 1:
+                self._add_conflict_row(prob, f"KonflikDosen_{d_id}_{hari}_{problem.tick_minute(tick)}",
+                                       overlapping_sessions_dosen, 1)
         
-        # Constraint 5: Each Course Session Must Be Scheduled Exactly The Required Number of Times
-        # This is a critical hard constraint. If this cannot be met, the problem is infeasible.
-        for mk_id in self.mk_dict:
-            mk = self.mk_dict[mk_id]
-            dosen_id = mk["dosen_id"]
-            total_peserta = mk["jumlah_mahasiswa"]
+        # Constraint 5: Each Course Is Scheduled At Most The Required Number of Times
+        # The objective pushes every course to its target; sessions that cannot be placed are simply
+        # left out, so the model is never infeasible and a partial schedule is a valid MIP start.
+        for mk_id in range(len(problem.matakuliah)):
+            jumlah_sesi_mk = problem.course_jumlah_sesi[mk_id]
             
-            kapasitas_max_ruangan = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-            jumlah_sesi_mk = (total_peserta + kapasitas_max_ruangan - 1) // kapasitas_max_ruangan if total_peserta > 0 else 0
-            
-            # Filter x_keys for the current matakuliah and its assigned dosen only
-            relevant_x_vars = [self.x[key] for key in self.x_keys if key[0] == mk_id and key[1] == dosen_id]
+            # Variables of this matakuliah (always taught by its own dosen)
+            relevant_x_vars = self.course_vars.get(mk_id, [])
 
             # If no sessions are required for this course OR no valid keys were generated for it,
             # ensure no sessions are scheduled for it.
@@ -170,88 +178,765 @@ class ILPScheduler:
                 if relevant_x_vars: # Only add if there are any variables to constrain
                     prob += lpSum(relevant_x_vars) == 0, f"Mk_{mk_id}_NoSesiNeeded_PreventScheduling"
                 continue
-            
-            # If relevant_x_vars is empty here, it means no valid assignments (room/time) could be found for this MK.
-            # This would make the problem infeasible if jumlah_sesi_mk > 0.
-            if not relevant_x_vars and jumlah_sesi_mk > 0:
-                 pass # No constraint to add if no variables exist for this MK
 
-            # This ensures that exactly `jumlah_sesi_mk` sessions are scheduled for this course.
-            prob += lpSum(relevant_x_vars) == jumlah_sesi_mk, \
-                    f"Jumlah_Sesi_Mk_{mk_id}_Tepat_Target"
+            # At most `jumlah_sesi_mk` sessions of this course; the shortfall is reported as failed sessions
+            prob += lpSum(relevant_x_vars) <= jumlah_sesi_mk, \
+                    f"Jumlah_Sesi_Mk_{mk_id}_Maks_Target"
 
-        # 5. Solve the Problem
-        prob.solve()
+        return prob
 
-        end_time = time.time()
+    def _add_conflict_row(self, prob, name, variables, rhs):
+        """Kendala sum(variables) <= rhs; pada mode lazy hanya dicatat dulu sebagai kandidat."""
+        if self.lazy:
+            self._lazy_rows.append((name, variables, rhs))
+        else:
+            prob += lpSum(variables) <= rhs, name
+
+    def _seed_lazy_rows(self, prob):
+        """
+        Memasang seed kendala lazy (bucket dengan variabel terbanyak, paling mungkin mengikat) dan
+        membangun indeks variabel -> baris kandidat yang belum dipasang untuk pengecekan cepat.
+        """
+        rows = sorted(self._lazy_rows, key=lambda row: len(row[1]), reverse=True)
+        n_seed = math.ceil(len(rows) * self.lazy_seed)
+        for name, variables, rhs in rows[:n_seed]:
+            prob += lpSum(variables) <= rhs, name
+
+        self._lazy_rows = rows[n_seed:]
+        self._lazy_added = [False] * len(self._lazy_rows)
+        self._lazy_index = defaultdict(list)
+        for row_id, (_, variables, _) in enumerate(self._lazy_rows):
+            for var in variables:
+                self._lazy_index[var.name].append(row_id)
+        return n_seed
+
+    def _lazy_row_usage(self, variables):
+        """Menghitung pemakaian setiap baris kandidat oleh variabel bernilai 1."""
+        usage = defaultdict(int)
+        for var in variables:
+            if var.varValue is not None and var.varValue > 0.5:
+                for row_id in self._lazy_index.get(var.name, ()):
+                    usage[row_id] += 1
+        return usage
+
+    def _violated_lazy_rows(self, variables):
+        """
+        Baris kandidat yang belum dipasang dan dilanggar oleh solusi saat ini. Untuk setiap variabel
+        yang terlibat pelanggaran, semua baris kandidatnya (tick lain dari interval yang sama) ikut
+        dipasang, supaya solver tidak sekadar menggeser tabrakan yang sama satu tick.
+        """
+        usage = self._lazy_row_usage(variables)
+        violated = {row_id for row_id, used in usage.items()
+                    if not self._lazy_added[row_id] and used > self._lazy_rows[row_id][2]}
+        if not violated:
+            return []
+        rows = set(violated)
+        for row_id in violated:
+            for var in self._lazy_rows[row_id][1]:
+                if var.varValue is not None and var.varValue > 0.5:
+                    rows.update(r for r in self._lazy_index[var.name] if not self._lazy_added[r])
+        return sorted(rows)
+
+    def _drop_lazy_violations(self, variables):
+        """
+        Dipakai jika anggaran habis sebelum loop lazy konvergen: variabel yang masih bertabrakan
+        dinolkan (yang datang belakangan mengalah) sehingga jadwal yang dikembalikan bebas konflik.
+        """
+        usage = defaultdict(int)
+        dropped = 0
+        for var in variables:
+            if var.varValue is None or var.varValue <= 0.5:
+                continue
+            rows = self._lazy_index.get(var.name, ())
+            if all(usage[row_id] < self._lazy_rows[row_id][2] for row_id in rows):
+                for row_id in rows:
+                    usage[row_id] += 1
+            else:
+                var.varValue = 0
+                dropped += 1
+        return dropped
+
+    def _solve_lazy(self, prob, variables, time_limit=None):
+        """
+        Loop cutting-plane: solve, cari baris kandidat yang dilanggar, pasang, lalu solve ulang
+        sampai tidak ada konflik (atau anggaran waktu/putaran habis). Solusi putaran sebelumnya
+        (tanpa tabrakan) dipakai sebagai MIP start putaran berikutnya.
+        """
+        solve_start = time.time()
+        rounds = 0
+        added = 0
+        violated = []
+        last_values = None
+        # Jumlah variabel yang dinolkan pada penugasan yang sedang dipegang `variables`
+        dropped = 0
+        restored = False
+        has_solution, solver_info = False, None
+        while True:
+            remaining = None
+            if time_limit is not None:
+                remaining = time_limit - (time.time() - solve_start)
+                if remaining <= 0 and solver_info is not None:
+                    solver_info["time_limit_hit"] = True
+                    break
+            has_solution, solver_info = self._run_solver(prob, max(remaining, 1) if remaining is not None else None,
+                                                         warm_start=bool(self.warm_start) or last_values is not None)
+            rounds += 1
+            if not has_solution:
+                if last_values is not None and solver_info["time_limit_hit"]:
+                    # Anggaran habis di tengah putaran: kembali ke solusi putaran sebelumnya (sudah bebas tabrakan)
+                    for var, val in zip(variables, last_values):
+                        var.varValue = val
+                    has_solution = True
+                    restored = True
+                    violated = []
+                break
+
+            dropped = 0
+            violated = self._violated_lazy_rows(variables)
+            if not violated or rounds >= self.max_lazy_rounds:
+                break
+            for row_id in violated:
+                name, row_vars, rhs = self._lazy_rows[row_id]
+                prob += lpSum(row_vars) <= rhs, name
+                self._lazy_added[row_id] = True
+            added += len(violated)
+
+            dropped = self._drop_lazy_violations(variables)
+            last_values = [1 if var.varValue is not None and var.varValue > 0.5 else 0 for var in variables]
+            for var, val in zip(variables, last_values):
+                var.setInitialValue(val)
+
+        if has_solution and violated:
+            # Putaran dihentikan (anggaran/batas putaran) dengan tabrakan tersisa; no-op jika sudah dibersihkan
+            dropped += self._drop_lazy_violations(variables)
+        if has_solution and (dropped or restored):
+            # Penugasan yang dikembalikan bukan solusi optimal model terakhir: objective dan status
+            # diturunkan dari penugasan itu sendiri. Bound model yang lebih longgar tetap valid.
+            objective = value(prob.objective)
+            bound = solver_info.get("best_bound")
+            solver_info["objective"] = objective
+            solver_info["solver_status"] = LpStatus[LpStatusNotSolved]
+            solver_info["solution_status"] = LpSolution[LpSolutionIntegerFeasible]
+            solver_info["gap"] = (bound - objective) / abs(bound) if bound else None
+        solver_info["lazy_rounds"] = rounds
+        solver_info["lazy_rows_added"] = added
+        solver_info["lazy_rows_pending"] = len(self._lazy_rows) - added
+        solver_info["lazy_dropped"] = dropped
+        return has_solution, solver_info
+
+    def _create_time_keys(self):
+        """Membuat kunci variabel tahap 1 (course, day, start): waktu tanpa ruangan."""
+        problem = self.problem
+        self.total_attempted_sessions_count = 0
+        self.y_keys = []
+        for c in range(len(problem.matakuliah)):
+            durasi_mk = problem.course_durasi[c]
+            jumlah_sesi_mk = problem.course_jumlah_sesi[c]
+            self.total_attempted_sessions_count += jumlah_sesi_mk
+
+            # Mata kuliah tanpa ruangan yang cukup besar tidak mendapat variabel sama sekali
+            if jumlah_sesi_mk == 0 or durasi_mk == 0 or not problem.rooms_fitting(problem.course_peserta[c]):
+                continue
+
+            for hari, start_min in problem.start_options(durasi_mk):
+                self.y_keys.append((c, hari, start_min))
+
+        self.y_keys = list(dict.fromkeys(self.y_keys))
+
+    def build_time_model(self):
+        """
+        Model tahap 1: hanya memilih waktu setiap sesi. Ruangan diganti kendala agregat per tick:
+        untuk setiap ambang kapasitas q, jumlah sesi yang hanya muat di ruangan berkapasitas >= q
+        tidak boleh melebihi banyaknya ruangan tersebut. Kendala ini menjamin pencocokan per tick,
+        tetapi belum tentu satu ruangan tetap sepanjang durasi sesi; kombinasi yang gagal di tahap 2
+        dipotong dengan no-good cut (lihat _solve_two_stage).
+        """
+        problem = self.problem
+        prob = LpProblem("Penjadwalan_Kuliah_Waktu", LpMaximize)
+        self._lazy_rows = []
+
+        self._create_time_keys()
+        self.y = LpVariable.dicts("y", self.y_keys, 0, 1, 'Binary')
+        prob += lpSum(self.y[key] for key in self.y_keys), "Total Sesi Terjadwal"
+
+        # Ambang kapasitas: kapasitas ruangan berbeda, urut naik, beserta jumlah ruangan >= ambang
+        levels = sorted(set(problem.room_caps))
+        rooms_at_least = [sum(1 for cap in problem.room_caps if cap >= q) for q in levels]
+
+        # Bucket variabel per (hari, tick) dan per (dosen, hari, tick), sekali jalan
+        tick_buckets = defaultdict(list)
+        self.dosen_buckets = defaultdict(list)
+        self.course_vars = defaultdict(list)
+        for key in self.y_keys:
+            mk_id, hari, start_min = key
+            var = self.y[key]
+            tick_start, tick_end = problem.tick_range(start_min, start_min + problem.course_durasi[mk_id])
+            for tick in range(tick_start, tick_end):
+                tick_buckets[(hari, tick)].append((problem.course_peserta[mk_id], var))
+                self.dosen_buckets[(problem.course_lecturer[mk_id], hari, tick)].append(var)
+            self.course_vars[mk_id].append(var)
+
+        # Kendala kapasitas agregat per tick dan ambang
+        for (hari, tick), running in tick_buckets.items():
+            for i, q in enumerate(levels):
+                # Sesi yang tidak muat di ruangan ambang sebelumnya hanya bisa memakai ruangan >= q
+                lower = levels[i - 1] if i > 0 else None
+                needing = [var for peserta, var in running if lower is None or peserta > lower]
+                if len(needing) > rooms_at_least[i]:
+                    self._add_conflict_row(prob, f"KapasitasRuangan_{hari}_{problem.tick_minute(tick)}_{q}",
+                                           needing, rooms_at_least[i])
+
+        # Dosen hanya mengajar satu sesi pada tick yang sama
+        for (d_id, hari, tick), overlapping_sessions_dosen in self.dosen_buckets.items():
+            if len(overlapping_sessions_dosen) > 1:
+                self._add_conflict_row(prob, f"KonflikDosen_{d_id}_{hari}_{problem.tick_minute(tick)}",
+                                       overlapping_sessions_dosen, 1)
+
+        # Jumlah sesi per mata kuliah paling banyak target (kekurangannya dilaporkan sebagai sesi gagal)
+        for mk_id in range(len(problem.matakuliah)):
+            jumlah_sesi_mk = problem.course_jumlah_sesi[mk_id]
+            if jumlah_sesi_mk == 0:
+                continue
+            prob += lpSum(self.course_vars.get(mk_id, [])) <= jumlah_sesi_mk, \
+                    f"Jumlah_Sesi_Mk_{mk_id}_Maks_Target"
+
+        return prob
+
+    def _match_rooms(self, time_limit=None):
+        """
+        Tahap 2: memberi ruangan untuk waktu yang dipilih tahap 1, per hari. Sesi dikelompokkan per blok
+        (hari, mulai) lalu dicocokkan (bipartite, augmenting path) dengan ruangan yang muat dan masih
+        kosong sepanjang durasinya; ruangan terkecil dicoba lebih dulu. Jika ada sesi yang tidak
+        kebagian ruangan, hari itu dicocokkan ulang secara eksak (_match_day_exact) karena blok yang
+        saling tumpang tindih berebut ruangan yang sama. Mengembalikan hari yang tetap punya sesi
+        tanpa ruangan.
+        """
+        problem = self.problem
+        days = defaultdict(list)
+        scheduled_count_per_mk = [0] * len(problem.matakuliah)
+        for key in self.y_keys:
+            if self.y[key].varValue is not None and self.y[key].varValue > 0.5:
+                mk_id, hari, start_min = key
+                session = problem.sessions[problem.sessions_by_course[mk_id][scheduled_count_per_mk[mk_id]]]
+                scheduled_count_per_mk[mk_id] += 1
+                days[hari].append((start_min, session))
+        self._timed_per_course = scheduled_count_per_mk
+
+        unmatched = []
+        for hari in sorted(days):
+            timed = sorted(days[hari], key=lambda item: (item[0], item[1].idx))
+            placed = self._match_day_greedy(hari, timed)
+            if len(placed) < len(timed):
+                exact = self._match_day_exact(hari, timed, time_limit)
+                if len(exact) > len(placed):
+                    placed = exact
+                if len(placed) < len(timed):
+                    unmatched.append(hari)
+
+            for i, (start_min, session) in enumerate(timed):
+                r_id = placed.get(i)
+                if r_id is None:
+                    self.failed_sessions.append(problem.failed_entry(
+                        session, "Tidak ada ruangan kosong yang muat pada waktu yang dipilih ILP tahap 1."))
+                    continue
+                self.jadwal.append(problem.schedule_entry(session, hari, start_min, r_id))
+        return unmatched
+
+    def _match_day_greedy(self, hari, timed):
+        """Pencocokan per blok (hari, mulai) secara kronologis. Mengembalikan {indeks sesi: ruangan}."""
+        problem = self.problem
+        used_rooms = OccupancyGrid(len(problem.days), len(problem.room_ids))
+        placed = {}
+        i = 0
+        while i < len(timed):
+            start_min = timed[i][0]
+            block = []
+            while i < len(timed) and timed[i][0] == start_min:
+                block.append(i)
+                i += 1
+
+            masks = [problem.tick_mask(start_min, start_min + timed[j][1].durasi) for j in block]
+            options = []
+            for j, mask in zip(block, masks):
+                rooms = [r for r in problem.rooms_fitting(timed[j][1].peserta) if used_rooms.is_free(hari, r, mask)]
+                rooms.sort(key=lambda r: problem.room_caps[r])
+                options.append(rooms)
+
+            room_owner = {}
+
+            def augment(k, seen):
+                for r in options[k]:
+                    if r in seen:
+                        continue
+                    seen.add(r)
+                    if r not in room_owner or augment(room_owner[r], seen):
+                        room_owner[r] = k
+                        return True
+                return False
+
+            for k in range(len(block)):
+                augment(k, set())
+
+            for r_id, k in room_owner.items():
+                used_rooms.mark(hari, r_id, masks[k])
+                placed[block[k]] = r_id
+        return placed
+
+    def _match_day_exact(self, hari, timed, time_limit=None):
+        """
+        Pencocokan ruangan eksak untuk satu hari: ILP kecil (sesi x ruangan yang muat) dengan kendala
+        satu sesi per ruangan per tick, memaksimalkan sesi yang mendapat ruangan.
+        """
+        problem = self.problem
+        prob = LpProblem(f"Pencocokan_Ruangan_{hari}", LpMaximize)
+        z = {}
+        room_ticks = defaultdict(list)
+        for i, (start_min, session) in enumerate(timed):
+            tick_start, tick_end = problem.tick_range(start_min, start_min + session.durasi)
+            for r in problem.rooms_fitting(session.peserta):
+                z[(i, r)] = LpVariable(f"z_{i}_{r}", 0, 1, 'Binary')
+                for tick in range(tick_start, tick_end):
+                    room_ticks[(r, tick)].append(z[(i, r)])
+        prob += lpSum(z.values()), "Sesi Mendapat Ruangan"
+        for i in range(len(timed)):
+            prob += lpSum(var for (j, _), var in z.items() if j == i) <= 1, f"Satu_Ruangan_{i}"
+        for (r, tick), variables in room_ticks.items():
+            if len(variables) > 1:
+                prob += lpSum(variables) <= 1, f"Ruangan_{r}_{tick}"
+
+        has_solution, _ = self._run_solver(prob, time_limit, warm_start=False)
+        if not has_solution:
+            return {}
+        return {i: r for (i, r), var in z.items() if var.varValue is not None and var.varValue > 0.5}
+
+    def _solve_two_stage(self, prob, variables):
+        """
+        Tahap 1 lalu tahap 2. Hari yang tidak bisa diberi ruangan mendapat no-good cut atas kombinasi
+        waktu yang dipilih untuk hari itu (ruangan tiap hari independen), lalu tahap 1 diselesaikan
+        ulang. Jika anggaran waktu/putaran habis, hasil terbaik yang sudah dicocokkan dipakai dan
+        objective/status diturunkan dari sesi yang benar-benar mendapat ruangan.
+        """
+        solve_start = time.time()
+        rounds = 0
+        best = None
+        while True:
+            remaining = None
+            if self.time_limit is not None:
+                remaining = self.time_limit - (time.time() - solve_start)
+                if remaining <= 0 and best is not None:
+                    best[3]["time_limit_hit"] = True
+                    break
+                remaining = max(remaining, 1)
+            if self.lazy:
+                has_solution, solver_info = self._solve_lazy(prob, variables, remaining)
+            else:
+                has_solution, solver_info = self._run_solver(prob, remaining)
+            rounds += 1
+            if not has_solution:
+                if best is not None:
+                    best[3]["time_limit_hit"] = best[3]["time_limit_hit"] or solver_info["time_limit_hit"]
+                break
+
+            self.jadwal, self.failed_sessions = [], []
+            room_limit = None if self.time_limit is None else max(self.time_limit - (time.time() - solve_start), 1)
+            unmatched = self._match_rooms(room_limit)
+            if best is None or len(self.jadwal) > len(best[0]):
+                best = (self.jadwal, self.failed_sessions, self._timed_per_course, solver_info)
+            if not unmatched or rounds >= self.max_room_rounds:
+                break
+            for hari in unmatched:
+                chosen = [self.y[key] for key in self.y_keys
+                          if key[1] == hari and self.y[key].varValue is not None and self.y[key].varValue > 0.5]
+                prob += lpSum(chosen) <= len(chosen) - 1, f"NoGood_Ruangan_{hari}_{rounds}"
+
+        if best is None:
+            solver_info["room_rounds"] = rounds
+            return has_solution, solver_info
+
+        self.jadwal, self.failed_sessions, self._timed_per_course, solver_info = best
+        if len(self.jadwal) < sum(self._timed_per_course):
+            # Sebagian sesi yang sudah diberi waktu tidak mendapat ruangan: objective tahap 1 tidak
+            # tercapai. Bound tahap 1 tetap batas atas yang valid.
+            objective = len(self.jadwal)
+            bound = solver_info.get("best_bound")
+            solver_info["objective"] = objective
+            solver_info["solver_status"] = LpStatus[LpStatusNotSolved]
+            solver_info["solution_status"] = LpSolution[LpSolutionIntegerFeasible]
+            solver_info["gap"] = (bound - objective) / abs(bound) if bound else None
+        solver_info["room_rounds"] = rounds
+        solver_info["room_unmatched"] = sum(self._timed_per_course) - len(self.jadwal)
+        return True, solver_info
+
+    def set_warm_start(self, schedule):
+        """
+        Menyimpan jadwal awal untuk MIP start. `schedule` boleh berupa list entri jadwal
+        atau dict hasil solve() scheduler lain ({'schedule': [...], 'stats': {...}}).
+        """
+        if isinstance(schedule, dict):
+            schedule = schedule.get('schedule')
+        self.warm_start = list(schedule) if schedule else None
+
+    def _apply_warm_start(self):
+        """
+        Mengisi nilai awal variabel dari self.warm_start. Entri yang tidak punya variabel padanan
+        (nama tidak dikenal, ruangan tidak muat, dll.) dilewati. Mengembalikan jumlah variabel bernilai 1.
+        """
+        problem = self.problem
+        if self.mode == MODE_TWO_STAGE:
+            variables = self.y
+        else:
+            variables = self.x
+
+        chosen = set()
+        for s, hari, start_min, r_id in problem.assignment_from_schedule(self.warm_start):
+            c = problem.sessions[s].course
+            if self.mode == MODE_TWO_STAGE:
+                key = (c, hari, start_min)
+            else:
+                key = (c, problem.course_lecturer[c], r_id, hari, start_min)
+            if key in variables:
+                chosen.add(key)
+
+        for key, var in variables.items():
+            var.setInitialValue(1 if key in chosen else 0)
+        return len(chosen)
+
+    def _make_solver(self, log_path, time_limit=None, warm_start=False):
+        """
+        Membuat objek solver PuLP sesuai pilihan. Hanya opsi yang didukung konstruktor backend
+        tersebut yang diteruskan (mis. GLPK_CMD tidak mengenal gapRel/threads).
+        """
+        available = pulp.listSolvers(onlyAvailable=True)
+        if self.solver not in available:
+            raise ValueError(f"Solver '{self.solver}' tidak tersedia. Pilihan yang tersedia: {', '.join(available)}")
+
+        # Output solver diarahkan ke log (lalu dicetak ulang oleh _run_solver jika msg=True)
+        options = {
+            "msg": False,
+            "timeLimit": time_limit,
+            "gapRel": self.gap_rel,
+            "threads": self.threads,
+            "warmStart": warm_start,
+            "logPath": log_path,
+        }
+        solver_class = getattr(pulp, self.solver)
+        accepted = inspect.signature(solver_class.__init__).parameters
+        return solver_class(**{k: v for k, v in options.items() if v is not None and k in accepted})
+
+    @staticmethod
+    def _parse_cbc_log(log_path):
+        """
+        Membaca ringkasan akhir log CBC: bound terbaik, gap, jumlah node, apakah batas waktu tercapai,
+        dan apakah MIP start dipakai (None jika tidak ada MIP start).
+        """
+        info = {"best_bound": None, "gap": None, "nodes": None, "time_limit_hit": False, "mip_start_accepted": None}
+        if not log_path or not os.path.exists(log_path):
+            return info
+        with open(log_path, encoding="utf-8", errors="replace") as f:
+            log = f.read()
+
+        match = re.search(r"^(?:Upper|Lower) bound:\s+(\S+)", log, re.MULTILINE)
+        if match:
+            info["best_bound"] = float(match.group(1))
+        match = re.search(r"^Gap:\s+(\S+)", log, re.MULTILINE)
+        if match:
+            info["gap"] = float(match.group(1))
+        match = re.search(r"^Enumerated nodes:\s+(\d+)", log, re.MULTILINE)
+        if match:
+            info["nodes"] = int(match.group(1))
+        info["time_limit_hit"] = "Stopped on time limit" in log or "Exiting on maximum time" in log
+        if "MIPStart values read" in log:
+            # CBC menolak start yang tidak layak ("mipstart values could not be used")
+            info["mip_start_accepted"] = "MIPStart provided solution" in log
+        return info
+
+    def _run_solver(self, prob, time_limit=None, warm_start=None):
+        """
+        Menjalankan solver dengan anggaran yang dikonfigurasi. Mengembalikan info solver
+        (status, status solusi, objective, bound, gap, node, batas waktu) untuk stats.
+        """
+        fd, log_path = tempfile.mkstemp(prefix="ilp_", suffix=".log")
+        os.close(fd)
+        solve_start = time.time()
+        try:
+            try:
+                if warm_start is None:
+                    warm_start = bool(self.warm_start)
+                prob.solve(self._make_solver(log_path, time_limit, warm_start))
+            except PulpSolverError:
+                # CBC bisa berhenti tanpa menulis file solusi jika batas waktu habis sangat awal
+                if time_limit is None:
+                    raise
+                prob.status = 0
+                prob.sol_status = 0
+            if self.msg and os.path.exists(log_path):
+                with open(log_path, encoding="utf-8", errors="replace") as f:
+                    print(f.read())
+            info = self._parse_cbc_log(log_path) if self.solver in ("PULP_CBC_CMD", "COIN_CMD") else \
+                {"best_bound": None, "gap": None, "nodes": None, "time_limit_hit": False, "mip_start_accepted": None}
+        finally:
+            os.remove(log_path)
+
+        elapsed = time.time() - solve_start
+        if time_limit is not None and elapsed >= time_limit and prob.sol_status != LpSolutionOptimal:
+            info["time_limit_hit"] = True
+
+        has_solution = prob.sol_status in (LpSolutionOptimal, LpSolutionIntegerFeasible)
+        info["solver"] = self.solver
+        info["solver_status"] = LpStatus[prob.status]
+        info["solution_status"] = LpSolution[prob.sol_status]
+        info["objective"] = value(prob.objective) if has_solution else None
+        if warm_start and self.warm_start and self.warm_start_accepted is None:
+            # Hanya solve pertama yang memakai jadwal awal; putaran berikutnya memakai solusi sendiri
+            self.warm_start_accepted = info["mip_start_accepted"]
+        if prob.sol_status == LpSolutionOptimal:
+            # Solusi optimal terbukti: bound sama dengan objective
+            if info["gap"] is None:
+                info["gap"] = 0.0
+            if info["best_bound"] is None:
+                info["best_bound"] = info["objective"]
+        return has_solution, info
+
+    def components(self):
+        """
+        Memecah mata kuliah menjadi komponen terhubung pada graf interaksi mata kuliah-dosen-ruangan
+        (mata kuliah terhubung ke dosennya dan ke semua ruangan yang muat). Mata kuliah dari komponen
+        berbeda tidak pernah berebut dosen maupun ruangan, jadi bisa dijadwalkan secara independen.
+        Mengembalikan list indeks mata kuliah per komponen, komponen terbesar lebih dulu.
+        """
+        problem = self.problem
+        n_courses = len(problem.matakuliah)
+        lecturer_node = n_courses
+        room_node = lecturer_node + len(problem.lecturer_ids)
+        parent = list(range(room_node + len(problem.room_ids)))
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        def union(a, b):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        for c in range(n_courses):
+            # Mata kuliah tanpa sesi tidak punya variabel, jadi tidak berinteraksi dengan siapa pun
+            if problem.course_jumlah_sesi[c] == 0 or problem.course_durasi[c] == 0:
+                continue
+            union(c, lecturer_node + problem.course_lecturer[c])
+            for r in problem.rooms_fitting(problem.course_peserta[c]):
+                union(c, room_node + r)
+
+        groups = defaultdict(list)
+        for c in range(n_courses):
+            groups[find(c)].append(c)
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def _solve_decomposed(self, start_time):
+        """
+        Menyelesaikan setiap komponen sebagai ILP tersendiri lalu menggabungkan hasilnya. Semua komponen
+        berbagi satu tenggat (`time_limit` dihitung dari start_time); lihat _solve_component.
+        """
+        problem = self.problem
+        instr = self.instr
+        with instr.phase("decompose"):
+            components = self.components()
+        options = {
+            "mode": self.mode, "warm_start": self.warm_start, "time_limit": None,
+            "gap_rel": self.gap_rel, "threads": self.threads, "solver": self.solver, "msg": self.msg,
+            "lazy": self.lazy, "lazy_seed": self.lazy_seed, "max_lazy_rounds": self.max_lazy_rounds,
+        }
+        # Komponen tanpa sesi sama sekali tidak perlu dikirim ke solver
+        components = [component for component in components
+                      if any(problem.course_jumlah_sesi[c] for c in component)]
+        workers = min(self.workers, len(components)) if self.workers > 1 else 1
+        deadline = start_time + self.time_limit if self.time_limit is not None else None
+        with instr.phase("decompose"):
+            # Komponen ke-i mulai kira-kira pada gelombang ke-(i // workers); sisa gelombang menentukan
+            # bagian waktunya dari sisa anggaran
+            jobs = [(problem.subset(component), options, deadline, math.ceil((len(components) - i) / workers))
+                    for i, component in enumerate(components)]
+
+        with instr.phase("solve_components"):
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(_solve_component, jobs))
+            else:
+                results = [_solve_component(job) for job in jobs]
+        # Counter komponen dijumlahkan (n_variables, n_constraints, nodes, ...)
+        for result in results:
+            for name, count in result['stats']['counters'].items():
+                instr.count(name, count)
+
+        schedule = []
+        for result in results:
+            schedule.extend(result['schedule'])
+        sorted_final_schedule = sorted(schedule, key=lambda x: (self.urutan_hari.get(x["hari"], 99), utils.time_to_minutes(x["jam_mulai"]), x["matakuliah"]))
+
+        part_stats = [result['stats'] for result in results]
+        statuses = [st['solver_status'] for st in part_stats]
+        gaps = [st['gap'] for st in part_stats]
+        stats_data = {
+            "total_slots_attempted": sum(st['total_slots_attempted'] for st in part_stats),
+            "scheduled_slots": len(sorted_final_schedule),
+            "conflicts": sum(st['conflicts'] for st in part_stats),
+            "failed_details": [item for st in part_stats for item in st['failed_details']],
+            "execution_time": time.time() - start_time,
+            # Build/solve time dijumlahkan dari semua komponen (bisa melebihi waktu eksekusi jika paralel)
+            "build_time": sum(st['build_time'] for st in part_stats),
+            "solve_time": sum(st['solve_time'] for st in part_stats),
+            "mode": self.mode,
+            "n_variables": sum(st['n_variables'] for st in part_stats),
+            "n_constraints": sum(st['n_constraints'] for st in part_stats),
+            "warm_start_vars": sum(st['warm_start_vars'] for st in part_stats),
+            "warm_start_accepted": None if all(st['warm_start_accepted'] is None for st in part_stats)
+                                   else all(st['warm_start_accepted'] is not False for st in part_stats),
+            "solver": self.solver,
+            "solver_status": next((status for status in statuses if status != "Optimal"), "Optimal"),
+            "component_status": statuses,
+            # Komponen tanpa solusi membuat objective gabungan tidak terdefinisi
+            "objective": None if any(st['objective'] is None for st in part_stats)
+                         else sum(st['objective'] for st in part_stats),
+            "gap": None if any(gap is None for gap in gaps) else max(gaps, default=0.0),
+            "nodes": sum(st['nodes'] or 0 for st in part_stats),
+            "time_limit_hit": any(st['time_limit_hit'] for st in part_stats),
+            "components": len(components),
+            "largest_component": len(components[0]) if components else 0,
+        }
+        instr.merge_into(stats_data)
+        return {
+            'schedule': sorted_final_schedule,
+            'stats': stats_data
+        }
+
+    def _occupancy(self):
+        """OccupancyGrid ruangan dan dosen dari jadwal yang sudah diekstrak, untuk kode alasan kegagalan."""
+        problem = self.problem
+        used_rooms = OccupancyGrid(len(problem.days), len(problem.room_ids))
+        used_dosen = OccupancyGrid(len(problem.days), len(problem.lecturer_ids))
+        for s, hari, mulai, ruang in problem.assignment_from_schedule(self.jadwal):
+            session = problem.sessions[s]
+            mask = problem.tick_mask(mulai, mulai + session.durasi)
+            used_rooms.mark(hari, ruang, mask)
+            used_dosen.mark(hari, session.lecturer, mask)
+        return used_rooms, used_dosen
+
+    def _extract_full(self):
+        """Membangun jadwal dari variabel x model penuh."""
+        problem = self.problem
+        scheduled_count_per_mk = [0] * len(problem.matakuliah)
+
+        for key in self.x_keys:
+            if self.x[key].varValue is not None and self.x[key].varValue > 0.5:
+                mk_id, dosen_id, r_id, hari, start_min = key
+
+                # Assign dynamic session number by taking the course's sessions in order
+                session = problem.sessions[problem.sessions_by_course[mk_id][scheduled_count_per_mk[mk_id]]]
+                scheduled_count_per_mk[mk_id] += 1
+                self.jadwal.append(problem.schedule_entry(session, hari, start_min, r_id))
+        return scheduled_count_per_mk
+
+    def solve(self):
+        start_time = time.time()
+        problem = self.problem
+
+        if self.decompose:
+            return self._solve_decomposed(start_time)
+
+        instr = self.instr
+        with instr.phase("build_model"):
+            if self.mode == MODE_TWO_STAGE:
+                prob = self.build_time_model()
+                variables = list(self.y.values())
+            else:
+                prob = self.build_model()
+                variables = list(self.x.values())
+            lazy_seeded = self._seed_lazy_rows(prob) if self.lazy else 0
+        with instr.phase("warm_start"):
+            warm_start_vars = self._apply_warm_start() if self.warm_start else 0
+            self.warm_start_accepted = None
+        build_end_time = time.time()
+
+        # 5. Solve the Problem (CBC menerima nilai awal variabel sebagai MIP start)
+        with instr.phase("solve"):
+            if self.mode == MODE_TWO_STAGE:
+                has_solution, solver_info = self._solve_two_stage(prob, variables)
+            elif self.lazy:
+                has_solution, solver_info = self._solve_lazy(prob, variables, self.time_limit)
+            else:
+                has_solution, solver_info = self._run_solver(prob, self.time_limit)
+
+            if self.lazy:
+                solver_info["lazy_rows_seeded"] = lazy_seeded
+
+        solve_end_time = time.time()
 
         # 6. Interpret Results
-        final_status = LpStatus[prob.status]
+        # An integer-feasible incumbent (e.g. when the time limit is hit) is used as well
+        final_status = solver_info["solver_status"]
         
-        if final_status == "Optimal" or final_status == "Feasible":
-            print(f"ILP Solver Status: {final_status}. Solution found.")
+        if has_solution:
+            print(f"ILP Solver Status: {final_status}. Solution found (gap: {solver_info['gap']}).")
             
             # Reconstruct scheduled sessions
-            scheduled_count_per_mk = {mk_id: 0 for mk_id in self.mk_dict}
+            with instr.phase("extract"):
+                if self.mode == MODE_TWO_STAGE:
+                    # Ruangan sudah dicocokkan di dalam _solve_two_stage
+                    timed_per_course = self._timed_per_course
+                else:
+                    timed_per_course = self._extract_full()
 
-            for key in self.x_keys:
-                if self.x[key].varValue == 1:
-                    mk_id, dosen_id, r_id, hari, start_min = key
-                    mk = self.mk_dict[mk_id]
-                    
-                    durasi = utils.sks_to_minutes(mk["sks"])
-                    jam_selesai_sesi = start_min + durasi
-
-                    total_peserta = mk["jumlah_mahasiswa"]
-                    kapasitas_max_ruangan = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-                    jumlah_sesi_mk_calc = (total_peserta + kapasitas_max_ruangan - 1) // kapasitas_max_ruangan if total_peserta > 0 else 0
-                    peserta_per_sesi = (total_peserta + jumlah_sesi_mk_calc - 1) // jumlah_sesi_mk_calc if jumlah_sesi_mk_calc > 0 else total_peserta
-
-                    scheduled_count_per_mk[mk_id] += 1
-                    self.jadwal.append({
-                        "matakuliah": mk["nama"],
-                        "dosen": utils.get_dosen_name(dosen_id, self.dosen),
-                        "ruangan": self.ruangan_dict[r_id]["nama"],
-                        "hari": hari,
-                        "jam_mulai": utils.minutes_to_time(start_min),
-                        "jam_selesai": utils.minutes_to_time(jam_selesai_sesi),
-                        "jumlah_mahasiswa": peserta_per_sesi,
-                        "sesi": scheduled_count_per_mk[mk_id] # Assign dynamic session number
-                    })
-            
-            # If Optimal/Feasible, all required sessions (based on Constraint 5) were scheduled.
-            # So, self.failed_sessions remains empty in this case.
+            # Sessions the model left without a time. In lazy mode a budget that ran out before the
+            # remaining conflicts were cut off explains them; otherwise the usual reason codes are
+            # computed against the final schedule.
+            lazy_budget_hit = self.lazy and (solver_info["time_limit_hit"] or solver_info.get("lazy_dropped"))
+            used_rooms = used_dosen = None
+            for mk_id, timed in enumerate(timed_per_course):
+                for s in problem.sessions_by_course[mk_id][timed:]:
+                    session = problem.sessions[s]
+                    if lazy_budget_hit:
+                        self.failed_sessions.append(problem.failed_entry(
+                            session, "Konflik belum terselesaikan ketika anggaran ILP lazy habis."))
+                        continue
+                    if used_rooms is None:
+                        used_rooms, used_dosen = self._occupancy()
+                    self.failed_sessions.append(problem.failed_entry(
+                        session, reason_codes=problem.failure_reasons(session, used_rooms, used_dosen)))
             
         else: # Solver Status is Not Solved, Infeasible, Unbounded, etc.
             print(f"ILP Solver Status: {final_status}. No optimal or feasible solution found.")
             # If no feasible solution, all initially attempted sessions are considered failed.
             reason_for_failure = f"Sistem Penjadwalan ILP tidak dapat menemukan solusi yang memenuhi semua kendala ({final_status}). Mungkin karena batasan yang terlalu ketat atau data input yang tidak memungkinkan."
             
-            for mk_id in self.mk_dict:
-                mk = self.mk_dict[mk_id]
-                dosen_id = mk["dosen_id"]
-                total_peserta = mk["jumlah_mahasiswa"]
-                kapasitas_max_ruangan = max(r["kapasitas"] for r in self.ruangan) if self.ruangan else 1
-                jumlah_sesi_mk = (total_peserta + kapasitas_max_ruangan - 1) // kapasitas_max_ruangan if total_peserta > 0 else 0
-                peserta_per_sesi = (total_peserta + jumlah_sesi_mk - 1) // jumlah_sesi_mk if jumlah_sesi_mk > 0 else 0
-                
+            for session in problem.sessions:
                 # Add only sessions that were "expected" but couldn't be scheduled by the solver
-                if jumlah_sesi_mk > 0: # Only add if the course actually needed sessions
-                    for sesi_ke_num in range(1, jumlah_sesi_mk + 1):
-                        self.failed_sessions.append({
-                            "matakuliah": mk["nama"],
-                            "dosen": utils.get_dosen_name(dosen_id, self.dosen),
-                            "jumlah_mahasiswa": peserta_per_sesi,
-                            "sesi": sesi_ke_num,
-                            "reason": reason_for_failure # Assign the overarching reason for ILP failure
-                        })
+                self.failed_sessions.append(problem.failed_entry(session, reason_for_failure)) # Assign the overarching reason for ILP failure
         
+        end_time = time.time()
+
         # Sort the final schedule for consistent output
         sorted_final_schedule = sorted(self.jadwal, key=lambda x: (self.urutan_hari.get(x["hari"], 99), utils.time_to_minutes(x["jam_mulai"]), x["matakuliah"]))
         
         # Calculate statistics
         stats_data = self.calculate_stats()
         stats_data['execution_time'] = end_time - start_time
+        stats_data['build_time'] = build_end_time - start_time # Model construction only
+        stats_data['solve_time'] = solve_end_time - build_end_time # Solver only
+        stats_data['mode'] = self.mode
+        stats_data['warm_start_vars'] = warm_start_vars
+        stats_data['warm_start_accepted'] = self.warm_start_accepted
+        stats_data.update(solver_info)
+        stats_data['n_variables'] = prob.numVariables()
+        stats_data['n_constraints'] = prob.numConstraints()
+        instr.count("n_variables", stats_data['n_variables'])
+        instr.count("n_constraints", stats_data['n_constraints'])
+        instr.count("warm_start_vars", warm_start_vars)
+        instr.count("bb_nodes", solver_info.get("nodes") or 0)
+        if self.lazy:
+            instr.count("lazy_rounds", solver_info.get("lazy_rounds", 0))
+        instr.merge_into(stats_data)
 
         # *** THIS IS THE CRITICAL FIX ***
         # Return a dictionary containing both 'schedule' and 'stats' as top-level keys
@@ -267,4 +952,14 @@ class ILPScheduler:
             "scheduled_slots": len(self.jadwal),
             "conflicts": conflicts,
             "failed_details": self.failed_sessions
-        }
\ No newline at end of file
+        }
+
+def _solve_component(job):
+    """
+    Worker process pool: menyelesaikan satu komponen sebagai ILP biasa. Batas waktunya adalah bagian
+    yang sama dari sisa waktu sampai `deadline` untuk setiap gelombang komponen yang belum berjalan.
+    """
+    sub_problem, options, deadline, waves_left = job
+    if deadline is not None:
+        options = dict(options, time_limit=max((deadline - time.time()) / waves_left, 1))
+    return ILPScheduler(sub_problem, **options).solve()
@@ -0,0 +1,110 @@
+# algoritma/instrumentation.py
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+MB = 1024 * 1024
+
+# Puncak memori per fase memakai tracemalloc.reset_peak(), yang berlaku untuk seluruh proses.
+# Karena itu status pelacakan disimpan di level modul agar Instrumentation bersarang (mis. sub-ILP
+# per komponen) tidak saling menghapus puncak: _memory_frames berisi puncak fase yang sedang
+# terbuka, _memory_peak puncak tertinggi yang sudah terhapus oleh reset_peak().
+_memory_frames = []
+_memory_peak = 0
+
+
+def start_memory_tracing():
+    """Memulai tracemalloc dari nol; selama aktif, setiap fase Instrumentation ikut mencatat puncak memori."""
+    global _memory_peak
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _memory_frames.clear()
+    _memory_peak = 0
+    tracemalloc.start()
+
+
+def traced_peak_memory():
+    """Puncak memori (byte) sejak start_memory_tracing(), atau None jika tracemalloc tidak aktif."""
+    if not tracemalloc.is_tracing():
+        return None
+    return max(_memory_peak, tracemalloc.get_traced_memory()[1])
+
+
+def stop_memory_tracing():
+    """Menghentikan tracemalloc dan mengembalikan puncak memori (byte), atau None jika tidak aktif."""
+    peak = traced_peak_memory()
+    if peak is not None:
+        tracemalloc.stop()
+    return peak
+
+
+def _enter_memory_frame():
+    global _memory_peak
+    current, peak = tracemalloc.get_traced_memory()
+    if _memory_frames:
+        _memory_frames[-1] = max(_memory_frames[-1], peak)
+    _memory_peak = max(_memory_peak, peak)
+    tracemalloc.reset_peak()
+    _memory_frames.append(current)
+
+
+def _exit_memory_frame():
+    peak = max(_memory_frames.pop(), tracemalloc.get_traced_memory()[1])
+    if _memory_frames:
+        _memory_frames[-1] = max(_memory_frames[-1], peak)
+    return peak
+
+
+class Instrumentation:
+    """
+    Pencatat ringan untuk timer per fase dan counter bernama di dalam satu `solve()`.
+
+    Fase dengan nama yang sama dijumlahkan (boleh dipanggil berulang di dalam loop), urutannya
+    mengikuti kemunculan pertama. Fase boleh bersarang; waktu fase anak juga termasuk di induknya.
+    Counter di loop panas sebaiknya dijumlahkan di variabel lokal lalu dicatat sekali lewat
+    `count()`. Hasilnya digabung ke dict stats lewat `merge_into()`.
+
+    Jika tracemalloc aktif (lihat `start_memory_tracing()`), setiap fase juga mencatat puncak memori
+    yang dilacak selama fase tersebut. Memori proses anak (solver CBC, process pool) tidak terlacak.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.phase_memory = {}
+
+    @contextmanager
+    def phase(self, name):
+        self.phases.setdefault(name, 0.0)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            _enter_memory_frame()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+            if tracing and tracemalloc.is_tracing():
+                peak = _exit_memory_frame()
+                self.phase_memory[name] = max(self.phase_memory.get(name, 0), peak)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name, value):
+        self.counters[name] = value
+
+    def merge_into(self, stats):
+        """
+        Menambahkan `phase_times` (detik per fase) dan `counters` ke `stats`, lalu mengembalikannya.
+        Saat tracemalloc aktif juga `peak_memory_mb` (puncak sejak pelacakan dimulai) dan
+        `phase_memory_mb` (puncak per fase).
+        """
+        stats['phase_times'] = dict(self.phases)
+        stats['counters'] = dict(self.counters)
+        peak = traced_peak_memory()
+        if peak is not None:
+            stats['peak_memory_mb'] = peak / MB
+            stats['phase_memory_mb'] = {name: value / MB for name, value in self.phase_memory.items()}
+        return stats
@@ -0,0 +1,192 @@
+# algoritma/occupancy.py
+
+from bisect import bisect_right
+
+def span_mask(t0, t1):
+    """Bitmask dengan bit [t0, t1) menyala (satu bit per tick)."""
+    if t1 <= t0:
+        return 0
+    return ((1 << (t1 - t0)) - 1) << t0
+
+
+class OccupancyGrid:
+    """
+    Mesin okupansi berbasis bitset: satu integer per (hari, sumber daya), di mana bit ke-t
+    menyala jika sumber daya terpakai pada tick ke-t.
+
+    Cek "apakah rentang ini kosong" dan "tandai rentang ini" masing-masing hanya satu
+    operasi AND/OR, sehingga biayanya tidak bergantung pada kepadatan jadwal.
+    """
+
+    def __init__(self, n_days, n_resources):
+        self.masks = [[0] * n_resources for _ in range(n_days)]
+
+    def is_free(self, day, resource, mask):
+        """True jika tidak ada tick pada `mask` yang sudah terpakai."""
+        return not (self.masks[day][resource] & mask)
+
+    def mark(self, day, resource, mask):
+        """Menandai semua tick pada `mask` sebagai terpakai."""
+        self.masks[day][resource] |= mask
+
+    def unmark(self, day, resource, mask):
+        """Membebaskan kembali semua tick pada `mask`."""
+        self.masks[day][resource] &= ~mask
+
+    def busy(self, day, resource):
+        """Bitmask tick yang sudah terpakai untuk (hari, sumber daya)."""
+        return self.masks[day][resource]
+
+
+def run_starts(free, n_ticks):
+    """
+    Bitmask tick mulai t sehingga tick [t, t + n_ticks) semuanya menyala pada `free`.
+    Panjang run digandakan tiap langkah, jadi cukup O(log n_ticks) operasi shift/AND.
+    """
+    runs = free
+    k = 1
+    while k < n_ticks and runs:
+        step = min(k, n_ticks - k)
+        runs &= runs >> step
+        k += step
+    return runs
+
+
+def earliest_free_start(busy, t0, t1, n_ticks, starts=None):
+    """
+    Tick mulai paling awal di [t0, t1) sehingga `n_ticks` tick berturut-turut tidak
+    menyentuh bit pada `busy` dan tetap berada di dalam [t0, t1). Jika `starts` diberikan,
+    hanya tick yang bitnya menyala di sana yang boleh menjadi tick mulai. None jika tidak ada.
+    """
+    if n_ticks > t1 - t0:
+        return None
+    runs = run_starts(span_mask(t0, t1) & ~busy, n_ticks)
+    if starts is not None:
+        runs &= starts
+    if not runs:
+        return None
+    return (runs & -runs).bit_length() - 1
+
+
+class _GapTree:
+    """
+    Segment tree maksimum atas tick mulai satu jendela [base, base + length): daun t berisi panjang
+    celah yang dimulai di tick t (0 jika tidak ada). Ukurannya tetap, jadi memecah/menghapus celah
+    cukup update titik O(log W), dan celah paling kiri yang cukup panjang ditemukan dalam O(log W).
+    """
+
+    def __init__(self, base, length):
+        self.base = base
+        self.size = 1 << max(length - 1, 0).bit_length()
+        self.tree = [0] * (2 * self.size)
+
+    def set(self, tick, gap_length):
+        i = tick - self.base + self.size
+        self.tree[i] = gap_length
+        i >>= 1
+        while i:
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+            i >>= 1
+
+    def length_at(self, tick):
+        return self.tree[tick - self.base + self.size]
+
+    def first_at_least(self, need, lo):
+        """Tick mulai paling kiri >= `lo` dengan celah sepanjang >= `need`, atau None."""
+        return self._find(1, 0, self.size, need, lo - self.base)
+
+    def _find(self, node, left, right, need, lo):
+        if right <= lo or self.tree[node] < need:
+            return None
+        if right - left == 1:
+            return self.base + left
+        mid = (left + right) // 2
+        found = self._find(2 * node, left, mid, need, lo)
+        if found is None:
+            found = self._find(2 * node + 1, mid, right, need, lo)
+        return found
+
+
+class FreeIntervalIndex:
+    """
+    Indeks celah kosong per (ruangan, hari). Untuk setiap jendela slot pada hari tersebut
+    disimpan daftar celah (t0, t1) yang terurut dan saling lepas (untuk bisect saat `occupy`)
+    serta `_GapTree` atas panjang celah, sehingga celah paling awal yang cukup panjang ditemukan
+    dalam O(log W) tanpa memindai celah yang terlalu pendek. Tick mulai dibatasi pada tick mulai
+    jendela (`ProblemInstance.window_start_mask`), jadi hasilnya sama dengan menelusuri `starts`.
+    """
+
+    def __init__(self, problem):
+        # Sesi harus berada utuh di dalam satu jendela slot, jadi celah awal = jendela slot (dalam tick)
+        self.windows = []
+        for day_windows in problem.windows:
+            self.windows.append([(problem.tick_of(start), problem.tick_of(end)) for start, end in day_windows])
+
+        # start_masks[d][w]: tick mulai yang diizinkan pada jendela w, atau None jika setiap tick boleh
+        self.start_masks = []
+        for day_windows in problem.windows:
+            self.start_masks.append([problem.window_start_mask(start, end, 1) if problem.start_stride > 1 else None
+                                     for start, end in day_windows])
+
+        # gap_starts[r][d][w] / gap_ends[r][d][w]: batas celah terurut untuk bisect,
+        # gap_trees[r][d][w]: panjang celah per tick mulai untuk earliest_fit
+        self.gap_starts = []
+        self.gap_ends = []
+        self.gap_trees = []
+        for _ in problem.room_ids:
+            self.gap_starts.append([[[t0] if t0 < t1 else [] for t0, t1 in day_windows] for day_windows in self.windows])
+            self.gap_ends.append([[[t1] if t0 < t1 else [] for t0, t1 in day_windows] for day_windows in self.windows])
+            room_trees = []
+            for day_windows in self.windows:
+                day_trees = []
+                for t0, t1 in day_windows:
+                    tree = _GapTree(t0, max(t1 - t0, 1))
+                    if t0 < t1:
+                        tree.set(t0, t1 - t0)
+                    day_trees.append(tree)
+                room_trees.append(day_trees)
+            self.gap_trees.append(room_trees)
+
+    def occupy(self, room, day, t0, t1):
+        """Menghapus rentang tick [t0, t1) dari semua celah ruangan pada hari tersebut."""
+        for starts, ends, tree in zip(self.gap_starts[room][day], self.gap_ends[room][day],
+                                      self.gap_trees[room][day]):
+            # Celah pertama yang berakhir setelah t0 adalah kandidat pertama yang beririsan
+            i = bisect_right(ends, t0)
+            while i < len(starts) and starts[i] < t1:
+                gap_start, gap_end = starts[i], ends[i]
+                del starts[i], ends[i]
+                tree.set(gap_start, 0)
+                if gap_start < t0:
+                    starts.insert(i, gap_start)
+                    ends.insert(i, t0)
+                    tree.set(gap_start, t0 - gap_start)
+                    i += 1
+                if t1 < gap_end:
+                    starts.insert(i, t1)
+                    ends.insert(i, gap_end)
+                    tree.set(t1, gap_end - t1)
+                    i += 1
+
+    def earliest_fit(self, room, day, n_ticks, busy=0):
+        """
+        Tick mulai paling awal pada (ruangan, hari) di mana sesi sepanjang `n_ticks` muat
+        di dalam satu celah dan tidak menyentuh `busy` (misalnya okupansi dosen). None jika tidak ada.
+
+        Celah yang terlalu pendek dilompati lewat `_GapTree`, jadi tanpa `busy` biayanya O(log W) per
+        jendela; setiap celah cukup panjang yang ternyata terhalang `busy` menambah satu query lagi.
+        """
+        best = None
+        for tree, starts in zip(self.gap_trees[room][day], self.start_masks[day]):
+            lo = tree.base
+            while best is None or lo < best:
+                gap_start = tree.first_at_least(n_ticks, lo)
+                if gap_start is None or (best is not None and gap_start >= best):
+                    break
+                t = earliest_free_start(busy, gap_start, gap_start + tree.length_at(gap_start), n_ticks, starts)
+                if t is not None:
+                    # Celah di dalam satu jendela terurut, jadi hasil pertama adalah yang paling awal
+                    best = t if best is None else min(best, t)
+                    break
+                lo = gap_start + 1
+        return best
@@ -0,0 +1,384 @@
+# algoritma/problem.py
+
+import math
+import utils
+from collections import namedtuple
+from algoritma.occupancy import span_mask, run_starts
+
+# Langkah waktu mulai sesi di dalam slot (menit); juga resolusi grid maksimum (menit per tick)
+TICK_MENIT = 15
+
+# Satu sesi individual yang harus dijadwalkan. Semua field berupa indeks/angka integer.
+Session = namedtuple("Session", ["idx", "course", "lecturer", "sesi", "peserta", "durasi", "n_ticks"])
+
+
+class ProblemInstance:
+    """
+    Representasi terkompilasi (berindeks integer) dari dataset penjadwalan.
+
+    Dibangun sekali dari output `utils.load_dataset` lalu dipakai bersama oleh semua
+    scheduler, sehingga parsing waktu, ekspansi interval 15 menit, perhitungan jumlah
+    sesi, dan lookup nama dosen tidak diulang di setiap algoritma.
+
+    Panjang tick (`tick_menit`) adalah FPB dari 15 menit, selisih setiap batas slot terhadap
+    `tick_origin`, dan semua durasi sesi. Pada dataset yang selaras dengan grid 15 menit hasilnya
+    15; slot yang mulai di luar grid (mis. 08:10) membuat tick lebih halus, bukan membulatkan
+    jendelanya, sehingga setiap interval sesi dan jendela slot terwakili secara tepat.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.matakuliah = data["matakuliah"]
+        self.dosen = data["dosen"]
+        self.slot_waktu = data["slot_waktu"]
+        self.ruangan = data["ruangan"]
+
+        self._setup_days_and_ticks()
+        self._setup_rooms()
+        self._setup_lecturers()
+        self._setup_courses_and_sessions()
+
+        # Cache untuk query yang hanya bergantung pada (durasi, peserta)
+        self._start_options_cache = {}
+        self._rooms_fit_cache = {}
+        self._rooms_closest_cache = {}
+        self._candidates_cache = {}
+        self._start_mask_cache = {}
+        self._tick_candidates_cache = {}
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+    def _setup_days_and_ticks(self):
+        """Memberi id padat untuk hari dan tick, serta jendela slot per hari."""
+        parsed_slots = []
+        for slot in self.slot_waktu:
+            parsed_slots.append((slot["hari"], utils.time_to_minutes(slot["jam_mulai"]), utils.time_to_minutes(slot["jam_selesai"])))
+
+        day_names = []
+        for hari, _, _ in parsed_slots:
+            if hari not in day_names:
+                day_names.append(hari)
+        self.days = sorted(day_names, key=lambda h: utils.HARI_ORDER.get(h, 99))
+        self.day_idx = {hari: i for i, hari in enumerate(self.days)}
+
+        # Tick 0 berada pada jam mulai paling awal dari seluruh slot; panjang tick dipilih agar semua
+        # batas slot dan durasi sesi jatuh tepat di batas tick
+        self.tick_origin = min((start for _, start, _ in parsed_slots), default=0)
+        tick_menit = TICK_MENIT
+        for _, start, end in parsed_slots:
+            tick_menit = math.gcd(tick_menit, start - self.tick_origin, end - self.tick_origin)
+        for mk in self.matakuliah:
+            tick_menit = math.gcd(tick_menit, utils.sks_to_minutes(mk["sks"]))
+        self.tick_menit = tick_menit
+        # Waktu mulai sesi tetap per TICK_MENIT dari awal slot: setiap `start_stride` tick
+        self.start_stride = TICK_MENIT // tick_menit
+        latest_end = max((end for _, _, end in parsed_slots), default=self.tick_origin)
+        self.n_ticks = self.tick_end(latest_end)
+
+        # windows[d] = list (mulai_menit, selesai_menit) slot asli pada hari d, urut jam mulai
+        self.windows = [[] for _ in self.days]
+        for hari, start, end in parsed_slots:
+            self.windows[self.day_idx[hari]].append((start, end))
+        for day_windows in self.windows:
+            day_windows.sort(key=lambda w: w[0])
+
+        # starts = semua kandidat waktu mulai (hari, mulai_menit, selesai_slot_menit) per 15 menit,
+        # diurutkan berdasarkan hari lalu jam mulai (urutan yang sama dengan scheduler lama)
+        self.starts = []
+        for hari, start, end in parsed_slots:
+            for mulai in range(start, end, TICK_MENIT):
+                self.starts.append((self.day_idx[hari], mulai, end))
+        self.starts.sort(key=lambda s: (s[0], s[1]))
+
+        # day_tick_minutes[d] = menit mulai tiap tick diskrit yang berada di dalam slot hari d
+        self.day_tick_minutes = []
+        for d in range(len(self.days)):
+            minutes = set()
+            for start, end in self.windows[d]:
+                minutes.update(range(start, end, self.tick_menit))
+            self.day_tick_minutes.append(sorted(minutes))
+
+    def _setup_rooms(self):
+        self.room_ids = [r["id"] for r in self.ruangan]
+        self.room_names = [r["nama"] for r in self.ruangan]
+        self.room_caps = [r["kapasitas"] for r in self.ruangan]
+        self.room_idx = {r_id: i for i, r_id in enumerate(self.room_ids)}
+        self.max_capacity = max(self.room_caps) if self.room_caps else 1
+
+    def _setup_lecturers(self):
+        self.lecturer_ids = [d["id"] for d in self.dosen]
+        self.lecturer_names = [d["nama"] for d in self.dosen]
+        self.lecturer_idx = {d_id: i for i, d_id in enumerate(self.lecturer_ids)}
+
+        # Dosen yang dirujuk mata kuliah tetapi tidak ada di daftar tetap mendapat id sendiri,
+        # sehingga konflik tetap dihitung per dosen_id (sama seperti sebelumnya)
+        for mk in self.matakuliah:
+            if mk["dosen_id"] not in self.lecturer_idx:
+                self.lecturer_idx[mk["dosen_id"]] = len(self.lecturer_ids)
+                self.lecturer_ids.append(mk["dosen_id"])
+                self.lecturer_names.append(utils.get_dosen_name(mk["dosen_id"], self.dosen))
+
+    def _setup_courses_and_sessions(self):
+        """Menghitung jumlah sesi, durasi, dan peserta per sesi untuk setiap mata kuliah."""
+        self.course_ids = [mk["id"] for mk in self.matakuliah]
+        self.course_names = [mk["nama"] for mk in self.matakuliah]
+        self.course_idx = {mk_id: i for i, mk_id in enumerate(self.course_ids)}
+        self.course_lecturer = []
+        self.course_durasi = []
+        self.course_jumlah_sesi = []
+        self.course_peserta = []
+
+        self.sessions = []
+        self.sessions_by_course = []
+        for c, mk in enumerate(self.matakuliah):
+            total_peserta = mk["jumlah_mahasiswa"]
+            durasi = utils.sks_to_minutes(mk["sks"])
+            jumlah_sesi = (total_peserta + self.max_capacity - 1) // self.max_capacity if total_peserta > 0 else 0
+            peserta_per_sesi = (total_peserta + jumlah_sesi - 1) // jumlah_sesi if jumlah_sesi > 0 else total_peserta
+            lecturer = self.lecturer_idx[mk["dosen_id"]]
+
+            self.course_lecturer.append(lecturer)
+            self.course_durasi.append(durasi)
+            self.course_jumlah_sesi.append(jumlah_sesi)
+            self.course_peserta.append(peserta_per_sesi)
+
+            course_sessions = []
+            for sesi_ke in range(1, jumlah_sesi + 1):
+                session = Session(len(self.sessions), c, lecturer, sesi_ke, peserta_per_sesi, durasi,
+                                  (durasi + self.tick_menit - 1) // self.tick_menit)
+                self.sessions.append(session)
+                course_sessions.append(session.idx)
+            self.sessions_by_course.append(course_sessions)
+
+    # ------------------------------------------------------------------
+    # Tick helpers
+    # ------------------------------------------------------------------
+    def tick_of(self, minute):
+        """Tick yang memuat menit `minute` (dibulatkan ke bawah)."""
+        return (minute - self.tick_origin) // self.tick_menit
+
+    def tick_end(self, minute):
+        """Batas tick eksklusif untuk menit akhir `minute` (dibulatkan ke atas)."""
+        return -((self.tick_origin - minute) // self.tick_menit)
+
+    def tick_minute(self, tick):
+        """Menit mulai dari tick `tick`."""
+        return self.tick_origin + tick * self.tick_menit
+
+    def tick_range(self, mulai, selesai):
+        """Rentang tick [t0, t1) yang ditempati interval menit [mulai, selesai)."""
+        return self.tick_of(mulai), self.tick_end(selesai)
+
+    def tick_mask(self, mulai, selesai):
+        """Bitmask tick yang ditempati interval menit [mulai, selesai)."""
+        return span_mask(*self.tick_range(mulai, selesai))
+
+    # ------------------------------------------------------------------
+    # Query yang di-cache
+    # ------------------------------------------------------------------
+    def start_options(self, durasi):
+        """Semua (hari, mulai_menit) di mana sesi berdurasi `durasi` muat di dalam slotnya."""
+        options = self._start_options_cache.get(durasi)
+        if options is None:
+            options = [(d, mulai) for d, mulai, slot_end in self.starts if mulai + durasi <= slot_end]
+            self._start_options_cache[durasi] = options
+        return options
+
+    def start_tick_mask(self, day, n_ticks):
+        """
+        Bitmask tick mulai pada hari `day` di mana sesi sepanjang `n_ticks` tick berada
+        utuh di dalam salah satu jendela slot. Hanya tick setiap TICK_MENIT dari awal jendela
+        (sama dengan `starts`) yang menjadi tick mulai.
+        """
+        key = (day, n_ticks)
+        mask = self._start_mask_cache.get(key)
+        if mask is None:
+            mask = 0
+            for start, end in self.windows[day]:
+                mask |= self.window_start_mask(start, end, n_ticks)
+            self._start_mask_cache[key] = mask
+        return mask
+
+    def window_start_mask(self, start, end, n_ticks):
+        """Bitmask tick mulai di dalam jendela [start, end) untuk sesi sepanjang `n_ticks` tick."""
+        t0, t1 = self.tick_of(start), self.tick_of(end) - n_ticks + 1
+        if self.start_stride == 1:
+            return span_mask(t0, t1)
+        mask = 0
+        for tick in range(t0, t1, self.start_stride):
+            mask |= 1 << tick
+        return mask
+
+    def rooms_fitting(self, peserta):
+        """Indeks ruangan (urutan dataset) dengan kapasitas >= `peserta`."""
+        rooms = self._rooms_fit_cache.get(peserta)
+        if rooms is None:
+            rooms = [r for r, cap in enumerate(self.room_caps) if cap >= peserta]
+            self._rooms_fit_cache[peserta] = rooms
+        return rooms
+
+    def rooms_by_closeness(self, peserta):
+        """Semua indeks ruangan diurutkan berdasarkan selisih kapasitas terhadap `peserta`."""
+        rooms = self._rooms_closest_cache.get(peserta)
+        if rooms is None:
+            rooms = sorted(range(len(self.room_caps)), key=lambda r: abs(self.room_caps[r] - peserta))
+            self._rooms_closest_cache[peserta] = rooms
+        return rooms
+
+    def candidates(self, session):
+        """
+        Daftar kandidat penempatan (hari, mulai_menit, ruangan) yang valid secara statis untuk
+        `session`: durasi muat di slot dan kapasitas ruangan cukup. Konflik tidak diperiksa di sini.
+        """
+        key = (session.durasi, session.peserta)
+        cands = self._candidates_cache.get(key)
+        if cands is None:
+            rooms = self.rooms_fitting(session.peserta)
+            cands = [(d, mulai, r) for d, mulai in self.start_options(session.durasi) for r in rooms]
+            self._candidates_cache[key] = cands
+        return cands
+
+    def tick_candidates(self, session):
+        """
+        Kandidat penempatan `session` dalam tick sebagai (list (hari, tick mulai, ruangan), set yang
+        sama). Tick mulai diambil dari `start_tick_mask`, jadi sama dengan waktu mulai pada `starts`.
+        """
+        n_ticks = max(session.n_ticks, 1)
+        key = (n_ticks, session.peserta)
+        cached = self._tick_candidates_cache.get(key)
+        if cached is None:
+            rooms = self.rooms_fitting(session.peserta)
+            cands = []
+            for d in range(len(self.days)):
+                starts = self.start_tick_mask(d, n_ticks)
+                tick = 0
+                while starts:
+                    if starts & 1:
+                        cands.extend((d, tick, r) for r in rooms)
+                    starts >>= 1
+                    tick += 1
+            cached = (cands, set(cands))
+            self._tick_candidates_cache[key] = cached
+        return cached
+
+    def subset(self, course_indices):
+        """
+        Instance baru yang hanya berisi mata kuliah `course_indices`. Ruangan, dosen, dan slot
+        tetap utuh sehingga kapasitas maksimum (dan jumlah sesi per mata kuliah) tidak berubah.
+        """
+        data = dict(self.data)
+        data["matakuliah"] = [self.matakuliah[c] for c in course_indices]
+        return ProblemInstance(data)
+
+    # ------------------------------------------------------------------
+    # Output helpers
+    # ------------------------------------------------------------------
+    def schedule_entry(self, session, day, mulai, room):
+        """Membentuk entri jadwal dengan format yang dipakai laporan."""
+        return {
+            "matakuliah": self.course_names[session.course],
+            "dosen": self.lecturer_names[session.lecturer],
+            "ruangan": self.room_names[room],
+            "hari": self.days[day],
+            "jam_mulai": utils.minutes_to_time(mulai),
+            "jam_selesai": utils.minutes_to_time(mulai + session.durasi),
+            "jumlah_mahasiswa": session.peserta,
+            "sesi": session.sesi
+        }
+
+    def assignment_from_schedule(self, schedule):
+        """
+        Memetakan entri jadwal (format laporan, mis. hasil scheduler lain) kembali ke penempatan
+        berindeks: list (session_idx, hari, mulai_menit, ruangan). Entri dengan nama mata kuliah,
+        ruangan, atau hari yang tidak dikenal dilewati; nomor sesi yang tidak cocok diganti dengan
+        sesi mata kuliah tersebut yang belum terpakai.
+        """
+        course_by_name = {}
+        for c, nama in enumerate(self.course_names):
+            course_by_name.setdefault(nama, c)
+        room_by_name = {}
+        for r, nama in enumerate(self.room_names):
+            room_by_name.setdefault(nama, r)
+
+        assignment = []
+        used = set()
+        for entry in schedule:
+            c = course_by_name.get(entry.get("matakuliah"))
+            hari = self.day_idx.get(entry.get("hari"))
+            room = room_by_name.get(entry.get("ruangan"))
+            if c is None or hari is None or room is None:
+                continue
+            course_sessions = self.sessions_by_course[c]
+            sesi = entry.get("sesi")
+            if isinstance(sesi, int) and 1 <= sesi <= len(course_sessions) and course_sessions[sesi - 1] not in used:
+                s = course_sessions[sesi - 1]
+            else:
+                s = next((s for s in course_sessions if s not in used), None)
+                if s is None:
+                    continue
+            used.add(s)
+            assignment.append((s, hari, utils.time_to_minutes(entry["jam_mulai"]), room))
+        return assignment
+
+    def failed_entry(self, session, reason=None, reason_codes=None):
+        """
+        Membentuk entri sesi gagal dengan format yang dipakai laporan. Alasan boleh berupa teks jadi
+        (`reason`) atau kode terstruktur (`reason_codes`, dirender oleh `utils.format_failure_reason`).
+        """
+        entry = {
+            "matakuliah": self.course_names[session.course],
+            "dosen": self.lecturer_names[session.lecturer],
+            "jumlah_mahasiswa": session.peserta,
+            "sesi": session.sesi
+        }
+        if reason is not None:
+            entry["reason"] = reason
+        if reason_codes is not None:
+            entry["reason_codes"] = reason_codes
+        return entry
+
+    def failure_reasons(self, session, used_rooms, used_dosen):
+        """
+        Kode alasan kegagalan `session` terhadap okupansi `used_rooms`/`used_dosen` (OccupancyGrid):
+        {kode: jumlah kandidat (hari, tick mulai, ruangan) yang gagal karena kode tersebut}. Setiap
+        kandidat dihitung tepat satu kali dengan prioritas kapasitas, durasi melebihi slot, ruangan
+        bentrok, lalu dosen bentrok, sehingga jumlahnya sama dengan banyaknya kandidat yang dicoba.
+        Kandidat dihitung per (hari, ruangan) sekaligus dengan operasi bitmask, bukan satu per satu.
+        Jika masih ada kandidat yang bebas, hasilnya {ALASAN_TIDAK_OPTIMAL: 1}.
+        """
+        n_ticks = session.n_ticks
+        day_span = span_mask(0, self.n_ticks)
+        fitting_rooms = self.rooms_fitting(session.peserta)
+        n_small = len(self.room_caps) - len(fitting_rooms)
+        counts = {utils.ALASAN_RUANGAN_KECIL: 0, utils.ALASAN_RUANGAN_BENTROK: 0,
+                  utils.ALASAN_DOSEN_BENTROK: 0, utils.ALASAN_DURASI_MELEBIHI: 0}
+
+        for hari in range(len(self.days)):
+            all_starts = self.start_tick_mask(hari, 1)
+            valid = self.start_tick_mask(hari, max(n_ticks, 1))
+            n_valid = valid.bit_count()
+            counts[utils.ALASAN_RUANGAN_KECIL] += all_starts.bit_count() * n_small
+            counts[utils.ALASAN_DURASI_MELEBIHI] += (all_starts.bit_count() - n_valid) * len(fitting_rooms)
+            if not n_valid or not fitting_rooms:
+                continue
+
+            # Tick mulai di mana sesi tidak menyentuh okupansi dosen / ruangan
+            if n_ticks == 0:
+                return {utils.ALASAN_TIDAK_OPTIMAL: 1}
+            dosen_ok = run_starts(day_span & ~used_dosen.busy(hari, session.lecturer), n_ticks)
+            for r in fitting_rooms:
+                room_ok = run_starts(day_span & ~used_rooms.busy(hari, r), n_ticks)
+                if valid & room_ok & dosen_ok:
+                    return {utils.ALASAN_TIDAK_OPTIMAL: 1}
+                counts[utils.ALASAN_RUANGAN_BENTROK] += (valid & ~room_ok).bit_count()
+                counts[utils.ALASAN_DOSEN_BENTROK] += (valid & room_ok & ~dosen_ok).bit_count()
+
+        return {code: jumlah for code, jumlah in counts.items() if jumlah}
+
+
+def as_problem(data):
+    """Mengembalikan `ProblemInstance` untuk `data`; dikompilasi hanya jika belum."""
+    if isinstance(data, ProblemInstance):
+        return data
+    return ProblemInstance(data)
@@ -0,0 +1,287 @@
+# algoritma/repair.py (Min-conflicts + tabu repair engine)
+
+import utils
+import random
+import time # Import time for execution tracking
+from collections import deque
+from algoritma.problem import as_problem
+from algoritma.occupancy import OccupancyGrid
+from algoritma.instrumentation import Instrumentation
+
+class RepairScheduler:
+    """
+    Memperbaiki jadwal yang sudah ada (hasil scheduler apa pun) dengan local search min-conflicts.
+
+    Setiap iterasi memilih satu sesi yang belum terjadwal, lalu menempatkannya pada kandidat
+    (hari, tick mulai, ruangan) yang menggusur sesi terjadwal paling sedikit. Sesi yang tergusur
+    langsung dicoba dipindah ke penempatan lain yang kosong (move); jika tidak ada, sesi tersebut
+    menjadi belum terjadwal. Daftar tabu mencegah sesi kembali ke penempatan yang baru saja
+    ditinggalkannya dan melindungi sesi yang baru ditempatkan dari digusur lagi.
+
+    Konflik dihitung secara inkremental lewat peta pemilik per tick untuk setiap (hari, ruangan)
+    dan (hari, dosen), sehingga evaluasi satu kandidat hanya menyentuh tick-tick sesi itu sendiri.
+    Jadwal terbaik (sesi terjadwal terbanyak) selama pencarian yang dikembalikan.
+    """
+
+    def __init__(self, data, initial=None, time_limit=5.0, max_iterations=None, tabu_tenure=10, seed=0):
+        # `data` boleh berupa dataset mentah atau ProblemInstance yang sudah dikompilasi
+        self.problem = as_problem(data)
+        self.matakuliah = self.problem.matakuliah
+        self.dosen = self.problem.dosen
+        self.slot_waktu = self.problem.slot_waktu
+        self.ruangan = self.problem.ruangan
+
+        # Jadwal awal: list entri jadwal atau dict hasil solve() ({'schedule': [...], 'stats': {...}}).
+        # Jika None, jadwal awal dibuat oleh GreedyScheduler.
+        if isinstance(initial, dict):
+            initial = initial.get('schedule')
+        self.initial = initial
+
+        # Anggaran pencarian: detik wall-clock dan/atau jumlah iterasi (None = tidak dibatasi)
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.tabu_tenure = tabu_tenure
+        self.seed = seed
+
+        self.jadwal = []
+        self.failed_sessions = []
+        self.total_attempted_sessions_count = 0
+        self.iterations = 0
+        self.initial_scheduled = 0
+        self.instr = Instrumentation()
+
+    def calculate_stats(self):
+        # This method aggregates statistics from the scheduler's state
+        conflicts = len(self.failed_sessions)
+        return {
+            "total_slots_attempted": self.total_attempted_sessions_count,
+            "scheduled_slots": len(self.jadwal),
+            "conflicts": conflicts,
+            "failed_details": self.failed_sessions,
+            "initial_scheduled": self.initial_scheduled,
+            "iterations": self.iterations
+        }
+
+    # ------------------------------------------------------------------
+    # State inkremental
+    # ------------------------------------------------------------------
+    def _setup_state(self):
+        problem = self.problem
+        n_days = len(problem.days)
+        # Pemilik tiap tick: indeks sesi atau -1 jika kosong
+        self.room_owner = [[[-1] * problem.n_ticks for _ in problem.room_ids] for _ in range(n_days)]
+        self.dosen_owner = [[[-1] * problem.n_ticks for _ in problem.lecturer_ids] for _ in range(n_days)]
+        self.placement = [None] * len(problem.sessions) # session -> (hari, tick, ruangan)
+        self.s_ticks = [max(session.n_ticks, 1) for session in problem.sessions]
+
+        # Kandidat statis per sesi dalam tick (durasi muat di slot dan kapasitas ruangan cukup);
+        # list dan set dibagi antar sesi dengan jumlah tick dan peserta yang sama
+        self.s_candidates = []
+        self.s_candidate_set = []
+        for session in problem.sessions:
+            candidates, candidate_set = problem.tick_candidates(session)
+            self.s_candidates.append(candidates)
+            self.s_candidate_set.append(candidate_set)
+
+    def _place(self, s, hari, tick, ruang):
+        lecturer = self.problem.sessions[s].lecturer
+        room_row = self.room_owner[hari][ruang]
+        dosen_row = self.dosen_owner[hari][lecturer]
+        for t in range(tick, tick + self.s_ticks[s]):
+            room_row[t] = s
+            dosen_row[t] = s
+        self.placement[s] = (hari, tick, ruang)
+
+    def _remove(self, s):
+        hari, tick, ruang = self.placement[s]
+        lecturer = self.problem.sessions[s].lecturer
+        room_row = self.room_owner[hari][ruang]
+        dosen_row = self.dosen_owner[hari][lecturer]
+        for t in range(tick, tick + self.s_ticks[s]):
+            room_row[t] = -1
+            dosen_row[t] = -1
+        self.placement[s] = None
+
+    def _conflicts(self, s, hari, tick, ruang):
+        """Himpunan sesi terjadwal yang harus digusur agar `s` bisa ditempatkan di (hari, tick, ruang)."""
+        room_row = self.room_owner[hari][ruang]
+        dosen_row = self.dosen_owner[hari][self.problem.sessions[s].lecturer]
+        owners = set()
+        for t in range(tick, tick + self.s_ticks[s]):
+            if room_row[t] >= 0:
+                owners.add(room_row[t])
+            if dosen_row[t] >= 0:
+                owners.add(dosen_row[t])
+        owners.discard(s)
+        return owners
+
+    def _is_tabu(self, s, candidate, iteration):
+        return self.tabu.get((s,) + candidate, -1) > iteration
+
+    def _free_placement(self, s, iteration):
+        """Penempatan pertama tanpa konflik (dan tidak tabu) untuk `s`, atau None."""
+        for candidate in self.s_candidates[s]:
+            if not self._is_tabu(s, candidate, iteration) and not self._conflicts(s, *candidate):
+                return candidate
+        return None
+
+    def _min_conflict_placement(self, s, iteration):
+        """
+        Kandidat dengan jumlah sesi tergusur paling sedikit, tanpa menggusur sesi yang sedang
+        dilindungi tabu. Seri dipecah secara acak. Mengembalikan (kandidat, sesi tergusur) atau None.
+        """
+        best, best_evicted, best_count, ties = None, None, None, 0
+        for candidate in self.s_candidates[s]:
+            if self._is_tabu(s, candidate, iteration):
+                continue
+            evicted = self._conflicts(s, *candidate)
+            if any(self.protected.get(e, -1) > iteration for e in evicted):
+                continue
+            count = len(evicted)
+            if best_count is None or count < best_count:
+                best, best_evicted, best_count, ties = candidate, evicted, count, 1
+                if count == 0:
+                    break
+            elif count == best_count:
+                # Reservoir sampling agar seri dipilih seragam tanpa menyimpan semuanya
+                ties += 1
+                if self.rng.randrange(ties) == 0:
+                    best, best_evicted = candidate, evicted
+        if best is None:
+            return None
+        return best, best_evicted
+
+    # ------------------------------------------------------------------
+    # Solve
+    # ------------------------------------------------------------------
+    def _initial_assignment(self):
+        """Memasang jadwal awal; entri yang bentrok dengan entri sebelumnya diabaikan."""
+        problem = self.problem
+        initial = self.initial
+        if initial is None:
+            from algoritma.greedy import GreedyScheduler
+            initial = GreedyScheduler(problem).solve()['schedule']
+
+        for s, hari, mulai, ruang in problem.assignment_from_schedule(initial):
+            # Dibulatkan ke atas: tick di bawah `mulai` bisa jatuh sebelum slot dibuka
+            tick = problem.tick_end(mulai)
+            if (hari, tick, ruang) not in self.s_candidate_set[s]:
+                continue
+            if self.placement[s] is None and not self._conflicts(s, hari, tick, ruang):
+                self._place(s, hari, tick, ruang)
+
+    def solve(self):
+        start_time = time.time()
+        problem = self.problem
+        self.rng = random.Random(self.seed)
+
+        urutan_hari = {"Senin": 1, "Selasa": 2, "Rabu": 3, "Kamis": 4, "Jumat": 5, "Sabtu": 6, "Minggu": 7}
+        self.total_attempted_sessions_count = len(problem.sessions)
+
+        instr = self.instr
+        with instr.phase("setup"):
+            self._setup_state()
+        with instr.phase("initial_assignment"):
+            self._initial_assignment()
+        self.tabu = {}      # (sesi, hari, tick, ruangan) -> iterasi sampai kapan dilarang
+        # Urutan kedaluwarsa entri tabu (tenure tetap, jadi terurut): entri lama dibuang tiap iterasi
+        # agar ukuran `tabu` terbatas oleh tenure, bukan jumlah iterasi
+        tabu_expiry = deque()
+        self.protected = {} # sesi -> iterasi sampai kapan tidak boleh digusur
+
+        # Sesi tanpa kandidat sama sekali tidak akan pernah bisa ditempatkan
+        unassigned = {s for s in range(len(problem.sessions)) if self.placement[s] is None and self.s_candidates[s]}
+        placed_count = sum(1 for p in self.placement if p is not None)
+        self.initial_scheduled = placed_count
+        best_count, best_placement = placed_count, list(self.placement)
+
+        deadline = start_time + self.time_limit if self.time_limit is not None else None
+        iteration = 0
+        evictions, relocations = 0, 0
+        with instr.phase("search"):
+            while unassigned:
+                if self.max_iterations is not None and iteration >= self.max_iterations:
+                    break
+                if deadline is not None and time.time() >= deadline:
+                    break
+                iteration += 1
+                while tabu_expiry and tabu_expiry[0][0] <= iteration:
+                    expiry, key = tabu_expiry.popleft()
+                    if self.tabu.get(key) == expiry:
+                        del self.tabu[key]
+
+                s = self.rng.choice(tuple(unassigned))
+                choice = self._min_conflict_placement(s, iteration)
+                if choice is None:
+                    continue
+                candidate, evicted = choice
+
+                for e in evicted:
+                    key = (e,) + self.placement[e]
+                    self.tabu[key] = iteration + self.tabu_tenure
+                    tabu_expiry.append((iteration + self.tabu_tenure, key))
+                    self._remove(e)
+                self._place(s, *candidate)
+                self.protected[s] = iteration + self.tabu_tenure
+                unassigned.discard(s)
+                placed_count += 1 - len(evicted)
+                evictions += len(evicted)
+
+                # Sesi yang tergusur langsung dipindah ke penempatan kosong jika ada
+                for e in evicted:
+                    moved = self._free_placement(e, iteration)
+                    if moved is not None:
+                        self._place(e, *moved)
+                        placed_count += 1
+                        relocations += 1
+                    else:
+                        unassigned.add(e)
+
+                if placed_count > best_count:
+                    best_count, best_placement = placed_count, list(self.placement)
+
+        self.iterations = iteration
+        instr.count("iterations", iteration)
+        instr.count("evictions", evictions)
+        instr.count("relocations", relocations)
+
+        # Bangun jadwal terbaik beserta okupansinya untuk diagnosa sesi gagal
+        with instr.phase("rebuild"):
+            used_rooms = OccupancyGrid(len(problem.days), len(problem.room_ids))
+            used_dosen = OccupancyGrid(len(problem.days), len(problem.lecturer_ids))
+            for s, placement in enumerate(best_placement):
+                if placement is None:
+                    continue
+                hari, tick, ruang = placement
+                session = problem.sessions[s]
+                mulai = problem.tick_minute(tick)
+                mask = problem.tick_mask(mulai, mulai + session.durasi)
+                used_rooms.mark(hari, ruang, mask)
+                used_dosen.mark(hari, session.lecturer, mask)
+                self.jadwal.append(problem.schedule_entry(session, hari, mulai, ruang))
+
+        with instr.phase("diagnostics"):
+            for s, placement in enumerate(best_placement):
+                if placement is None:
+                    session = problem.sessions[s]
+                    reason_codes = problem.failure_reasons(session, used_rooms, used_dosen)
+                    self.failed_sessions.append(problem.failed_entry(session, reason_codes=reason_codes))
+
+        end_time = time.time()
+
+        # Sort the final schedule for consistent reporting
+        sorted_final_schedule = sorted(
+            self.jadwal,
+            key=lambda x: (urutan_hari.get(x["hari"], 99), utils.time_to_minutes(x["jam_mulai"]), x["matakuliah"])
+        )
+
+        # Calculate statistics and add execution time
+        stats_data = self.calculate_stats()
+        stats_data['execution_time'] = end_time - start_time
+        instr.merge_into(stats_data)
+
+        # Return a dictionary containing both 'schedule' and 'stats'
+        return {
+            'schedule': sorted_final_schedule,
+            'stats': stats_data
+        }
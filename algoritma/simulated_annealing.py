@@ -0,0 +1,380 @@
+# algoritma/simulated_annealing.py (Simulated Annealing Scheduler)
+
+import utils
+import math
+import random
+import time # Import time for execution tracking
+from algoritma.problem import as_problem
+from algoritma.occupancy import OccupancyGrid
+from algoritma.instrumentation import Instrumentation
+
+class SimulatedAnnealingScheduler:
+    """
+    Simulated annealing atas penugasan lengkap: setiap sesi memegang satu penempatan
+    (hari, tick mulai, ruangan) atau belum ditempatkan, dan bentrok boleh terjadi selama pencarian.
+
+    Objektif = jumlah sesi terpasang - `overlap_penalty` * jumlah tick bentrok, dengan tick bentrok
+    dihitung dari jumlah pemakai per tick untuk setiap (hari, ruangan) dan (hari, dosen).
+    Move yang dipakai: relocate (pindah ke kandidat acak, termasuk memasang sesi yang belum
+    terpasang), swap (dua sesi bertukar penempatan), change room (waktu tetap, ruangan lain), dan
+    sesekali unassign. Delta setiap move dihitung hanya dari tick-tick sesi yang bergerak.
+
+    Suhu turun dari `initial_temperature` ke `final_temperature` mengikuti `temperature_schedule`
+    ("geometric", "linear", atau callable progress -> suhu) terhadap progres anggaran waktu/iterasi.
+    Hasil akhir adalah penugasan bebas bentrok terbaik yang pernah ditemui; penugasan terakhir juga
+    dibersihkan dari bentrok lalu dibandingkan.
+    """
+
+    def __init__(self, data, initial=None, time_limit=5.0, max_iterations=None, seed=0,
+                 initial_temperature=2.0, final_temperature=0.02, temperature_schedule="geometric",
+                 overlap_penalty=1.0, unassign_rate=0.02):
+        # `data` boleh berupa dataset mentah atau ProblemInstance yang sudah dikompilasi
+        self.problem = as_problem(data)
+        self.matakuliah = self.problem.matakuliah
+        self.dosen = self.problem.dosen
+        self.slot_waktu = self.problem.slot_waktu
+        self.ruangan = self.problem.ruangan
+
+        # Penugasan awal opsional (list entri jadwal atau dict hasil solve());
+        # jika None, setiap sesi dipasang pada kandidat acak.
+        if isinstance(initial, dict):
+            initial = initial.get('schedule')
+        self.initial = initial
+
+        # Anggaran pencarian: detik wall-clock dan/atau jumlah iterasi (minimal salah satu)
+        if time_limit is None and max_iterations is None:
+            raise ValueError("time_limit atau max_iterations harus diisi")
+        if not callable(temperature_schedule) and temperature_schedule not in ("geometric", "linear"):
+            raise ValueError(f"Unknown temperature_schedule '{temperature_schedule}'")
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.seed = seed
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.temperature_schedule = temperature_schedule
+        self.overlap_penalty = overlap_penalty
+        self.unassign_rate = unassign_rate
+
+        self.jadwal = []
+        self.failed_sessions = []
+        self.total_attempted_sessions_count = 0
+        self.iterations = 0
+        self.accepted_moves = 0
+        self.instr = Instrumentation()
+
+    def calculate_stats(self):
+        # This method aggregates statistics from the scheduler's state
+        conflicts = len(self.failed_sessions)
+        return {
+            "total_slots_attempted": self.total_attempted_sessions_count,
+            "scheduled_slots": len(self.jadwal),
+            "conflicts": conflicts,
+            "failed_details": self.failed_sessions,
+            "iterations": self.iterations,
+            "accepted_moves": self.accepted_moves
+        }
+
+    def temperature(self, progress):
+        """Suhu pada progres anggaran `progress` (0.0 di awal, 1.0 saat anggaran habis)."""
+        if callable(self.temperature_schedule):
+            return self.temperature_schedule(progress)
+        t0, t1 = self.initial_temperature, self.final_temperature
+        if self.temperature_schedule == "linear":
+            return t0 + (t1 - t0) * progress
+        return t0 * (t1 / t0) ** progress
+
+    # ------------------------------------------------------------------
+    # State inkremental
+    # ------------------------------------------------------------------
+    def _setup_state(self):
+        problem = self.problem
+        n_days = len(problem.days)
+        # Jumlah pemakai per tick; tick bentrok = tick dengan lebih dari satu pemakai
+        self.room_count = [[[0] * problem.n_ticks for _ in problem.room_ids] for _ in range(n_days)]
+        self.dosen_count = [[[0] * problem.n_ticks for _ in problem.lecturer_ids] for _ in range(n_days)]
+        self.placement = [None] * len(problem.sessions) # session -> (hari, tick, ruangan)
+        self.s_ticks = [max(session.n_ticks, 1) for session in problem.sessions]
+        self.placed_count = 0
+        self.overlap = 0
+
+        # Kandidat statis per sesi, dibagi antar sesi dengan durasi dan peserta yang sama.
+        # rooms_at memetakan (hari, tick) -> ruangan yang valid untuk move change room.
+        self.s_candidates = []
+        self.s_candidate_set = []
+        self.s_rooms_at = []
+        cache = {}
+        for session in problem.sessions:
+            candidates, candidate_set = problem.tick_candidates(session)
+            key = (self.s_ticks[session.idx], session.peserta)
+            if key not in cache:
+                rooms_at = {}
+                for hari, tick, r in candidates:
+                    rooms_at.setdefault((hari, tick), []).append(r)
+                cache[key] = rooms_at
+            rooms_at = cache[key]
+            self.s_candidates.append(candidates)
+            self.s_candidate_set.append(candidate_set)
+            self.s_rooms_at.append(rooms_at)
+
+    def _place(self, s, hari, tick, ruang):
+        """Memasang `s` dan mengembalikan perubahan jumlah tick bentrok."""
+        room_row = self.room_count[hari][ruang]
+        dosen_row = self.dosen_count[hari][self.problem.sessions[s].lecturer]
+        added = 0
+        for t in range(tick, tick + self.s_ticks[s]):
+            if room_row[t]:
+                added += 1
+            if dosen_row[t]:
+                added += 1
+            room_row[t] += 1
+            dosen_row[t] += 1
+        self.placement[s] = (hari, tick, ruang)
+        self.placed_count += 1
+        self.overlap += added
+        return added
+
+    def _remove(self, s):
+        """Melepas `s` dan mengembalikan perubahan jumlah tick bentrok."""
+        hari, tick, ruang = self.placement[s]
+        room_row = self.room_count[hari][ruang]
+        dosen_row = self.dosen_count[hari][self.problem.sessions[s].lecturer]
+        removed = 0
+        for t in range(tick, tick + self.s_ticks[s]):
+            room_row[t] -= 1
+            dosen_row[t] -= 1
+            if room_row[t]:
+                removed += 1
+            if dosen_row[t]:
+                removed += 1
+        self.placement[s] = None
+        self.placed_count -= 1
+        self.overlap -= removed
+        return -removed
+
+    def _overlap_of(self, s):
+        """Jumlah tick bentrok yang melibatkan sesi terpasang `s`."""
+        hari, tick, ruang = self.placement[s]
+        room_row = self.room_count[hari][ruang]
+        dosen_row = self.dosen_count[hari][self.problem.sessions[s].lecturer]
+        return sum((room_row[t] > 1) + (dosen_row[t] > 1) for t in range(tick, tick + self.s_ticks[s]))
+
+    def _set(self, s, placement):
+        """Mengganti penempatan `s` (None = lepas); mengembalikan (delta terpasang, delta bentrok)."""
+        d_placed, d_overlap = 0, 0
+        if self.placement[s] is not None:
+            d_overlap += self._remove(s)
+            d_placed -= 1
+        if placement is not None:
+            d_overlap += self._place(s, *placement)
+            d_placed += 1
+        return d_placed, d_overlap
+
+    # ------------------------------------------------------------------
+    # Moves
+    # ------------------------------------------------------------------
+    def _propose(self, movable):
+        """
+        Memilih move acak dan mengembalikan daftar perubahan [(sesi, penempatan baru)],
+        atau None jika move yang terpilih tidak valid.
+        """
+        rng = self.rng
+        s = movable[rng.randrange(len(movable))]
+        current = self.placement[s]
+        roll = rng.random()
+
+        if current is not None and roll < self.unassign_rate:
+            return [(s, None)]
+
+        if current is not None and roll < 0.35:
+            # Swap: tukar penempatan dengan sesi terpasang lain jika keduanya tetap valid
+            other = movable[rng.randrange(len(movable))]
+            other_placement = self.placement[other]
+            if (other == s or other_placement is None
+                    or other_placement not in self.s_candidate_set[s]
+                    or current not in self.s_candidate_set[other]):
+                return None
+            return [(s, other_placement), (other, current)]
+
+        if current is not None and roll < 0.6:
+            # Change room: waktu tetap, ruangan lain yang kapasitasnya cukup
+            hari, tick, ruang = current
+            rooms = self.s_rooms_at[s][(hari, tick)]
+            if len(rooms) < 2:
+                return None
+            new_room = rooms[rng.randrange(len(rooms))]
+            if new_room == ruang:
+                return None
+            return [(s, (hari, tick, new_room))]
+
+        # Relocate: kandidat acak (juga memasang sesi yang belum terpasang)
+        candidates = self.s_candidates[s]
+        candidate = candidates[rng.randrange(len(candidates))]
+        if candidate == current:
+            return None
+        return [(s, candidate)]
+
+    def _apply(self, changes):
+        """Menerapkan perubahan; mengembalikan (delta objektif, penempatan lama untuk undo)."""
+        old = [(s, self.placement[s]) for s, _ in changes]
+        # Lepas semua dulu agar swap tidak menghitung bentrok dengan dirinya sendiri
+        d_placed, d_overlap = 0, 0
+        for s, _ in changes:
+            p, o = self._set(s, None)
+            d_placed += p
+            d_overlap += o
+        for s, placement in changes:
+            if placement is not None:
+                p, o = self._set(s, placement)
+                d_placed += p
+                d_overlap += o
+        return d_placed - self.overlap_penalty * d_overlap, old
+
+    def _undo(self, old):
+        for s, _ in old:
+            if self.placement[s] is not None:
+                self._set(s, None)
+        for s, placement in old:
+            if placement is not None:
+                self._set(s, placement)
+
+    # ------------------------------------------------------------------
+    # Solve
+    # ------------------------------------------------------------------
+    def _initial_assignment(self, movable):
+        problem = self.problem
+        if self.initial is None:
+            for s in movable:
+                candidates = self.s_candidates[s]
+                self._place(s, *candidates[self.rng.randrange(len(candidates))])
+            return
+        for s, hari, mulai, ruang in problem.assignment_from_schedule(self.initial):
+            # Dibulatkan ke atas: tick di bawah `mulai` bisa jatuh sebelum slot dibuka
+            candidate = (hari, problem.tick_end(mulai), ruang)
+            if self.placement[s] is None and candidate in self.s_candidate_set[s]:
+                self._place(s, *candidate)
+
+    def _feasible_snapshot(self):
+        """
+        Penugasan bebas bentrok dari state saat ini: sesi yang masih bentrok dilepas satu per satu
+        (yang paling banyak bentrok lebih dulu) di salinan state, lalu state dikembalikan.
+        """
+        saved = list(self.placement)
+        placed = [s for s, p in enumerate(self.placement) if p is not None]
+        placed.sort(key=lambda s: -self._overlap_of(s))
+        for s in placed:
+            if self.overlap == 0:
+                break
+            if self._overlap_of(s):
+                self._remove(s)
+        snapshot = list(self.placement)
+        self._undo([(s, p) for s, p in enumerate(saved)])
+        return snapshot
+
+    def solve(self):
+        start_time = time.time()
+        problem = self.problem
+        self.rng = random.Random(self.seed)
+
+        urutan_hari = {"Senin": 1, "Selasa": 2, "Rabu": 3, "Kamis": 4, "Jumat": 5, "Sabtu": 6, "Minggu": 7}
+        self.total_attempted_sessions_count = len(problem.sessions)
+
+        instr = self.instr
+        with instr.phase("setup"):
+            self._setup_state()
+        # Sesi tanpa kandidat sama sekali tidak pernah ikut bergerak
+        movable = [s for s in range(len(problem.sessions)) if self.s_candidates[s]]
+        with instr.phase("initial_assignment"):
+            self._initial_assignment(movable)
+
+        with instr.phase("cleanup"):
+            best_placement = self._feasible_snapshot()
+        best_count = sum(1 for p in best_placement if p is not None)
+
+        if movable:
+            deadline = start_time + self.time_limit if self.time_limit is not None else None
+            iteration = 0
+            temperature = self.initial_temperature
+            invalid_moves = 0
+            with instr.phase("search"):
+                while True:
+                    if self.max_iterations is not None and iteration >= self.max_iterations:
+                        break
+                    # Semua sesi yang punya kandidat sudah terpasang tanpa bentrok: tidak ada yang bisa diperbaiki
+                    if best_count == len(movable):
+                        break
+                    # Jam dan suhu cukup diperbarui tiap 256 iterasi
+                    if iteration & 255 == 0:
+                        progress = 0.0
+                        if deadline is not None:
+                            now = time.time()
+                            if now >= deadline:
+                                break
+                            progress = (now - start_time) / self.time_limit
+                        if self.max_iterations is not None:
+                            progress = max(progress, iteration / self.max_iterations)
+                        temperature = self.temperature(min(progress, 1.0))
+                    iteration += 1
+
+                    changes = self._propose(movable)
+                    if changes is None:
+                        invalid_moves += 1
+                        continue
+                    delta, old = self._apply(changes)
+                    if delta >= 0 or (temperature > 0 and self.rng.random() < math.exp(delta / temperature)):
+                        self.accepted_moves += 1
+                        if self.overlap == 0 and self.placed_count > best_count:
+                            best_count, best_placement = self.placed_count, list(self.placement)
+                    else:
+                        self._undo(old)
+            self.iterations = iteration
+            instr.count("iterations", iteration)
+            instr.count("invalid_moves", invalid_moves)
+            instr.count("accepted_moves", self.accepted_moves)
+
+            # State terakhir bisa masih bentrok; versi bersihnya ikut dibandingkan
+            with instr.phase("cleanup"):
+                final_placement = self._feasible_snapshot()
+            final_count = sum(1 for p in final_placement if p is not None)
+            if final_count > best_count:
+                best_count, best_placement = final_count, final_placement
+
+        # Bangun jadwal terbaik beserta okupansinya untuk diagnosa sesi gagal
+        with instr.phase("rebuild"):
+            used_rooms = OccupancyGrid(len(problem.days), len(problem.room_ids))
+            used_dosen = OccupancyGrid(len(problem.days), len(problem.lecturer_ids))
+            for s, placement in enumerate(best_placement):
+                if placement is None:
+                    continue
+                hari, tick, ruang = placement
+                session = problem.sessions[s]
+                mulai = problem.tick_minute(tick)
+                mask = problem.tick_mask(mulai, mulai + session.durasi)
+                used_rooms.mark(hari, ruang, mask)
+                used_dosen.mark(hari, session.lecturer, mask)
+                self.jadwal.append(problem.schedule_entry(session, hari, mulai, ruang))
+
+        with instr.phase("diagnostics"):
+            for s, placement in enumerate(best_placement):
+                if placement is None:
+                    session = problem.sessions[s]
+                    reason_codes = problem.failure_reasons(session, used_rooms, used_dosen)
+                    self.failed_sessions.append(problem.failed_entry(session, reason_codes=reason_codes))
+
+        end_time = time.time()
+
+        # Sort the final schedule for consistent reporting
+        sorted_final_schedule = sorted(
+            self.jadwal,
+            key=lambda x: (urutan_hari.get(x["hari"], 99), utils.time_to_minutes(x["jam_mulai"]), x["matakuliah"])
+        )
+
+        # Calculate statistics and add execution time
+        stats_data = self.calculate_stats()
+        stats_data['execution_time'] = end_time - start_time
+        instr.merge_into(stats_data)
+
+        # Return a dictionary containing both 'schedule' and 'stats'
+        return {
+            'schedule': sorted_final_schedule,
+            'stats': stats_data
+        }
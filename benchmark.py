@@ -0,0 +1,203 @@
+# benchmark.py (Scaling benchmark for all schedulers)
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import time
+
+import matplotlib.pyplot as plt
+
+from generate_dataset import generate_dataset, dataset_tightness
+from algoritma.instrumentation import MB, start_memory_tracing, stop_memory_tracing
+from algoritma.problem import ProblemInstance
+from algoritma.backtrack import BacktrackingScheduler
+from algoritma.greedy import GreedyScheduler, PortfolioGreedyScheduler
+from algoritma.ilp import ILPScheduler
+from algoritma.dynamic_programing import DPScheduler
+from algoritma.repair import RepairScheduler
+from algoritma.simulated_annealing import SimulatedAnnealingScheduler
+
+# Factory per algoritma: ProblemInstance -> scheduler. Anggaran waktu mengikuti main.py agar
+# setiap engine berhenti sendiri; sel "cliff" di bawah menandai ukuran saat anggaran itu habis.
+ALGORITHMS = {
+    "greedy": lambda problem: GreedyScheduler(problem),
+    "portfolio": lambda problem: PortfolioGreedyScheduler(problem, seed=0),
+    "backtracking": lambda problem: BacktrackingScheduler(problem, time_limit=10.0),
+    "ilp": lambda problem: ILPScheduler(problem, time_limit=60, msg=False),
+    "dp": lambda problem: DPScheduler(problem, beam_width=50, max_states=200000),
+    "repair": lambda problem: RepairScheduler(problem, time_limit=5.0),
+    "annealing": lambda problem: SimulatedAnnealingScheduler(problem, time_limit=5.0, seed=0),
+}
+
+COLORS = ['skyblue', 'salmon', 'lightgreen', 'gold', 'plum', 'darkseagreen', 'lightcoral', 'cornflowerblue']
+
+
+def size_params(n_courses, tightness, seed):
+    """Parameter generator untuk satu titik sweep: dosen dan ruangan ikut bertambah dengan mata kuliah."""
+    return {
+        "n_courses": n_courses,
+        "n_lecturers": max(2, n_courses // 4),
+        "n_rooms": max(2, n_courses // 6),
+        "n_slots": 6,
+        "tightness": tightness,
+        "seed": seed,
+    }
+
+
+def solver_status(stats):
+    """Status penyelesaian yang seragam untuk semua engine."""
+    if "solver_status" in stats:
+        return stats["solver_status"]
+    if "search_complete" in stats:
+        return "Complete" if stats["search_complete"] else "Budget exhausted"
+    if stats.get("memory_limit_hit"):
+        return "Memory limit"
+    return "Finished"
+
+
+def run_trial(factory, dataset, measure_memory=False):
+    """
+    Satu percobaan pada ProblemInstance baru (cache kandidat tidak terbawa antar percobaan).
+    Waktu diukur dengan perf_counter; tracemalloc hanya aktif jika `measure_memory` karena
+    memperlambat eksekusi. Memori proses anak (mis. process pool) tidak ikut terhitung.
+    """
+    problem = ProblemInstance(dataset)
+    scheduler = factory(problem)
+    if measure_memory:
+        # Lewat helper Instrumentation: fase scheduler me-reset puncak tracemalloc
+        start_memory_tracing()
+    start = time.perf_counter()
+    try:
+        result = scheduler.solve()
+    finally:
+        wall_time = time.perf_counter() - start
+        peak = stop_memory_tracing() if measure_memory else None
+    stats = result['stats']
+    return {
+        "wall_time": wall_time,
+        "peak_memory_mb": peak / MB if peak is not None else None,
+        "scheduled_slots": stats['scheduled_slots'],
+        "total_slots_attempted": stats['total_slots_attempted'],
+        "status": solver_status(stats),
+    }
+
+
+def _summary(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"mean": None, "stdev": None, "min": None, "max": None}
+    return {
+        "mean": statistics.mean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+def run_benchmark(algorithms, sizes, trials=3, tightness=0.8, seed=0, cliff_time=None, log=print):
+    """
+    Menjalankan sweep ukuran untuk setiap algoritma. Setiap titik: `trials` percobaan berwaktu
+    ditambah satu percobaan terpisah untuk memori. Jika rata-rata waktu sebuah algoritma melewati
+    `cliff_time` detik, ukuran yang lebih besar dilewati untuk algoritma tersebut.
+    """
+    results = {"created": datetime.datetime.now().isoformat(timespec="seconds"),
+               "trials": trials, "tightness": tightness, "seed": seed, "points": []}
+    stopped = set()
+    for n_courses in sizes:
+        params = size_params(n_courses, tightness, seed)
+        dataset = generate_dataset(**params)
+        for name in algorithms:
+            if name in stopped:
+                continue
+            log(f"[{name}] {n_courses} mata kuliah: {trials} percobaan...")
+            factory = ALGORITHMS[name]
+            timed = [run_trial(factory, dataset) for _ in range(trials)]
+            memory = run_trial(factory, dataset, measure_memory=True)
+            point = {
+                "algorithm": name,
+                "n_courses": n_courses,
+                "params": params,
+                "achieved_tightness": dataset_tightness(dataset),
+                "n_sessions": timed[0]["total_slots_attempted"],
+                "wall_time": _summary([t["wall_time"] for t in timed]),
+                "peak_memory_mb": memory["peak_memory_mb"],
+                "scheduled_slots": _summary([t["scheduled_slots"] for t in timed]),
+                "status": sorted({t["status"] for t in timed}),
+                "trials": timed,
+            }
+            results["points"].append(point)
+            if cliff_time is not None and point["wall_time"]["mean"] > cliff_time:
+                log(f"[{name}] melewati {cliff_time} s pada {n_courses} mata kuliah; ukuran berikutnya dilewati.")
+                point["cliff"] = True
+                stopped.add(name)
+    return results
+
+
+def plot_results(results, output_dir):
+    """Kurva skala waktu, memori puncak, dan rasio sesi terjadwal terhadap jumlah mata kuliah."""
+    by_algo = {}
+    for point in results["points"]:
+        by_algo.setdefault(point["algorithm"], []).append(point)
+
+    charts = [
+        ("scaling_time.png", "Waktu Eksekusi vs Ukuran", "Wall time (seconds)",
+         lambda p: p["wall_time"]["mean"], lambda p: p["wall_time"]["stdev"], True),
+        ("scaling_memory.png", "Memori Puncak vs Ukuran", "Peak memory (MB)",
+         lambda p: p["peak_memory_mb"], lambda p: None, True),
+        ("scaling_scheduled.png", "Rasio Sesi Terjadwal vs Ukuran", "Scheduled / attempted sessions",
+         lambda p: p["scheduled_slots"]["mean"] / p["n_sessions"] if p["n_sessions"] else 1.0, lambda p: None, False),
+    ]
+    filenames = []
+    for filename, title, ylabel, value, error, log_scale in charts:
+        plt.figure(figsize=(10, 6))
+        for i, (name, points) in enumerate(by_algo.items()):
+            x = [p["n_courses"] for p in points]
+            y = [value(p) for p in points]
+            yerr = [error(p) for p in points]
+            plt.errorbar(x, y, yerr=None if None in yerr else yerr, marker='o', capsize=3,
+                         label=name, color=COLORS[i % len(COLORS)])
+        if log_scale:
+            plt.xscale('log')
+            plt.yscale('log')
+        plt.xlabel('Number of courses')
+        plt.ylabel(ylabel)
+        plt.title(title)
+        plt.grid(linestyle='--', alpha=0.7)
+        plt.legend()
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, filename))
+        plt.close()
+        filenames.append(filename)
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skala untuk semua scheduler di algoritma/.")
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS), default=list(ALGORITHMS),
+                        help="Algoritma yang dijalankan")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[16, 32, 64, 128, 256],
+                        help="Jumlah mata kuliah per titik sweep")
+    parser.add_argument("--trials", type=int, default=3, help="Percobaan berwaktu per titik")
+    parser.add_argument("--tightness", type=float, default=0.8, help="Rasio kebutuhan/kapasitas ruang-waktu")
+    parser.add_argument("--seed", type=int, default=0, help="Seed generator dataset")
+    parser.add_argument("--cliff-time", type=float, default=None,
+                        help="Berhenti menaikkan ukuran untuk algoritma yang rata-ratanya melewati batas ini (detik)")
+    parser.add_argument("--output-dir", default=None, help="Default: benchmark/<timestamp>")
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or os.path.join('benchmark', datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = run_benchmark(args.algorithms, args.sizes, trials=args.trials, tightness=args.tightness,
+                            seed=args.seed, cliff_time=args.cliff_time)
+    json_path = os.path.join(output_dir, "benchmark.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    plot_results(results, output_dir)
+    print(f"Hasil benchmark tersimpan di {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# generate_dataset.py (Synthetic dataset generator)
+
+import argparse
+import json
+import math
+import random
+
+import utils
+
+HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+NAMA_DEPAN = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fajar", "Gita", "Hadi", "Indah", "Joko",
+              "Kartika", "Lukman", "Maya", "Nanda", "Oki", "Putri", "Rudi", "Sari", "Taufik", "Wulan"]
+NAMA_BELAKANG = ["Wijaya", "Santoso", "Pratama", "Lestari", "Saputra", "Hidayat", "Kusuma", "Nugroho",
+                 "Permata", "Setiawan", "Rahman", "Utami", "Gunawan", "Siregar", "Harahap", "Wibowo"]
+BIDANG = ["Kecerdasan Buatan", "Rekayasa Perangkat Lunak", "Jaringan Komputer", "Basis Data",
+          "Sistem Informasi", "Keamanan Informasi", "Komputasi Awan", "Grafika Komputer"]
+TOPIK = ["Algoritma", "Struktur Data", "Basis Data", "Jaringan", "Sistem Operasi", "Pemrograman Web",
+         "Kecerdasan Buatan", "Pembelajaran Mesin", "Keamanan Siber", "Rekayasa Perangkat Lunak",
+         "Interaksi Manusia dan Komputer", "Statistika", "Matematika Diskrit", "Komputasi Awan"]
+
+DISTRIBUSI = ("uniform", "normal", "skewed")
+
+# Jendela slot yang boleh dipakai generator (menit sejak 00:00)
+JAM_PALING_AWAL = 7 * 60
+JAM_PALING_AKHIR = 21 * 60
+DURASI_SLOT_DEFAULT = 6 * 60
+
+
+def _enrollment(rng, distribution, low, high):
+    """Satu nilai jumlah mahasiswa dalam [low, high] menurut `distribution`."""
+    if distribution == "uniform":
+        value = rng.uniform(low, high)
+    elif distribution == "normal":
+        value = rng.gauss((low + high) / 2, (high - low) / 6)
+    else:
+        # skewed: banyak kelas kecil, sedikit kelas sangat besar
+        value = low + rng.expovariate(4.0 / (high - low + 1))
+    return int(min(high, max(low, round(value))))
+
+
+def generate_dataset(n_courses=32, n_lecturers=8, n_rooms=6, n_slots=6, n_semesters=8,
+                     enrollment="normal", enrollment_min=20, enrollment_max=60,
+                     room_capacity_min=30, room_capacity_max=60, sks3_ratio=0.3,
+                     tightness=None, seed=0):
+    """
+    Membuat dataset sintetis dengan skema yang sama seperti `data/dataset.json`.
+
+    n_slots slot waktu dibagi rata ke hari Senin..Minggu (satu atau lebih jendela per hari).
+    `tightness` adalah rasio kebutuhan ruang-waktu (jumlah sesi x durasi) terhadap kapasitas
+    ruang-waktu (ruangan x total durasi slot); jika diisi, panjang slot disesuaikan agar rasio
+    tersebut tercapai sejauh jendela 07:00-21:00 memungkinkan. Jika None, setiap slot 6 jam.
+    Hasilnya deterministik untuk `seed` yang sama.
+    """
+    if enrollment not in DISTRIBUSI:
+        raise ValueError(f"Unknown enrollment distribution '{enrollment}', expected one of {DISTRIBUSI}")
+    if min(n_courses, n_lecturers, n_rooms, n_slots, n_semesters) < 1:
+        raise ValueError("Semua jumlah (mata kuliah, dosen, ruangan, slot, semester) harus >= 1")
+    rng = random.Random(seed)
+
+    # Nama dosen harus unik: laporan dan check_conflicts mengelompokkan dosen berdasarkan nama
+    kombinasi = [(depan, belakang) for belakang in NAMA_BELAKANG for depan in NAMA_DEPAN]
+    rng.shuffle(kombinasi)
+    dosen = []
+    for i in range(1, n_lecturers + 1):
+        depan, belakang = kombinasi[(i - 1) % len(kombinasi)]
+        putaran = (i - 1) // len(kombinasi)
+        dosen.append({
+            "id": i,
+            "nama": f"Dr. {depan} {belakang}" + (f" {putaran + 1}" if putaran else ""),
+            "bidang_keahlian": BIDANG[rng.randrange(len(BIDANG))],
+            "email": f"{depan.lower()}.{belakang.lower()}{i}@example.com"
+        })
+
+    ruangan = []
+    for i in range(1, n_rooms + 1):
+        ruangan.append({
+            "id": i,
+            "nama": f"Ruang {chr(ord('A') + (i - 1) // 10)}{(i - 1) % 10 + 1}",
+            "kapasitas": rng.randint(room_capacity_min, room_capacity_max)
+        })
+    max_capacity = max(r["kapasitas"] for r in ruangan)
+
+    matakuliah = []
+    for i in range(1, n_courses + 1):
+        semester = (i - 1) % n_semesters + 1
+        topik = TOPIK[(i - 1) % len(TOPIK)]
+        matakuliah.append({
+            "id": i,
+            "nama": f"{topik} {(i - 1) // len(TOPIK) + 1}",
+            "semester": semester,
+            "sks": 3 if rng.random() < sks3_ratio else 2,
+            # Dosen dibagi bergilir lalu sisanya acak agar setiap dosen mengajar
+            "dosen_id": i if i <= n_lecturers else rng.randint(1, n_lecturers),
+            "jumlah_mahasiswa": _enrollment(rng, enrollment, enrollment_min, enrollment_max)
+        })
+
+    # Kebutuhan ruang-waktu dalam menit, dengan aturan pemecahan sesi yang sama seperti ProblemInstance
+    demand = 0
+    for mk in matakuliah:
+        jumlah_sesi = math.ceil(mk["jumlah_mahasiswa"] / max_capacity)
+        demand += jumlah_sesi * utils.sks_to_minutes(mk["sks"])
+
+    durasi_slot = DURASI_SLOT_DEFAULT
+    if tightness is not None:
+        durasi_slot = demand / (tightness * n_rooms * n_slots)
+    # Slot minimal memuat satu sesi 3 SKS, dibulatkan ke kelipatan 15 menit
+    durasi_slot = max(utils.sks_to_minutes(3), int(math.ceil(durasi_slot / 15)) * 15)
+
+    slots_per_day = [n_slots // len(HARI) + (1 if d < n_slots % len(HARI) else 0) for d in range(len(HARI))]
+    slot_waktu = []
+    for d, jumlah in enumerate(slots_per_day):
+        if jumlah == 0:
+            continue
+        # Beberapa jendela pada hari yang sama tidak boleh bertumpuk dan tetap di dalam 07:00-21:00
+        durasi = min(durasi_slot, (JAM_PALING_AKHIR - JAM_PALING_AWAL) // jumlah // 15 * 15)
+        mulai = 8 * 60 if jumlah == 1 and durasi + 8 * 60 <= JAM_PALING_AKHIR else JAM_PALING_AWAL
+        for _ in range(jumlah):
+            slot_waktu.append({
+                "hari": HARI[d],
+                "jam_mulai": utils.minutes_to_time(mulai),
+                "jam_selesai": utils.minutes_to_time(mulai + durasi)
+            })
+            mulai += durasi
+
+    return {
+        "dosen": dosen,
+        "matakuliah": matakuliah,
+        "slot_waktu": slot_waktu,
+        "ruangan": ruangan
+    }
+
+
+def dataset_tightness(dataset):
+    """Rasio kebutuhan ruang-waktu terhadap kapasitas ruang-waktu sebuah dataset."""
+    max_capacity = max((r["kapasitas"] for r in dataset["ruangan"]), default=1)
+    demand = sum(math.ceil(mk["jumlah_mahasiswa"] / max_capacity) * utils.sks_to_minutes(mk["sks"])
+                 for mk in dataset["matakuliah"])
+    supply = len(dataset["ruangan"]) * sum(utils.time_to_minutes(s["jam_selesai"]) - utils.time_to_minutes(s["jam_mulai"])
+                                          for s in dataset["slot_waktu"])
+    return demand / supply if supply else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Membuat dataset penjadwalan sintetis (skema data/dataset.json).")
+    parser.add_argument("-o", "--output", default="data/generated.json", help="File JSON keluaran")
+    parser.add_argument("--courses", type=int, default=32, help="Jumlah mata kuliah")
+    parser.add_argument("--lecturers", type=int, default=8, help="Jumlah dosen")
+    parser.add_argument("--rooms", type=int, default=6, help="Jumlah ruangan")
+    parser.add_argument("--slots", type=int, default=6, help="Jumlah slot waktu (dibagi ke Senin..Minggu)")
+    parser.add_argument("--semesters", type=int, default=8, help="Jumlah semester")
+    parser.add_argument("--enrollment", choices=DISTRIBUSI, default="normal", help="Distribusi jumlah mahasiswa")
+    parser.add_argument("--enrollment-min", type=int, default=20)
+    parser.add_argument("--enrollment-max", type=int, default=60)
+    parser.add_argument("--capacity-min", type=int, default=30, help="Kapasitas ruangan minimum")
+    parser.add_argument("--capacity-max", type=int, default=60, help="Kapasitas ruangan maksimum")
+    parser.add_argument("--sks3-ratio", type=float, default=0.3, help="Proporsi mata kuliah 3 SKS")
+    parser.add_argument("--tightness", type=float, default=None,
+                        help="Rasio kebutuhan terhadap kapasitas ruang-waktu (mis. 0.9); default slot 6 jam")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = generate_dataset(
+        n_courses=args.courses, n_lecturers=args.lecturers, n_rooms=args.rooms, n_slots=args.slots,
+        n_semesters=args.semesters, enrollment=args.enrollment, enrollment_min=args.enrollment_min,
+        enrollment_max=args.enrollment_max, room_capacity_min=args.capacity_min,
+        room_capacity_max=args.capacity_max, sks3_ratio=args.sks3_ratio, tightness=args.tightness, seed=args.seed
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(dataset, f, indent=2, ensure_ascii=False)
+    print(f"Dataset tersimpan di {args.output} (tightness {dataset_tightness(dataset):.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,224 @@
+import argparse
+import os
+import signal
+import sys
+import time
+import traceback
+import multiprocessing
+from multiprocessing.connection import wait
+
+try:
+    import resource # POSIX only; without it subprocess memory is simply not reported
+except ImportError:
+    resource = None
+
 import utils
+from algoritma.instrumentation import MB, start_memory_tracing, stop_memory_tracing
 
 # Import schedulers from their respective modules
 from algoritma.backtrack import BacktrackingScheduler
-from algoritma.greedy import GreedyScheduler
+from algoritma.greedy import GreedyScheduler, PortfolioGreedyScheduler
 from algoritma.ilp import ILPScheduler
-# from algoritma.dynamic_programing import DPScheduler
-
-# Load dataset
-dataset_name = 'dataset'
-files_dataset = 'data/' + dataset_name + '.json' 
-files = utils.load_dataset(files_dataset)
-
-# Initialize Algorithm Schedulers
-# It's good practice to store schedulers in a dictionary if you plan to iterate or manage them dynamically
-schedulers = {
-    "Backtracking": BacktrackingScheduler(files),
-    "Greedy": GreedyScheduler(files),
-    "ILP": ILPScheduler(files),
-    # "Dynamic Programming": DPScheduler(files),
+from algoritma.problem import ProblemInstance
+from algoritma.dynamic_programing import DPScheduler
+from algoritma.repair import RepairScheduler
+from algoritma.simulated_annealing import SimulatedAnnealingScheduler
+
+# Wall-clock budget (seconds) per algorithm process; a scheduler that exceeds it is terminated
+# and reported as Timeout. Algorithms not listed here use DEFAULT_TIMEOUT.
+DEFAULT_TIMEOUT = 300
+TIMEOUTS = {
+    "ILP": 180,
 }
 
-# Dictionary to store results from each algorithm
-algorithm_results = {}
-
-# Run each algorithm scheduler and store its results
-for algo_name, scheduler_instance in schedulers.items():
-    print(f"Running {algo_name} Scheduler...")
-    # The .solve() method is expected to return a dictionary with 'schedule' and 'stats' keys
-    # as per the generate_full_report_html function's expectation in utils.py
-    results = scheduler_instance.solve()
-    algorithm_results[algo_name] = results
-    print(f"{algo_name} Scheduler finished.")
-
-# Generate the comprehensive report
-report_filename = dataset_name + "_laporan_penjadwalan_lengkap.html"
-
-# Now, pass the consolidated algorithm_results dictionary to the report generator
-utils.generate_full_report_html(
-    files, # The original dataset is still needed for general info tables
-    algorithm_results, # This now contains all schedules and stats
-    report_filename
-)
-
-print(f"\nLaporan penjadwalan lengkap telah dibuat: {report_filename}")
+# Trace Python allocations of every algorithm for the memory columns of the report. tracemalloc
+# slows allocation-heavy code down several times and inflates execution_time, so it is off by
+# default (the timing comparison stays meaningful); enable it with --measure-memory.
+MEASURE_MEMORY = False
+
+
+def _child_peak_rss_mb():
+    """Largest peak RSS (MB) among the finished subprocesses of this process (CBC, pool workers), or None."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    if not maxrss:
+        return None
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    return maxrss / MB if sys.platform == 'darwin' else maxrss / 1024
+
+
+def _own_process_group(pid=0):
+    """
+    Makes `pid` (default: the calling process) the leader of a new process group (POSIX), so a
+    timeout can kill the algorithm together with its pool workers and solver subprocesses.
+    Called from both sides of the fork to avoid racing the deadline; an already-exited child
+    or a non-POSIX platform is ignored.
+    """
+    if hasattr(os, "setpgid"):
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass
+
+
+def _kill_process_tree(process):
+    """Terminates an algorithm process and everything it started (its process group), then reaps it."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            process.terminate()
+    else:
+        process.terminate()
+    process.join()
+
+
+def _run_scheduler(scheduler_instance, conn, measure_memory=False):
+    """Entry point of an algorithm process: solve and send ('ok', result) or ('error', message) back."""
+    _own_process_group()
+    try:
+        # The .solve() method is expected to return a dictionary with 'schedule' and 'stats' keys
+        # as per the generate_full_report_html function's expectation in utils.py
+        if measure_memory:
+            # Each algorithm runs in a fresh process, so the trace covers only its own solve()
+            start_memory_tracing()
+            result = scheduler_instance.solve()
+            result['stats']['peak_memory_mb'] = stop_memory_tracing() / MB
+            child_rss = _child_peak_rss_mb()
+            if child_rss is not None:
+                result['stats']['child_peak_rss_mb'] = child_rss
+        else:
+            result = scheduler_instance.solve()
+        conn.send(('ok', result))
+    except Exception:
+        traceback.print_exc()
+        conn.send(('error', traceback.format_exc(limit=1)))
+    finally:
+        conn.close()
+
+
+def run_schedulers(schedulers, timeouts=None, default_timeout=DEFAULT_TIMEOUT, max_workers=None,
+                   measure_memory=MEASURE_MEMORY):
+    """
+    Runs every scheduler in its own process, at most `max_workers` at a time (default: all at once,
+    so the total latency is bounded by the slowest budget instead of the sum of all of them).
+    Each process gets its own wall-clock timeout counted from its start.
+
+    With `measure_memory`, solve() runs under tracemalloc and the stats gain peak_memory_mb and
+    phase_memory_mb (Python heap) plus child_peak_rss_mb (largest subprocess, e.g. the CBC solver).
+
+    Returns (results, status): results maps name -> result dict, or None if the algorithm timed out
+    or raised; status maps the names without a result to "Timeout" or "Error".
+    """
+    timeouts = timeouts or {}
+    max_workers = max_workers or len(schedulers)
+    pending = list(schedulers.items())
+    running = {} # conn -> (name, process, deadline)
+    results = {name: None for name in schedulers}
+    status = {}
+
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                name, scheduler_instance = pending.pop(0)
+                print(f"Running {name} Scheduler...")
+                recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+                # Not a daemon: schedulers such as the portfolio greedy start their own worker processes
+                process = multiprocessing.Process(target=_run_scheduler,
+                                                  args=(scheduler_instance, send_conn, measure_memory))
+                process.start()
+                deadline = time.time() + timeouts.get(name, default_timeout)
+                running[recv_conn] = (name, process, deadline)
+                _own_process_group(process.pid)
+                send_conn.close()
+
+            # Read results as they arrive (a large result would otherwise block the child on the pipe)
+            nearest = min(deadline for _, _, deadline in running.values())
+            for conn in wait(list(running), timeout=max(0.0, nearest - time.time())):
+                name, process, _ = running.pop(conn)
+                try:
+                    kind, payload = conn.recv()
+                except EOFError:
+                    kind, payload = 'error', 'process exited without a result'
+                conn.close()
+                process.join()
+                if kind == 'ok':
+                    results[name] = payload
+                    print(f"{name} Scheduler finished.")
+                else:
+                    status[name] = "Error"
+                    print(f"{name} Scheduler failed: {payload.strip()}")
+
+            now = time.time()
+            for conn, (name, process, deadline) in list(running.items()):
+                if now >= deadline:
+                    _kill_process_tree(process)
+                    conn.close()
+                    del running[conn]
+                    status[name] = "Timeout"
+                    print(f"{name} Scheduler timed out after {timeouts.get(name, default_timeout)} s.")
+    finally:
+        # Children live in their own process groups and do not see Ctrl-C, so an interrupted
+        # driver must take down whatever is still running before it exits
+        for conn, (_, process, _) in running.items():
+            _kill_process_tree(process)
+            conn.close()
+
+    return results, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Menjalankan semua scheduler dan membuat laporan HTML.")
+    parser.add_argument("--measure-memory", action="store_true", default=MEASURE_MEMORY,
+                        help="Ukur memori puncak tiap algoritma (tracemalloc; waktu eksekusi ikut naik)")
+    args = parser.parse_args()
+
+    # Load dataset
+    dataset_name = 'dataset'
+    files_dataset = 'data/' + dataset_name + '.json'
+    files = utils.load_dataset(files_dataset)
+
+    # Compile the dataset once; every scheduler shares the same integer-indexed instance
+    problem = ProblemInstance(files)
+
+    # The Greedy schedule is cheap, so it is computed up front as the MIP start for ILP
+    # and as the starting point of the repair engine
+    greedy_start = GreedyScheduler(problem).solve()
+
+    # Initialize Algorithm Schedulers
+    # It's good practice to store schedulers in a dictionary if you plan to iterate or manage them dynamically
+    schedulers = {
+        # Parallel subtree search on every core; the split depth grows until each worker has several units
+        "Backtracking": BacktrackingScheduler(problem, workers=os.cpu_count(), split_depth=None),
+        "Greedy": GreedyScheduler(problem),
+        # Several course orderings (incl. seeded GRASP variants) on a process pool; best schedule wins
+        "Greedy Portfolio": PortfolioGreedyScheduler(problem, seed=0),
+        # The time limit keeps a hard dataset from stalling the pipeline; the best incumbent is kept
+        "ILP": ILPScheduler(problem, time_limit=120, warm_start=greedy_start),
+        # Beam mode bounds the DP layers so time and memory stay predictable on full datasets
+        "Dynamic Programming": DPScheduler(problem, beam_width=50, max_states=200000),
+        # Repairs the Greedy schedule with min-conflicts local search within a small time budget
+        "Greedy + Repair": RepairScheduler(problem, initial=greedy_start, time_limit=10),
+        "Simulated Annealing": SimulatedAnnealingScheduler(problem, time_limit=10, seed=0),
+    }
+
+    # Run the schedulers concurrently; timed-out algorithms have None as result
+    algorithm_results, algorithm_status = run_schedulers(schedulers, TIMEOUTS, measure_memory=args.measure_memory)
+
+    # Generate the comprehensive report
+    report_filename = dataset_name + "_laporan_penjadwalan_lengkap.html"
+
+    # The report is built from whatever finished; the others show up as a status row
+    utils.generate_full_report_html(
+        files, # The original dataset is still needed for general info tables
+        algorithm_results, # This now contains all schedules and stats
+        report_filename,
+        algorithm_status=algorithm_status
+    )
+
+    print(f"\nLaporan penjadwalan lengkap telah dibuat: {report_filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# regression.py (Baseline-tracking performance regression harness)
+#
+# Waktu di baseline bergantung pada mesin: perbarui baseline (--update-baseline) di mesin yang
+# sama dengan tempat pemeriksaan dijalankan. Jumlah sesi dan memori puncak tidak bergantung mesin.
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+
+import utils
+from benchmark import run_trial
+from algoritma.backtrack import BacktrackingScheduler
+from algoritma.greedy import GreedyScheduler, PortfolioGreedyScheduler
+from algoritma.ilp import ILPScheduler, MODE_TWO_STAGE
+from algoritma.dynamic_programing import DPScheduler
+from algoritma.repair import RepairScheduler
+from algoritma.simulated_annealing import SimulatedAnnealingScheduler
+
+FIXTURE_DIR = os.path.join('data', 'fixtures')
+BASELINE_PATH = os.path.join(FIXTURE_DIR, 'baseline.json')
+
+# Dataset lokal yang selalu dijalankan (tanpa akses jaringan). Fixture sintetis dibuat dengan
+# generate_dataset.py dan disimpan apa adanya agar perubahan generator tidak menggeser baseline.
+FIXTURES = {
+    "dataset": os.path.join('data', 'dataset.json'),
+    "small": os.path.join(FIXTURE_DIR, 'small.json'),
+    "tight": os.path.join(FIXTURE_DIR, 'tight.json'),
+    "medium": os.path.join(FIXTURE_DIR, 'medium.json'),
+}
+
+# Konfigurasi deterministik: anggaran berupa node/iterasi, bukan detik, sehingga jumlah sesi
+# terjadwal tidak bergantung pada kecepatan mesin dan waktu eksekusi tetap bermakna.
+ALGORITHMS = {
+    "greedy": lambda problem: GreedyScheduler(problem),
+    "portfolio": lambda problem: PortfolioGreedyScheduler(problem, seed=0, workers=1),
+    "backtracking": lambda problem: BacktrackingScheduler(problem, node_limit=5000, time_limit=None),
+    "ilp": lambda problem: ILPScheduler(problem, mode=MODE_TWO_STAGE, time_limit=30, msg=False),
+    "dp": lambda problem: DPScheduler(problem, beam_width=20, max_states=50000),
+    "repair": lambda problem: RepairScheduler(problem, time_limit=None, max_iterations=500),
+    "annealing": lambda problem: SimulatedAnnealingScheduler(problem, time_limit=None, max_iterations=50000, seed=0),
+}
+
+
+def measure(fixtures, algorithms, trials):
+    """Menjalankan setiap (fixture, algoritma): `trials` percobaan berwaktu + satu percobaan memori."""
+    results = {}
+    for fixture in fixtures:
+        dataset = utils.load_dataset(FIXTURES[fixture])
+        for name in algorithms:
+            print(f"[{fixture}] {name}...", flush=True)
+            timed = [run_trial(ALGORITHMS[name], dataset) for _ in range(trials)]
+            memory = run_trial(ALGORITHMS[name], dataset, measure_memory=True)
+            results[f"{fixture}/{name}"] = {
+                "times": [t["wall_time"] for t in timed],
+                "peak_memory_mb": memory["peak_memory_mb"],
+                "scheduled_slots": min(t["scheduled_slots"] for t in timed),
+                "status": timed[0]["status"],
+            }
+    return results
+
+
+def welch_t(current, baseline):
+    """Statistik t Welch (positif = current lebih lambat); 0.0 jika salah satu sampel kurang dari 2."""
+    if len(current) < 2 or len(baseline) < 2:
+        return 0.0
+    var = statistics.variance(current) / len(current) + statistics.variance(baseline) / len(baseline)
+    diff = statistics.mean(current) - statistics.mean(baseline)
+    if var == 0:
+        return math.copysign(math.inf, diff) if diff else 0.0
+    return diff / math.sqrt(var)
+
+
+def compare(current, baseline, time_tolerance=0.25, memory_tolerance=0.20, sessions_tolerance=0,
+            t_critical=2.0, min_time_delta=0.02):
+    """
+    Membandingkan hasil dengan baseline. Waktu dianggap regresi hanya jika rata-rata naik lebih dari
+    `time_tolerance` (relatif) dan `min_time_delta` detik (absolut) serta t Welch > `t_critical`.
+    Memori regresi jika naik lebih dari `memory_tolerance`; sesi terjadwal regresi jika turun lebih
+    dari `sessions_tolerance`. Mengembalikan list (key, metrik, baseline, current, keterangan).
+    """
+    regressions = []
+    for key, cur in current.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"  {key}: tidak ada di baseline, dilewati")
+            continue
+
+        if cur["scheduled_slots"] < base["scheduled_slots"] - sessions_tolerance:
+            regressions.append((key, "scheduled_slots", base["scheduled_slots"], cur["scheduled_slots"], "lebih sedikit"))
+
+        base_mean, cur_mean = statistics.mean(base["times"]), statistics.mean(cur["times"])
+        t_stat = welch_t(cur["times"], base["times"])
+        if (cur_mean > base_mean * (1 + time_tolerance) and cur_mean - base_mean > min_time_delta
+                and t_stat > t_critical):
+            regressions.append((key, "wall_time", base_mean, cur_mean, f"t={t_stat:.2f}"))
+
+        base_mem, cur_mem = base.get("peak_memory_mb"), cur.get("peak_memory_mb")
+        if base_mem is not None and cur_mem is not None and cur_mem > base_mem * (1 + memory_tolerance):
+            regressions.append((key, "peak_memory_mb", base_mem, cur_mem, f"+{(cur_mem / base_mem - 1) * 100:.0f}%"))
+
+        print(f"  {key}: sesi {base['scheduled_slots']} -> {cur['scheduled_slots']}, "
+              f"waktu {base_mean:.4f} -> {cur_mean:.4f} s (t={t_stat:.2f}), "
+              f"memori {base_mem if base_mem is not None else float('nan'):.2f} -> {cur_mem if cur_mem is not None else float('nan'):.2f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Membandingkan performa scheduler dengan baseline tersimpan.")
+    parser.add_argument("--fixtures", nargs="+", choices=sorted(FIXTURES), default=list(FIXTURES))
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--trials", type=int, default=5, help="Percobaan berwaktu per (fixture, algoritma)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="File baseline JSON")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Menulis hasil saat ini sebagai baseline (digabung dengan entri lain yang sudah ada)")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Kenaikan waktu relatif yang ditoleransi")
+    parser.add_argument("--memory-tolerance", type=float, default=0.20, help="Kenaikan memori relatif yang ditoleransi")
+    parser.add_argument("--sessions-tolerance", type=int, default=0, help="Penurunan sesi terjadwal yang ditoleransi")
+    parser.add_argument("--t-critical", type=float, default=2.0, help="Ambang statistik t Welch untuk regresi waktu")
+    parser.add_argument("--min-time-delta", type=float, default=0.02,
+                        help="Kenaikan waktu absolut minimum (detik); jitter di bawah ini diabaikan")
+    args = parser.parse_args()
+
+    current = measure(args.fixtures, args.algorithms, args.trials)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(current)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline diperbarui: {args.baseline} ({len(current)} entri)")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline tidak ditemukan: {args.baseline}. Jalankan dengan --update-baseline terlebih dahulu.")
+        return 2
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print("Perbandingan dengan baseline:")
+    regressions = compare(current, baseline, time_tolerance=args.time_tolerance,
+                          memory_tolerance=args.memory_tolerance, sessions_tolerance=args.sessions_tolerance,
+                          t_critical=args.t_critical, min_time_delta=args.min_time_delta)
+    if regressions:
+        print(f"\n{len(regressions)} regresi ditemukan:")
+        for key, metric, base, cur, note in regressions:
+            print(f"  REGRESI {key} {metric}: {base:.4f} -> {cur:.4f} ({note})")
+        return 1
+    print("\nTidak ada regresi.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
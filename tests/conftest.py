@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import utils
+from algoritma.problem import ProblemInstance
+
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+
+
+@pytest.fixture(scope="session")
+def load_dataset():
+    """Memuat dataset mentah (salinan baru tiap panggilan) dari path relatif terhadap `data/`."""
+    def load(*parts):
+        return utils.load_dataset(os.path.join(DATA_DIR, *parts))
+    return load
+
+
+@pytest.fixture(scope="session")
+def load_problem(load_dataset):
+    """Seperti `load_dataset`, tetapi langsung mengompilasinya menjadi ProblemInstance."""
+    def load(*parts):
+        return ProblemInstance(load_dataset(*parts))
+    return load
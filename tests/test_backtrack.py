@@ -0,0 +1,10 @@
+import utils
+from algoritma.backtrack import BacktrackingScheduler
+
+
+def test_automatic_split_gives_every_worker_several_units(load_problem):
+    problem = load_problem('fixtures', 'tight.json')
+    scheduler = BacktrackingScheduler(problem, time_limit=1, workers=8, split_depth=None)
+    result = scheduler.solve()
+    assert result['stats']['counters']['work_units'] >= 4 * 8
+    assert utils.check_conflicts(result['schedule']) == []
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+import utils
+from algoritma.dynamic_programing import DPScheduler
+
+
+@pytest.fixture(scope="module")
+def problem(load_problem):
+    return load_problem('dataset.json')
+
+
+@pytest.mark.parametrize("beam_width", [None, 50])
+def test_max_states_is_a_hard_layer_cap(problem, beam_width):
+    stats = DPScheduler(problem, beam_width=beam_width, max_states=100).solve()['stats']
+    assert max(stats['layer_sizes']) <= 100
+    assert stats['capped_layers'] > 0
+    assert stats['conflicts'] == 0
+
+
+def test_schedule_is_conflict_free_without_caps(problem):
+    result = DPScheduler(problem, beam_width=20).solve()
+    assert utils.check_conflicts(result['schedule']) == []
+    assert result['stats']['scheduled_slots'] == len(result['schedule'])
+
+
+@pytest.mark.parametrize("beam_width", [None, 50])
+def test_memory_limit_never_empties_the_layer(problem, beam_width):
+    result = DPScheduler(problem, beam_width=beam_width, memory_limit_mb=1).solve()
+    stats = result['stats']
+    assert stats['memory_limit_hit']
+    assert stats['capped_layers'] > 0
+    assert min(stats['layer_sizes']) > 0
+    assert stats['scheduled_slots'] > 0
+    assert utils.check_conflicts(result['schedule']) == []
+
+
+def test_beam_configuration_of_main_solves_the_real_dataset(problem):
+    # Mode eksak tidak selesai pada dataset.json; konfigurasi yang didukung adalah mode beam di main.py
+    start = time.time()
+    result = DPScheduler(problem, beam_width=50, max_states=200000).solve()
+    assert time.time() - start < 60
+    assert result['stats']['scheduled_slots'] > 0
+    assert utils.check_conflicts(result['schedule']) == []
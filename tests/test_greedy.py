@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import utils
+from algoritma.greedy import GreedyScheduler
+from algoritma.problem import ProblemInstance
+
+
+def _reference_greedy(dataset):
+    """Greedy versi awal: waktu mulai per 15 menit dari awal slot dan cek tumpang tindih per menit."""
+    kapasitas_max = max(r["kapasitas"] for r in dataset["ruangan"])
+    starts = sorted(((utils.HARI_ORDER.get(slot["hari"], 99), slot["hari"], mulai, utils.time_to_minutes(slot["jam_selesai"]))
+                     for slot in dataset["slot_waktu"]
+                     for mulai in range(utils.time_to_minutes(slot["jam_mulai"]), utils.time_to_minutes(slot["jam_selesai"]), 15)),
+                    key=lambda s: (s[0], s[2]))
+    used = {}
+    placements = set()
+
+    def free(key, mulai, selesai):
+        return all(selesai <= a or mulai >= b for a, b in used.get(key, ()))
+
+    for mk in sorted(dataset["matakuliah"], key=lambda mk: mk["jumlah_mahasiswa"], reverse=True):
+        durasi = utils.sks_to_minutes(mk["sks"])
+        jumlah_sesi = -(-mk["jumlah_mahasiswa"] // kapasitas_max) if mk["jumlah_mahasiswa"] > 0 else 0
+        peserta = -(-mk["jumlah_mahasiswa"] // jumlah_sesi) if jumlah_sesi else 0
+        ruangan = sorted(dataset["ruangan"], key=lambda r: abs(r["kapasitas"] - peserta))
+        for sesi_ke in range(1, jumlah_sesi + 1):
+            found = False
+            for _, hari, mulai, slot_end in starts:
+                selesai = mulai + durasi
+                if selesai > slot_end:
+                    continue
+                for ruang in ruangan:
+                    if ruang["kapasitas"] < peserta:
+                        continue
+                    if free(("r", hari, ruang["id"]), mulai, selesai) and free(("d", hari, mk["dosen_id"]), mulai, selesai):
+                        used.setdefault(("r", hari, ruang["id"]), []).append((mulai, selesai))
+                        used.setdefault(("d", hari, mk["dosen_id"]), []).append((mulai, selesai))
+                        placements.add((mk["nama"], sesi_ke, hari, utils.minutes_to_time(mulai), ruang["nama"]))
+                        found = True
+                        break
+                if found:
+                    break
+    return placements
+
+
+def _placements(schedule):
+    return {(e["matakuliah"], e["sesi"], e["hari"], e["jam_mulai"], e["ruangan"]) for e in schedule}
+
+
+def _random_slots(rng):
+    slots = []
+    for hari in ["Senin", "Selasa", "Rabu", "Kamis", "Jumat"]:
+        for _ in range(rng.randint(1, 2)):
+            mulai = rng.randrange(7 * 60, 10 * 60, 5)
+            slots.append({"hari": hari, "jam_mulai": utils.minutes_to_time(mulai),
+                          "jam_selesai": utils.minutes_to_time(mulai + rng.randrange(90, 300, 5))})
+    return slots
+
+
+def test_off_grid_fixture_matches_reference_placements(load_dataset):
+    dataset = load_dataset('fixtures', 'off_grid.json')
+    result = GreedyScheduler(ProblemInstance(dataset)).solve()
+    assert _placements(result['schedule']) == _reference_greedy(dataset)
+    assert utils.check_conflicts(result['schedule']) == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_earliest_fit_matches_scan_on_unaligned_slots(load_dataset, seed):
+    # Slot mulai di menit kelipatan 5 acak, termasuk slot yang saling tumpang tindih pada hari yang sama
+    dataset = load_dataset('fixtures', 'small.json')
+    dataset['slot_waktu'] = _random_slots(random.Random(seed))
+    result = GreedyScheduler(ProblemInstance(dataset)).solve()
+    assert _placements(result['schedule']) == _reference_greedy(dataset)
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+import utils
+from algoritma.greedy import GreedyScheduler
+from algoritma.ilp import ILPScheduler, MODE_TWO_STAGE, _solve_component
+
+
+@pytest.fixture(scope="module")
+def small(load_problem):
+    return load_problem('fixtures', 'small.json')
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_two_stage_places_every_timed_session(small, lazy):
+    result = ILPScheduler(small, mode=MODE_TWO_STAGE, lazy=lazy, msg=False).solve()
+    stats = result['stats']
+    assert stats['scheduled_slots'] == stats['total_slots_attempted']
+    assert stats['objective'] == stats['scheduled_slots']
+    assert utils.check_conflicts(result['schedule']) == []
+
+
+def test_two_stage_reports_placed_sessions_when_rooms_run_out(small):
+    scheduler = ILPScheduler(small, mode=MODE_TWO_STAGE, lazy=True, msg=False, max_room_rounds=1)
+    # Tanpa pencocokan eksak dan tanpa putaran ulang, sebagian sesi tahap 1 bisa tidak kebagian ruangan
+    scheduler._match_day_exact = lambda hari, timed, time_limit=None: {}
+    stats = scheduler.solve()['stats']
+    assert stats['room_unmatched'] > 0
+    assert stats['objective'] == stats['scheduled_slots']
+    assert stats['solver_status'] != "Optimal"
+    assert stats['gap'] > 0
+
+
+@pytest.mark.parametrize("mode", ["full", MODE_TWO_STAGE])
+def test_partial_greedy_schedule_is_accepted_as_mip_start(load_problem, mode):
+    problem = load_problem('fixtures', 'tight.json')
+    greedy = GreedyScheduler(problem).solve()
+    assert greedy['stats']['scheduled_slots'] < greedy['stats']['total_slots_attempted']
+
+    stats = ILPScheduler(problem, mode=mode, warm_start=greedy, msg=False).solve()['stats']
+    assert stats['warm_start_accepted'] is True
+    assert stats['scheduled_slots'] >= greedy['stats']['scheduled_slots']
+
+
+def test_components_share_one_deadline(small, monkeypatch):
+    budgets = []
+
+    def fake_solve(self):
+        budgets.append(self.time_limit)
+        return {'schedule': [], 'stats': {}}
+
+    monkeypatch.setattr(ILPScheduler, "solve", fake_solve)
+    deadline = time.time() + 12
+    for waves_left in (3, 2, 1):
+        _solve_component((small, {"msg": False}, deadline, waves_left))
+    assert [round(b) for b in budgets] == [4, 6, 12]
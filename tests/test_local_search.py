@@ -0,0 +1,50 @@
+import pytest
+
+import utils
+from algoritma.problem import ProblemInstance
+from algoritma.repair import RepairScheduler
+from algoritma.simulated_annealing import SimulatedAnnealingScheduler
+
+SCHEDULERS = {
+    "repair": lambda problem: RepairScheduler(problem, time_limit=None, max_iterations=300),
+    "annealing": lambda problem: SimulatedAnnealingScheduler(problem, time_limit=None, max_iterations=20000, seed=3),
+}
+
+
+def _off_grid_dataset(load_dataset):
+    # Tick 0 berada di 08:00 (Senin), sehingga Selasa 08:10 tidak jatuh di grid 15 menit
+    dataset = load_dataset('dataset.json')
+    dataset['slot_waktu'] = [
+        {"hari": "Senin", "jam_mulai": "08:00", "jam_selesai": "09:00"},
+        {"hari": "Selasa", "jam_mulai": "08:10", "jam_selesai": "17:00"},
+    ]
+    return dataset
+
+
+def _outside_slots(schedule, slots):
+    outside = []
+    for entry in schedule:
+        mulai, selesai = utils.time_to_minutes(entry['jam_mulai']), utils.time_to_minutes(entry['jam_selesai'])
+        if not any(slot['hari'] == entry['hari']
+                   and utils.time_to_minutes(slot['jam_mulai']) <= mulai
+                   and selesai <= utils.time_to_minutes(slot['jam_selesai']) for slot in slots):
+            outside.append(entry)
+    return outside
+
+
+@pytest.mark.parametrize("name", sorted(SCHEDULERS))
+def test_off_grid_slot_start_is_respected(load_dataset, name):
+    dataset = _off_grid_dataset(load_dataset)
+    result = SCHEDULERS[name](ProblemInstance(dataset)).solve()
+    assert result['stats']['scheduled_slots'] > 0
+    assert _outside_slots(result['schedule'], dataset['slot_waktu']) == []
+    assert utils.check_conflicts(result['schedule']) == []
+
+
+def test_repair_tabu_list_stays_bounded(load_problem):
+    problem = load_problem('fixtures', 'tight.json')
+    scheduler = RepairScheduler(problem, time_limit=None, max_iterations=20000)
+    scheduler.solve()
+    # Hanya entri yang ditambahkan dalam `tabu_tenure` iterasi terakhir yang masih disimpan
+    assert scheduler.iterations > 10 * scheduler.tabu_tenure
+    assert len(scheduler.tabu) <= scheduler.tabu_tenure * len(problem.sessions)
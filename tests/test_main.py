@@ -0,0 +1,56 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import main
+
+
+class _SleepingScheduler:
+    """Scheduler yang menjalankan subprocess lalu tidur lama; PID-nya ditulis ke `pid_file`."""
+
+    def __init__(self, pid_file):
+        self.pid_file = pid_file
+
+    def solve(self):
+        helper = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        with open(self.pid_file, "w") as f:
+            f.write(f"{os.getpid()} {helper.pid}")
+        time.sleep(60)
+        return {"schedule": [], "stats": {}}
+
+
+def _alive(pid):
+    """True jika proses masih berjalan (zombie yang belum di-reap dianggap mati)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg") or not os.path.isdir("/proc"), reason="butuh process group POSIX")
+def test_interrupt_kills_running_schedulers(tmp_path):
+    pid_file = tmp_path / "pids"
+    schedulers = {"Sleep": _SleepingScheduler(str(pid_file))}
+
+    def interrupt():
+        while not pid_file.exists() or not pid_file.read_text():
+            time.sleep(0.05)
+        os.kill(os.getpid(), signal.SIGINT)
+
+    threading.Thread(target=interrupt, daemon=True).start()
+    start = time.time()
+    with pytest.raises(KeyboardInterrupt):
+        main.run_schedulers(schedulers, default_timeout=30, measure_memory=False)
+    assert time.time() - start < 10
+
+    deadline = time.time() + 5
+    pids = [int(pid) for pid in pid_file.read_text().split()]
+    while any(_alive(pid) for pid in pids) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not any(_alive(pid) for pid in pids)
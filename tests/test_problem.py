@@ -0,0 +1,16 @@
+import utils
+from algoritma.greedy import GreedyScheduler
+
+
+def test_failure_reasons_count_each_probe_once(load_problem):
+    problem = load_problem('fixtures', 'tight.json')
+    greedy = GreedyScheduler(problem)
+    failed = greedy.solve()['stats']['failed_details']
+    assert failed
+
+    n_probes = sum(problem.start_tick_mask(d, 1).bit_count() for d in range(len(problem.days))) * len(problem.room_caps)
+    for entry in failed:
+        codes = entry['reason_codes']
+        if utils.ALASAN_TIDAK_OPTIMAL in codes:
+            continue
+        assert sum(codes.values()) == n_probes
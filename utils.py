@@ -1,6 +1,7 @@
 import json
 import matplotlib.pyplot as plt
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+import heapq
 import os
 import random
 import datetime
@@ -52,38 +53,90 @@ def get_usage_counts(schedule, key_name_or_func):
 HARI_ORDER = {"Senin": 1, "Selasa": 2, "Rabu": 3, "Kamis": 4, "Jumat": 5, "Sabtu": 6, "Minggu": 7}
 
 # Konflik Checker
-def check_conflicts(schedule):
-    """Memeriksa konflik dalam jadwal."""
-    konflik = []
-    
-    ruangan_slots = defaultdict(list)
-    dosen_slots = defaultdict(list)
+# Satu konflik terstruktur: dua sesi yang memakai sumber daya (ruangan/dosen) yang sama pada waktu yang beririsan
+Konflik = namedtuple("Konflik", ["jenis", "sumber", "hari", "mulai1", "selesai1", "matakuliah1", "mulai2", "selesai2", "matakuliah2"])
 
+def check_conflicts(schedule):
+    """
+    Memeriksa konflik dalam jadwal dengan sort-and-sweep per (hari, ruangan) dan (hari, dosen).
+    Mengembalikan list `Konflik` (setiap pasangan satu kali), O(n log n + jumlah konflik).
+    Gunakan `format_conflicts` jika pesan teks dibutuhkan.
+    """
+    groups = defaultdict(list)
     for item in schedule:
-        hari = item["hari"]
         jam_mulai = time_to_minutes(item["jam_mulai"])
         jam_selesai = time_to_minutes(item["jam_selesai"])
-        ruangan = item["ruangan"]
-        dosen = item["dosen"]
-        
-        ruangan_slots[hari].append((ruangan, jam_mulai, jam_selesai, item["matakuliah"]))
-        dosen_slots[hari].append((dosen, jam_mulai, jam_selesai, item["matakuliah"]))
-
-    for hari, sessions in ruangan_slots.items():
-        for i, (ruang1, mulai1, selesai1, mk1) in enumerate(sessions):
-            for j, (ruang2, mulai2, selesai2, mk2) in enumerate(sessions):
-                if i != j and ruang1 == ruang2:
-                    if not (selesai1 <= mulai2 or mulai1 >= selesai2):
-                        konflik.append(f"[KONFLIK RUANGAN] {ruang1} - {hari} {minutes_to_time(mulai1)}-{minutes_to_time(selesai1)} ({mk1}) vs {minutes_to_time(mulai2)}-{minutes_to_time(selesai2)} ({mk2})")
+        groups[("ruangan", item["hari"], item["ruangan"])].append((jam_mulai, jam_selesai, item["matakuliah"]))
+        groups[("dosen", item["hari"], item["dosen"])].append((jam_mulai, jam_selesai, item["matakuliah"]))
 
-    for hari, sessions in dosen_slots.items():
-        for i, (dosen1, mulai1, selesai1, mk1) in enumerate(sessions):
-            for j, (dosen2, mulai2, selesai2, mk2) in enumerate(sessions):
-                if i != j and dosen1 == dosen2:
-                    if not (selesai1 <= mulai2 or mulai1 >= selesai2):
-                        konflik.append(f"[KONFLIK DOSEN] {dosen1} - {hari} {minutes_to_time(mulai1)}-{minutes_to_time(selesai1)} ({mk1}) vs {minutes_to_time(mulai2)}-{minutes_to_time(selesai2)} ({mk2})")
-
-    return list(set(konflik))
+    konflik = []
+    for (jenis, hari, sumber), sessions in groups.items():
+        if len(sessions) < 2:
+            continue
+        sessions.sort()
+        # Min-heap sesi aktif berdasarkan jam selesai; semua yang masih aktif beririsan dengan sesi baru
+        active = []
+        for mulai, selesai, mk in sessions:
+            while active and active[0][0] <= mulai:
+                heapq.heappop(active)
+            for selesai_aktif, mulai_aktif, mk_aktif in active:
+                konflik.append(Konflik(jenis, sumber, hari, mulai_aktif, selesai_aktif, mk_aktif, mulai, selesai, mk))
+            heapq.heappush(active, (selesai, mulai, mk))
+
+    return konflik
+
+def format_conflict(konflik):
+    """Mengubah satu `Konflik` menjadi pesan teks untuk laporan."""
+    label = "KONFLIK RUANGAN" if konflik.jenis == "ruangan" else "KONFLIK DOSEN"
+    return (f"[{label}] {konflik.sumber} - {konflik.hari} {minutes_to_time(konflik.mulai1)}-{minutes_to_time(konflik.selesai1)} ({konflik.matakuliah1})"
+            f" vs {minutes_to_time(konflik.mulai2)}-{minutes_to_time(konflik.selesai2)} ({konflik.matakuliah2})")
+
+def format_conflicts(konflik_list):
+    """Mengubah list `Konflik` menjadi list pesan teks."""
+    return [format_conflict(k) for k in konflik_list]
+
+# Kode alasan kegagalan penempatan sesi
+# Scheduler hanya mencatat kode beserta jumlah percobaan penempatan yang gagal karena kode tersebut
+# (field 'reason_codes' = {kode: jumlah}); teks baru dibentuk saat laporan dibuat.
+ALASAN_RUANGAN_KECIL = 1      # kapasitas ruangan < jumlah mahasiswa sesi
+ALASAN_RUANGAN_BENTROK = 2    # ruangan sudah terpakai pada interval tersebut
+ALASAN_DOSEN_BENTROK = 3      # dosen sudah mengajar pada interval tersebut
+ALASAN_DURASI_MELEBIHI = 4    # durasi sesi melebihi sisa slot waktu
+ALASAN_TIDAK_OPTIMAL = 5      # masih ada penempatan bebas, tetapi tidak dipilih algoritma
+
+ALASAN_TEKS = {
+    ALASAN_RUANGAN_KECIL: "Ruangan terlalu kecil",
+    ALASAN_RUANGAN_BENTROK: "Ruangan bentrok",
+    ALASAN_DOSEN_BENTROK: "Dosen bentrok",
+    ALASAN_DURASI_MELEBIHI: "Durasi melebihi slot waktu",
+}
+
+def format_failure_reason(item):
+    """
+    Teks alasan kegagalan untuk satu entri sesi gagal. Entri dengan 'reason' (teks jadi) dipakai apa adanya;
+    selain itu teks dibentuk dari 'reason_codes'.
+    """
+    if item.get('reason'):
+        return item['reason']
+    codes = item.get('reason_codes')
+    if not codes:
+        return 'Tidak ada alasan spesifik disebutkan.'
+    if codes.get(ALASAN_TIDAK_OPTIMAL):
+        return "Tidak dapat dijadwalkan: Tidak optimal secara global dengan sesi lain yang lebih prioritas."
+    parts = [f"{ALASAN_TEKS.get(code, f'Kode {code}')} ({jumlah} percobaan)"
+             for code, jumlah in sorted(codes.items()) if jumlah]
+    return "Tidak dapat dijadwalkan: " + "; ".join(parts) + "."
+
+
+def format_memory(stats):
+    """Teks memori puncak untuk tabel ringkasan: heap Python, ditambah RSS proses anak jika tercatat."""
+    peak = stats.get('peak_memory_mb')
+    if peak is None:
+        return "-"
+    text = f"{peak:.2f}"
+    if stats.get('child_peak_rss_mb'):
+        text += f" <small>(proses anak: {stats['child_peak_rss_mb']:.1f} RSS)</small>"
+    return text
 
 
 # Visualization Functions
@@ -96,7 +149,8 @@ def performance_comparison(algorithm_results, report_dir, filename="performance_
     times = [result['stats']['execution_time'] for result in algorithm_results.values()]
 
     plt.figure(figsize=(12, 6))
-    bars = plt.bar(algorithms, times, color=['skyblue', 'salmon', 'lightgreen', 'gold'][:len(algorithms)])
+    colors = ['skyblue', 'salmon', 'lightgreen', 'gold', 'plum', 'darkseagreen', 'lightcoral', 'cornflowerblue']
+    bars = plt.bar(algorithms, times, color=[colors[i % len(colors)] for i in range(len(algorithms))])
     plt.ylabel('Execution Time (seconds)')
     plt.title('Performa Eksekusi Algoritma Penjadwalan')
     plt.grid(axis='y', linestyle='--', alpha=0.7)
@@ -110,6 +164,45 @@ def performance_comparison(algorithm_results, report_dir, filename="performance_
     plt.savefig(os.path.join(report_dir, filename))
     plt.close()
 
+def memory_comparison(algorithm_results, report_dir, filename="memory_comparison.png"):
+    """
+    Membuat grafik perbandingan memori puncak untuk algoritma yang mencatat 'peak_memory_mb'
+    (heap Python via tracemalloc). Jika ada 'child_peak_rss_mb' (RSS proses anak terbesar, mis.
+    solver CBC), nilainya digambar sebagai batang kedua.
+    """
+    measured = {name: result['stats'] for name, result in algorithm_results.items()
+                if result['stats'].get('peak_memory_mb') is not None}
+    algorithms = list(measured)
+    heap = [stats['peak_memory_mb'] for stats in measured.values()]
+    child = [stats.get('child_peak_rss_mb') or 0 for stats in measured.values()]
+    has_child = any(child)
+
+    plt.figure(figsize=(12, 6))
+    colors = ['skyblue', 'salmon', 'lightgreen', 'gold', 'plum', 'darkseagreen', 'lightcoral', 'cornflowerblue']
+    x = range(len(algorithms))
+    width = 0.4 if has_child else 0.8
+    offset = width / 2 if has_child else 0
+    bars = plt.bar([i - offset for i in x], heap, width,
+                   color=[colors[i % len(colors)] for i in x], label='Python heap (tracemalloc)')
+    for bar, value in zip(bars, heap):
+        plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'{value:.2f}', ha='center', va='bottom')
+    if has_child:
+        child_bars = plt.bar([i + offset for i in x], child, width, color='lightgray', hatch='//',
+                             label='Subprocess peak RSS')
+        for bar, value in zip(child_bars, child):
+            if value:
+                plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'{value:.1f}', ha='center', va='bottom')
+        plt.legend()
+    plt.xticks(list(x), algorithms)
+    plt.ylabel('Peak Memory (MB)')
+    plt.title('Memori Puncak Algoritma Penjadwalan')
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+
+    plt.tight_layout()
+    os.makedirs(report_dir, exist_ok=True)
+    plt.savefig(os.path.join(report_dir, filename))
+    plt.close()
+
 def schedule_comparison(algorithm_results, report_dir, filename="schedule_comparison.png"):
     """
     Membuat grafik perbandingan jumlah sesi terjadwal per hari untuk berbagai algoritma.
@@ -308,7 +401,7 @@ def generate_html_failed_sessions_content(failed_sessions):
             dosen_name = item.get('dosen', 'N/A')
             sesi_ke = item.get('sesi', 'N/A')
             jumlah_mahasiswa = item.get('jumlah_mahasiswa', 'N/A')
-            reason = item.get('reason', 'Tidak ada alasan spesifik disebutkan.')
+            reason = format_failure_reason(item)
             html_content += f"""
             <tr class="conflict-row">
                 <td>{mk_name}</td>
@@ -323,15 +416,23 @@ def generate_html_failed_sessions_content(failed_sessions):
     return html_content
 
 # MAIN FUNCTION TO GENERATE FULL REPORT
-def generate_full_report_html(dataset, algorithm_results, output_filename="laporan_penjadwalan.html", template_path="./data/report_template.html"):
+def generate_full_report_html(dataset, algorithm_results, output_filename="laporan_penjadwalan.html", template_path="./data/report_template.html", algorithm_status=None):
     """
     Menghasilkan laporan HTML lengkap yang membandingkan hasil dari berbagai algoritma penjadwalan.
     dataset: dictionary berisi data mentah (matakuliah, dosen, slot_waktu, ruangan).
     algorithm_results: dictionary berisi hasil dari setiap algoritma.
                        Contoh: {'Backtracking': {'schedule': [...], 'stats': {...}}, ...}
+                       Nilai None berarti algoritma tidak selesai (mis. timeout); algoritma tersebut
+                       hanya muncul sebagai baris status di tabel statistik.
     output_filename: Nama file HTML yang akan dihasilkan.
     template_path: Path ke file template HTML.
+    algorithm_status: dictionary opsional nama algoritma -> label status untuk hasil None
+                      (default "Timeout").
     """
+    algorithm_status = algorithm_status or {}
+    all_results = algorithm_results
+    # Grafik dan tab hanya dibuat dari algoritma yang selesai
+    algorithm_results = {name: result for name, result in all_results.items() if result is not None}
     
     # Generate a unique directory name based on timestamp
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -364,20 +465,33 @@ def generate_full_report_html(dataset, algorithm_results, output_filename="lapor
 
     # 4. Generate all visualization graphs, passing report_dir
     perf_img = "performance_comparison.png"
+    memory_img = "memory_comparison.png"
     schedule_day_img = "schedule_comparison.png"
     mk_usage_img = "matakuliah_usage_comparison.png"
     room_usage_img = "ruangan_usage_comparison.png"
     slot_usage_img = "slot_waktu_usage_comparison.png"
 
-    # Pass the entire algorithm_results dictionary to the visualization functions
-    performance_comparison(algorithm_results, report_dir, filename=perf_img)
-    schedule_comparison(algorithm_results, report_dir, filename=schedule_day_img)
-    compare_usage(algorithm_results, "matakuliah", 'Perbandingan Penggunaan Mata Kuliah', 'Number of Sessions Scheduled', report_dir, filename=mk_usage_img)
-    compare_usage(algorithm_results, "ruangan", 'Perbandingan Penggunaan Ruangan', 'Number of Sessions Scheduled', report_dir, filename=room_usage_img)
-    
-    def get_slot_key(item):
-        return f"{item['hari']} {item['jam_mulai']}"
-    compare_usage(algorithm_results, get_slot_key, 'Perbandingan Penggunaan Slot Waktu', 'Number of Sessions Scheduled', report_dir, filename=slot_usage_img)
+    # Pass the finished algorithm results to the visualization functions
+    if algorithm_results:
+        performance_comparison(algorithm_results, report_dir, filename=perf_img)
+        schedule_comparison(algorithm_results, report_dir, filename=schedule_day_img)
+        compare_usage(algorithm_results, "matakuliah", 'Perbandingan Penggunaan Mata Kuliah', 'Number of Sessions Scheduled', report_dir, filename=mk_usage_img)
+        compare_usage(algorithm_results, "ruangan", 'Perbandingan Penggunaan Ruangan', 'Number of Sessions Scheduled', report_dir, filename=room_usage_img)
+
+        def get_slot_key(item):
+            return f"{item['hari']} {item['jam_mulai']}"
+        compare_usage(algorithm_results, get_slot_key, 'Perbandingan Penggunaan Slot Waktu', 'Number of Sessions Scheduled', report_dir, filename=slot_usage_img)
+
+    # Grafik memori hanya jika ada algoritma yang dijalankan dengan pelacakan memori
+    memory_chart_html = ""
+    if any(result['stats'].get('peak_memory_mb') is not None for result in algorithm_results.values()):
+        memory_comparison(algorithm_results, report_dir, filename=memory_img)
+        memory_chart_html = f"""
+        <h3 class="mt-4">Perbandingan Memori Puncak Algoritma</h3>
+        <div class="image-container text-center my-4">
+            <img src="{memory_img}" class="img-fluid rounded shadow-sm" alt="Perbandingan Memori Puncak">
+        </div>
+        """
 
     # Define headers for dataset tables
     mk_headers = {"ID": "id", "Nama": "nama", "SKS": "sks", "Dosen": "dosen_name", "Jumlah Mahasiswa": "jumlah_mahasiswa"}
@@ -399,7 +513,15 @@ def generate_full_report_html(dataset, algorithm_results, output_filename="lapor
 
     # Generate algorithm stats rows
     algorithm_stats_rows = ""
-    for name, result in algorithm_results.items():
+    for name, result in all_results.items():
+        if result is None:
+            algorithm_stats_rows += f"""
+        <tr>
+            <td>{name}</td>
+            <td colspan="5" class="highlight-error">{algorithm_status.get(name, 'Timeout')} (tidak ada hasil)</td>
+        </tr>
+        """
+            continue
         algorithm_stats_rows += f"""
         <tr>
             <td>{name}</td>
@@ -407,6 +529,30 @@ def generate_full_report_html(dataset, algorithm_results, output_filename="lapor
             <td>{result['stats']['scheduled_slots']}</td>
             <td class="{'' if result['stats']['conflicts'] == 0 else 'highlight-error'}">{result['stats']['conflicts']}</td>
             <td>{result['stats']['execution_time']:.4f}</td>
+            <td>{format_memory(result['stats'])}</td>
+        </tr>
+        """
+
+    # Generate phase breakdown rows (hanya algoritma yang mencatat phase_times)
+    phase_breakdown_rows = ""
+    for name, result in algorithm_results.items():
+        phase_times = result['stats'].get('phase_times')
+        if not phase_times:
+            continue
+        total_time = result['stats']['execution_time']
+        counters = result['stats'].get('counters', {})
+        phase_memory = result['stats'].get('phase_memory_mb', {})
+        counters_html = "<br/>".join(f"{key}: {value}" for key, value in counters.items()) or "-"
+        for i, (phase, seconds) in enumerate(phase_times.items()):
+            share = f"{seconds / total_time * 100:.1f}%" if total_time > 0 else "-"
+            phase_breakdown_rows += f"""
+        <tr>
+            {f'<td rowspan="{len(phase_times)}">{name}</td>' if i == 0 else ''}
+            <td>{phase}</td>
+            <td>{seconds:.4f}</td>
+            <td>{share}</td>
+            <td>{f"{phase_memory[phase]:.2f}" if phase in phase_memory else "-"}</td>
+            {f'<td rowspan="{len(phase_times)}"><small>{counters_html}</small></td>' if i == 0 else ''}
         </tr>
         """
 
@@ -466,7 +612,9 @@ def generate_full_report_html(dataset, algorithm_results, output_filename="lapor
     html_content = html_content.replace("{{FAILED_TAB_BUTTONS}}", failed_tab_buttons_html)
     html_content = html_content.replace("{{FAILED_TAB_CONTENTS}}", failed_tabs_html)
     html_content = html_content.replace("{{ALGORITHM_STATS_ROWS}}", algorithm_stats_rows)
+    html_content = html_content.replace("{{PHASE_BREAKDOWN_ROWS}}", phase_breakdown_rows)
     html_content = html_content.replace("{{PERF_IMG}}", perf_img)
+    html_content = html_content.replace("{{MEMORY_CHART_HTML}}", memory_chart_html)
     html_content = html_content.replace("{{SCHEDULE_DAY_IMG}}", schedule_day_img)
     html_content = html_content.replace("{{MK_USAGE_IMG}}", mk_usage_img)
     html_content = html_content.replace("{{ROOM_USAGE_IMG}}", room_usage_img)